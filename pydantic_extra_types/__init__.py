@@ -2,17 +2,29 @@ __version__ = '0.0.1'
 
 from pydantic_extra_types.types import (
     Color,
+    ColorPalette,
+    CompactColor,
     CountryAlpha2,
     CountryAlpha3,
     CountryNumericCode,
     CountryOfficialName,
     CountryShortName,
+    DropOriginal,
+    HexColor,
+    MinContrast,
+    NamedColor,
     PaymentCardBrand,
     PaymentCardNumber,
 )
 
 __all__ = (
     'Color',
+    'ColorPalette',
+    'CompactColor',
+    'DropOriginal',
+    'HexColor',
+    'MinContrast',
+    'NamedColor',
     'PaymentCardNumber',
     'PaymentCardBrand',
     'CountryAlpha2',
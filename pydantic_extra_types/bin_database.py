@@ -0,0 +1,41 @@
+"""
+Convert a CSV of BINs into the binary file read by `BinDatabase`:
+
+    python -m pydantic_extra_types.bin_database bins.csv bins.bin
+
+The CSV needs a `bin` column and may have `country`, `card_type` and `bank` columns, see `convert_bin_csv`.
+"""
+import argparse
+import sys
+import time
+from typing import List, Optional
+
+from pydantic_extra_types.types.bin_database import convert_bin_csv
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog='python -m pydantic_extra_types.bin_database',
+        description='Convert a CSV of BINs into a BIN database file.',
+    )
+    parser.add_argument('csv', help='CSV file to convert, "-" for stdin')
+    parser.add_argument('output', help='BIN database file to write')
+    args = parser.parse_args(argv)
+
+    if args.csv == '-':
+        lines = sys.stdin
+    else:
+        lines = open(args.csv, encoding='utf-8', newline='')
+
+    start = time.perf_counter()
+    with lines:
+        try:
+            count = convert_bin_csv(lines, args.output)
+        except ValueError as e:
+            parser.error(str(e))
+    print(f'{count:,} BIN ranges written to {args.output} in {time.perf_counter() - start:.2f}s', file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,74 @@
+"""
+Validate the color column of a CSV or JSON Lines file from the command line:
+
+    python -m pydantic_extra_types.color tokens.csv --column color
+
+Every row is written to stdout as a JSON line with either its normalized `color` or an `error`, a summary with the
+number of rows per second is written to stderr at the end. The exit code is 1 if any row is invalid.
+"""
+import argparse
+import json
+import sys
+import time
+from typing import List, Optional
+
+from pydantic_extra_types.types.color import validate_color_column
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog='python -m pydantic_extra_types.color',
+        description='Validate the color column of a CSV or JSON Lines file.',
+    )
+    parser.add_argument('file', help='file to validate, "-" for stdin')
+    parser.add_argument('-c', '--column', required=True, help='name of the color column')
+    parser.add_argument(
+        '-f', '--format', choices=('csv', 'jsonl'), help='file format, by default guessed from the file extension'
+    )
+    parser.add_argument('-o', '--output', choices=('hex', 'int'), default='hex', help='how valid colors are written')
+    parser.add_argument('--chunk-size', type=int, default=10_000, help='number of rows validated at a time')
+    parser.add_argument('-p', '--processes', type=int, help='validate chunks in this many processes, 0 for one per CPU')
+    args = parser.parse_args(argv)
+
+    file_format = args.format or ('jsonl' if args.file.endswith(('.jsonl', '.ndjson')) else 'csv')
+    if args.file == '-':
+        lines = sys.stdin
+    else:
+        try:
+            lines = open(args.file, encoding='utf-8', newline='')
+        except OSError as e:
+            parser.error(str(e))
+
+    rows = errors = 0
+    start = time.perf_counter()
+    with lines:
+        records = validate_color_column(
+            lines,
+            args.column,
+            format=file_format,
+            output=args.output,
+            chunk_size=args.chunk_size,
+            processes=args.processes,
+        )
+        try:
+            for record in records:
+                rows += 1
+                if record.error is None:
+                    line = {'row': record.row, 'color': record.color}
+                else:
+                    errors += 1
+                    line = {'row': record.row, 'error': record.error}
+                sys.stdout.write(json.dumps(line) + '\n')
+        except (ValueError, OSError) as e:
+            parser.error(str(e))
+
+    elapsed = time.perf_counter() - start
+    print(
+        f'{rows:,} rows, {errors:,} errors in {elapsed:.2f}s, {rows / elapsed if elapsed else 0:,.0f} rows/sec',
+        file=sys.stderr,
+    )
+    return 1 if errors else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,50 @@
+"""
+Find card numbers in a file, printing their byte offsets and brands, and optionally write a redacted copy:
+
+    python -m pydantic_extra_types.pan_scanner app.log --redact app.redacted.log --processes 4
+
+See `scan_pans`.
+"""
+import argparse
+import sys
+import time
+from typing import List, Optional
+
+from pydantic_extra_types.types.pan_scanner import scan_pans
+from pydantic_extra_types.types.payment import PaymentCardBrand
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog='python -m pydantic_extra_types.pan_scanner',
+        description='Find card numbers in a file, printing the start and end offset and brand of each.',
+    )
+    parser.add_argument('file', help='file to scan, "-" for stdin')
+    parser.add_argument('--redact', metavar='OUTPUT', help='write a copy of the file with card numbers masked')
+    parser.add_argument(
+        '--processes', type=int, default=1, help='number of processes to scan with, 0 for one per CPU, default 1'
+    )
+    parser.add_argument('--all-brands', action='store_true', help='also find Luhn valid numbers of unknown brands')
+    args = parser.parse_args(argv)
+
+    source = sys.stdin.buffer if args.file == '-' else args.file
+    start = time.perf_counter()
+    count = 0
+    try:
+        matches = scan_pans(
+            source,
+            brands=PaymentCardBrand if args.all_brands else None,
+            redact_to=args.redact,
+            processes=args.processes or None,
+        )
+        for match in matches:
+            print(f'{match.start}\t{match.end}\t{match.brand}')
+            count += 1
+    except (ValueError, OSError) as e:
+        parser.error(str(e))
+    print(f'{count:,} card numbers found in {args.file} in {time.perf_counter() - start:.2f}s', file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,4 +1,12 @@
-from pydantic_extra_types.types.color import Color
+from pydantic_extra_types.types.color import (
+    Color,
+    ColorPalette,
+    CompactColor,
+    DropOriginal,
+    HexColor,
+    MinContrast,
+    NamedColor,
+)
 from pydantic_extra_types.types.country import (
     CountryAlpha2,
     CountryAlpha3,
@@ -10,6 +18,12 @@ from pydantic_extra_types.types.payment import PaymentCardBrand, PaymentCardNumb
 
 __all__ = (
     'Color',
+    'ColorPalette',
+    'CompactColor',
+    'DropOriginal',
+    'HexColor',
+    'MinContrast',
+    'NamedColor',
     'PaymentCardNumber',
     'PaymentCardBrand',
     'CountryAlpha2',
@@ -0,0 +1,12 @@
+"""
+numpy is an optional dependency, imported by the functions which need it when they're first called.
+"""
+from typing import Any
+
+
+def import_numpy() -> Any:
+    try:
+        import numpy
+    except ImportError as e:
+        raise ImportError('numpy is not installed, run `pip install pydantic-extra-types[numpy]`') from e
+    return numpy
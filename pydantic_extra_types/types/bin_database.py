@@ -0,0 +1,240 @@
+"""
+BIN (bank identification number) database stored as a sorted, fixed width binary file, looked up through `mmap`.
+
+The file is a 16 byte header, one 16 byte record per BIN range, sorted by the range's first prefix, and finally the
+bank names as UTF-8, each stored once:
+
+    header: b'PXBIN\\x00\\x01\\x00', number of records (uint32), offset of the bank names (uint32)
+    record: first and last 8 digit prefix (uint32), country (2 ASCII letters), card type (uint8),
+      length of the bank name (uint8), offset of the bank name from the start of the names (uint32)
+
+All integers are big endian. Ranges are disjoint, where BINs in the CSV overlap, e.g. a 6 digit BIN and an 8 digit
+BIN within it, the longer one applies.
+"""
+import csv
+import mmap
+import os
+import struct
+import sys
+from bisect import bisect_right
+from enum import Enum
+from typing import IO, Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+if sys.version_info >= (3, 8):
+    from typing import Protocol
+else:
+    from typing_extensions import Protocol
+
+__all__ = 'BinDatabase', 'BinInfo', 'BinLookup', 'CardType', 'convert_bin_csv'
+
+_MAGIC = b'PXBIN\x00\x01\x00'
+_HEADER = struct.Struct('>8sII')
+_RECORD = struct.Struct('>II2sBBI')
+_KEY = struct.Struct('>I')
+# number of digits BINs are padded to, the first 8 digits of a card number are looked up
+_PREFIX_DIGITS = 8
+# every `_INDEX_STRIDE`th first prefix is read into a list when the database is opened, so lookups bisect that
+# list then search at most `_INDEX_STRIDE` records in the file
+_INDEX_STRIDE = 64
+
+
+class CardType(str, Enum):
+    credit = 'credit'
+    debit = 'debit'
+    prepaid = 'prepaid'
+    charge = 'charge'
+    unknown = 'unknown'
+
+    def __str__(self) -> str:
+        return self.value
+
+
+_card_types = list(CardType)
+_card_type_codes = {t: i for i, t in enumerate(_card_types)}
+
+
+class BinInfo(NamedTuple):
+    """
+    Issuer details of a BIN range, `first` and `last` are the range's 8 digit prefixes.
+    """
+
+    first: str
+    last: str
+    country: Optional[str]
+    card_type: CardType
+    bank: Optional[str]
+
+
+class BinLookup(Protocol):
+    """
+    Anything which can be used as `PaymentCardNumber.bin_database`.
+    """
+
+    def lookup(self, card_number: str) -> Optional[BinInfo]:
+        ...
+
+
+class BinDatabase:
+    """
+    A BIN database file created by `convert_bin_csv`, memory mapped rather than read, so opening it is fast and
+    lookups only touch the pages they need.
+
+    Use as `PaymentCardNumber.bin_database` to get `PaymentCardNumber.bin_info`; any object with a compatible
+    `lookup` method can be used instead.
+    """
+
+    __slots__ = '_file', '_mmap', '_count', '_names', '_index'
+
+    def __init__(self, path: Union[str, 'os.PathLike[str]']) -> None:
+        self._file = open(path, 'rb')
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f'{os.fspath(path)!r} is not a BIN database')
+        size = len(self._mmap)
+        magic, self._count, self._names = _HEADER.unpack_from(self._mmap) if size >= _HEADER.size else (b'', 0, 0)
+        if magic != _MAGIC or not _HEADER.size + self._count * _RECORD.size <= self._names <= size:
+            self.close()
+            raise ValueError(f'{os.fspath(path)!r} is not a BIN database')
+        self._index = [
+            _KEY.unpack_from(self._mmap, _HEADER.size + i * _RECORD.size)[0]
+            for i in range(0, self._count, _INDEX_STRIDE)
+        ]
+
+    def lookup(self, card_number: str) -> Optional[BinInfo]:
+        """
+        Issuer details for a card number, or `None` if its BIN isn't in the database.
+        """
+        prefix = int(card_number[:_PREFIX_DIGITS].ljust(_PREFIX_DIGITS, '0'))
+        block = bisect_right(self._index, prefix) - 1
+        if block < 0:
+            return None
+        # binary search of the block for the last record whose first prefix is <= prefix
+        mm = self._mmap
+        lo = block * _INDEX_STRIDE + 1
+        hi = min(lo - 1 + _INDEX_STRIDE, self._count)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if _KEY.unpack_from(mm, _HEADER.size + mid * _RECORD.size)[0] <= prefix:
+                lo = mid + 1
+            else:
+                hi = mid
+        info = self._record(lo - 1)
+        return info if prefix <= int(info.last) else None
+
+    def _record(self, i: int) -> BinInfo:
+        first, last, country, card_type, name_length, name_offset = _RECORD.unpack_from(
+            self._mmap, _HEADER.size + i * _RECORD.size
+        )
+        name_start = self._names + name_offset
+        return BinInfo(
+            f'{first:08d}',
+            f'{last:08d}',
+            country.decode('ascii') if country != b'  ' else None,
+            _card_types[card_type],
+            self._mmap[name_start : name_start + name_length].decode('utf-8') if name_length else None,
+        )
+
+    def close(self) -> None:
+        self._mmap.close()
+        self._file.close()
+
+    def __enter__(self) -> 'BinDatabase':
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[BinInfo]:
+        return map(self._record, range(self._count))
+
+
+_BinRow = Tuple[int, int, bytes, int, str]
+
+
+def convert_bin_csv(lines: Iterable[str], destination: Union[str, 'os.PathLike[str]', IO[bytes]]) -> int:
+    """
+    Convert a CSV of BINs into the binary format read by `BinDatabase`, returning the number of records written.
+
+    The CSV must have a header with a `bin` column of 6 to 8 digit BINs and may have `country` (ISO 3166 alpha-2),
+    `card_type` (one of `CardType`) and `bank` columns, other columns are ignored. Rows don't need to be sorted.
+    """
+    rows = sorted(_read_bin_csv(lines), key=lambda row: (row[0], -row[1]))
+    names: Dict[str, Tuple[int, int]] = {}
+    names_data = bytearray()
+    records = bytearray()
+    count = 0
+    for first, last, country, card_type, bank in _flatten_nested(rows):
+        if bank not in names:
+            encoded = _truncate_utf8(bank.encode('utf-8'), 0xFF)
+            names[bank] = len(names_data), len(encoded)
+            names_data += encoded
+        offset, length = names[bank]
+        records += _RECORD.pack(first, last, country, card_type, length, offset)
+        count += 1
+    header = _HEADER.pack(_MAGIC, count, _HEADER.size + len(records))
+    if isinstance(destination, (str, os.PathLike)):
+        with open(destination, 'wb') as f:
+            f.write(header + records + names_data)
+    else:
+        destination.write(header + records + names_data)
+    return count
+
+
+def _read_bin_csv(lines: Iterable[str]) -> Iterator[_BinRow]:
+    reader = csv.DictReader(lines)
+    if reader.fieldnames is None or 'bin' not in reader.fieldnames:
+        raise ValueError("column 'bin' is not in the CSV header")
+    for row_number, row in enumerate(reader, start=1):
+        bin_ = (row['bin'] or '').strip()
+        if not (6 <= len(bin_) <= _PREFIX_DIGITS and bin_.isdigit() and bin_.isascii()):
+            raise ValueError(f'row {row_number}: BIN must be 6 to {_PREFIX_DIGITS} digits, not {bin_!r}')
+        country = (row.get('country') or '').strip().upper()
+        if country and not (len(country) == 2 and country.isalpha() and country.isascii()):
+            raise ValueError(f'row {row_number}: country must be a 2 letter code, not {country!r}')
+        card_type = (row.get('card_type') or '').strip().lower() or 'unknown'
+        try:
+            code = _card_type_codes[CardType(card_type)]
+        except ValueError:
+            raise ValueError(
+                f'row {row_number}: card_type must be one of {", ".join(t.value for t in CardType)}, not {card_type!r}'
+            )
+        first = int(bin_.ljust(_PREFIX_DIGITS, '0'))
+        last = int(bin_.ljust(_PREFIX_DIGITS, '9'))
+        yield first, last, (country or '  ').encode('ascii'), code, (row.get('bank') or '').strip()
+
+
+def _flatten_nested(rows: List[_BinRow]) -> Iterator[_BinRow]:
+    """
+    Split BIN ranges, sorted by first prefix with enclosing ranges first, into disjoint ranges where nested ranges
+    take precedence over the ranges enclosing them. Ranges of BIN prefixes are always either disjoint or nested.
+    """
+    open_rows: List[_BinRow] = []
+    cursor = 0
+    for row in rows:
+        while open_rows and open_rows[-1][1] < row[0]:
+            top = open_rows.pop()
+            if cursor <= top[1]:
+                yield (cursor,) + top[1:]
+            cursor = top[1] + 1
+        if open_rows:
+            parent = open_rows[-1]
+            if parent[:2] == row[:2]:
+                raise ValueError(f'BIN range {row[0]:08d} to {row[1]:08d} is in the CSV more than once')
+            if cursor < row[0]:
+                yield (cursor, row[0] - 1) + parent[2:]
+        open_rows.append(row)
+        cursor = row[0]
+    while open_rows:
+        top = open_rows.pop()
+        if cursor <= top[1]:
+            yield (cursor,) + top[1:]
+        cursor = top[1] + 1
+
+
+def _truncate_utf8(data: bytes, size: int) -> bytes:
+    return data[:size].decode('utf-8', errors='ignore').encode('utf-8')
@@ -7,14 +7,44 @@ A few colors have multiple names referring to the sames colors, eg. `grey` and `
 In these cases the LAST color when sorted alphabetically takes preferences,
 eg. Color((0, 255, 255)).as_named() == 'cyan' because "cyan" comes after "aqua".
 """
+import csv
+import json
 import math
+import os
 import re
+import struct
+import sys
+import threading
+import weakref
+from collections import OrderedDict, deque
 from colorsys import hls_to_rgb, rgb_to_hls
-from typing import Any, Dict, Optional, Tuple, Union, cast
+from concurrent.futures import Future, ProcessPoolExecutor
+from functools import lru_cache
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
 
 from pydantic_core import PydanticCustomError, core_schema
 
 from pydantic._internal import _repr, _utils
+from pydantic_extra_types.types._numpy import import_numpy
+
+if TYPE_CHECKING:
+    import numpy
 
 ColorTuple = Union[Tuple[int, int, int], Tuple[int, int, int, float]]
 ColorType = Union[ColorTuple, str]
@@ -40,7 +70,6 @@ class RGBA:
         return self._tuple[item]
 
 
-# these are not compiled here to avoid import slowdown, they'll be compiled the first time they're used, then cached
 _r_255 = r'(\d{1,3}(?:\.\d+)?)'
 _r_comma = r'\s*,\s*'
 _r_alpha = r'(\d(?:\.\d+)?|\.\d+|\d{1,2}%)'
@@ -56,49 +85,325 @@ r_hsl = fr'\s*hsla?\(\s*{_r_h}{_r_comma}{_r_sl}{_r_comma}{_r_sl}(?:{_r_comma}{_r
 r_rgb_v4_style = fr'\s*rgba?\(\s*{_r_255}\s+{_r_255}\s+{_r_255}(?:\s*/\s*{_r_alpha})?\s*\)\s*'
 # CSS4 HSL examples: hsl(270 60% 50%), hsl(270 60% 50% / 0.5), hsl(270 60% 50% / 50%), hsla(270 60% 50% / 50%)
 r_hsl_v4_style = fr'\s*hsla?\(\s*{_r_h}\s+{_r_sl}\s+{_r_sl}(?:\s*/\s*{_r_alpha})?\s*\)\s*'
+# any hex color, for validation by pydantic-core so anchored and case insensitive
+r_hex_pattern = r'^\s*(?:#|0x|0X)?(?:[0-9a-fA-F]{3,4}|[0-9a-fA-F]{6}|[0-9a-fA-F]{8})\s*$'
+
+# parse_str only ever tries one of these per value, so they're compiled once here rather than looked up in the
+# `re` module cache on every call
+_rgb_re = re.compile(r_rgb)
+_rgb_v4_style_re = re.compile(r_rgb_v4_style)
+_hsl_re = re.compile(r_hsl)
+_hsl_v4_style_re = re.compile(r_hsl_v4_style)
+_hex_digits = frozenset('0123456789abcdef')
 
 # colors where the two hex characters are the same, if all colors match this the short version of hex colors can be used
 repeat_colors = {int(c * 2, 16) for c in '0123456789abcdef'}
+# two digit hex string of every channel value, and the single digit used for it in short hex colors
+_hex_byte = tuple(f'{i:02x}' for i in range(256))
+_hex_nibble = tuple(f'{i >> 4:x}' for i in range(256))
 rads = 2 * math.pi
 
 
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class ParseCache:
+    """
+    Thread safe, size bounded LRU cache of parsed colors keyed by the raw value passed to `Color`.
+
+    The cache is disabled (`maxsize == 0`) by default, enable it with e.g. `parse_cache.configure(maxsize=1024)`.
+    """
+
+    __slots__ = 'maxsize', '_data', '_lock', '_hits', '_misses'
+
+    def __init__(self, maxsize: int = 0):
+        self.maxsize = maxsize
+        self._data: 'OrderedDict[Hashable, RGBA]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def configure(self, maxsize: int) -> None:
+        """
+        Set the maximum number of cached colors, evicting the least recently used ones if required;
+        `0` disables the cache.
+        """
+        if maxsize < 0:
+            raise ValueError('maxsize must be greater than or equal to 0')
+        with self._lock:
+            self.maxsize = maxsize
+            while len(self._data) > maxsize:
+                self._data.popitem(last=False)
+
+    def get(self, value: Hashable) -> Optional[RGBA]:
+        with self._lock:
+            try:
+                rgba = self._data[value]
+            except KeyError:
+                self._misses += 1
+                return None
+            self._data.move_to_end(value)
+            self._hits += 1
+            return rgba
+
+    def put(self, value: Hashable, rgba: RGBA) -> None:
+        with self._lock:
+            if self.maxsize:
+                self._data[value] = rgba
+                if len(self._data) > self.maxsize:
+                    self._data.popitem(last=False)
+
+    def cache_info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self.maxsize, len(self._data))
+
+    def cache_clear(self) -> None:
+        """
+        Remove all cached colors and reset the hit and miss statistics.
+        """
+        with self._lock:
+            self._data.clear()
+            self._hits = self._misses = 0
+
+
+parse_cache = ParseCache()
+
+
+class InternTable:
+    """
+    Weak value table of shared `Color` instances keyed by the string they were parsed from, used by `Color.intern`
+    and validation. Colors are only kept while they're referenced elsewhere.
+
+    The table is disabled by default, enable it with `intern_table.configure(enabled=True)`.
+    """
+
+    __slots__ = 'enabled', '_colors'
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self._colors: 'weakref.WeakValueDictionary[str, Color]' = weakref.WeakValueDictionary()
+
+    def configure(self, enabled: bool) -> None:
+        self.enabled = enabled
+        if not enabled:
+            self._colors.clear()
+
+    def get(self, value: str) -> 'Color':
+        try:
+            return self._colors[value]
+        except KeyError:
+            color = self._colors[value] = Color(value)
+            return color
+
+    def clear(self) -> None:
+        self._colors.clear()
+
+    def __len__(self) -> int:
+        return len(self._colors)
+
+
+intern_table = InternTable()
+
+
+class OriginalValues:
+    """
+    Whether new colors keep the value they were created from, as returned by `Color.original()`.
+
+    Values are kept by default, `original_values.configure(keep=False)` drops them so colors don't keep e.g. lists
+    from a parsed JSON document alive; `original()` then returns the color's string form instead. Use
+    `DropOriginal` to drop them for a single field.
+    """
+
+    __slots__ = ('keep',)
+
+    def __init__(self) -> None:
+        self.keep = True
+
+    def configure(self, keep: bool) -> None:
+        self.keep = keep
+
+
+original_values = OriginalValues()
+
+
 class Color(_repr.Representation):
-    __slots__ = '_original', '_rgba'
-
-    def __init__(self, value: ColorType) -> None:
-        self._rgba: RGBA
-        self._original: ColorType
-        if isinstance(value, (tuple, list)):
-            self._rgba = parse_tuple(value)
-        elif isinstance(value, str):
-            self._rgba = parse_str(value)
-        elif isinstance(value, Color):
+    """
+    A color, stored as a single `0xRRGGBBAA` integer with 8 bits per channel; colors which can't be represented
+    exactly with 8 bit channels (e.g. `rgba(0, 0, 0, 0.5)` or most `hsl()` values) also keep their `RGBA` floats.
+
+    Colors are immutable and compare equal when their `as_rgb_tuple()`s are equal, so when their 8 bit channels are
+    equal and, for colors keeping floats, their alphas are. Equal colors have equal 8 bit channels, which is what
+    they're hashed by and ordered by first, ties are ordered by alpha.
+    """
+
+    __slots__ = '_original', '_packed', '_rgba', '_str', '__weakref__'
+
+    def __init__(self, value: Union[ColorType, 'Color']) -> None:
+        # `None` once dropped, see `OriginalValues`
+        self._original: Union[ColorType, int, None]
+        self._packed: int
+        # only set where the packed value would lose precision
+        self._rgba: Optional[RGBA]
+        # memoized `__str__`, which is also how colors are serialized
+        self._str: Optional[str]
+        if isinstance(value, Color):
+            self._packed = value._packed
             self._rgba = value._rgba
-            value = value._original
+            self._original = value._original
+            self._str = value._str
         else:
+            self._packed, self._rgba = _pack_rgba(_to_rgba(value))
+            self._str = None
+            # if we've got here value must be a valid color
+            self._original = value if original_values.keep else None
+
+    @classmethod
+    def from_int(cls, value: int) -> 'Color':
+        """
+        Create a color from a `0xRRGGBBAA` integer, an alpha of `0xff` means the color has no alpha channel.
+        """
+        if not isinstance(value, int) or isinstance(value, bool):
+            raise PydanticCustomError('color_error', 'value is not a valid color: integer colors must be an int')
+        if not 0 <= value <= 0xFFFFFFFF:
             raise PydanticCustomError(
-                'color_error', 'value is not a valid color: value must be a tuple, list or string'
+                'color_error', 'value is not a valid color: integer colors must be in the range 0 to 0xffffffff'
             )
+        return cls._from_packed(value, value)
 
-        # if we've got here value must be a valid color
-        self._original = value
+    @classmethod
+    def from_buffer(cls, buf: Any, offset: int = 0, layout: str = 'RGBA8') -> 'Color':
+        """
+        Create a color from the pixel at byte `offset` of a buffer, e.g. `bytes`, `memoryview`, `array.array` or
+        a numpy `uint8` array, without copying it.
+
+        :param buf: any object supporting the buffer protocol
+        :param offset: offset of the pixel in bytes
+        :param layout: how the pixel's channels are stored, see `BUFFER_LAYOUTS`
+        """
+        spec = _buffer_layout(layout)
+        data = _byte_view(buf)
+        if not 0 <= offset <= len(data) - spec.size:
+            raise ValueError(f'offset {offset} is out of range for a buffer of {len(data)} bytes')
+        alpha = 0xFF if spec.a is None else data[offset + spec.a]
+        packed = data[offset + spec.r] << 24 | data[offset + spec.g] << 16 | data[offset + spec.b] << 8 | alpha
+        if spec.premultiplied:
+            packed = _unpremultiply(packed)
+        return cls._from_packed(packed, packed)
+
+    @classmethod
+    def iter_buffer(cls, buf: Any, layout: str = 'RGBA8', *, unique: bool = False) -> Iterator['Color']:
+        """
+        Iterate over every pixel of a buffer as colors, see `from_buffer`.
+
+        Pixels are rearranged into `0xRRGGBBAA` integers a chunk at a time with slice assignments, so no
+        per-pixel tuples or slices are created, with `unique=True` each distinct pixel is only yielded the
+        first time it's seen and duplicates never become colors.
+        """
+        spec = _buffer_layout(layout)
+        data = _byte_view(buf)
+        if len(data) % spec.size:
+            raise ValueError(
+                f'buffer length must be a multiple of {spec.size} bytes for layout {layout!r}, not {len(data)}'
+            )
+        seen = set()
+        chunk_size = spec.size * _buffer_chunk_pixels
+        for start in range(0, len(data), chunk_size):
+            pixels: Iterable[int] = _pack_pixels(data[start : start + chunk_size].tobytes(), spec)
+            if spec.premultiplied:
+                pixels = map(_unpremultiply, dict.fromkeys(pixels) if unique else pixels)
+            if unique:
+                pixels = [p for p in dict.fromkeys(pixels) if p not in seen]
+                seen.update(pixels)
+            for packed in pixels:
+                yield cls._from_packed(packed, packed)
+
+    @classmethod
+    def intern(cls, value: Union[ColorType, 'Color']) -> 'Color':
+        """
+        Get a shared instance for a value: color names exactly as they appear in `COLORS_BY_NAME` always share
+        one instance, other strings only while `intern_table` is enabled, any other value gives a new color.
+        """
+        if isinstance(value, cls):
+            return value
+        if cls is Color and type(value) is str:
+            try:
+                return _named_colors[value]
+            except KeyError:
+                if intern_table.enabled:
+                    return intern_table.get(value)
+        return cls(value)
+
+    @classmethod
+    def _from_packed(cls, packed: int, original: Union[ColorType, int, None]) -> 'Color':
+        color = cls.__new__(cls)
+        color._packed = packed
+        color._rgba = None
+        color._original = original
+        color._str = None
+        return color
+
+    @classmethod
+    def _from_rgba(cls, rgba: RGBA) -> 'Color':
+        packed, floats = _pack_rgba(rgba)
+        color = cls._from_packed(packed, packed)
+        color._rgba = floats
+        return color
 
     @classmethod
     def __pydantic_modify_json_schema__(cls, field_schema: Dict[str, Any]) -> Dict[str, Any]:
         field_schema.update(type='string', format='color')
         return field_schema
 
-    def original(self) -> ColorType:
+    def original(self) -> Union[ColorType, int]:
         """
-        Original value passed to Color
+        Original value passed to Color, or the color's string form if the value was dropped, see `OriginalValues`.
         """
+        if self._original is None:
+            return str(self)
         return self._original
 
-    def as_named(self, *, fallback: bool = False) -> str:
-        if self._rgba.alpha is None:
-            rgb = cast(Tuple[int, int, int], self.as_rgb_tuple())
+    def _drop_original(self) -> 'Color':
+        """
+        This color, or a copy of it without the original value if it has one; shared named colors are returned as
+        they are, their original is the name.
+        """
+        original = self._original
+        if (
+            original is None
+            or original is self._packed
+            or (type(original) is str and _named_colors.get(original) is self)
+        ):
+            return self
+        color = self._from_packed(self._packed, None)
+        color._rgba = self._rgba
+        color._str = self._str
+        return color
+
+    def as_int(self) -> int:
+        """
+        Color as a `0xRRGGBBAA` integer, alpha is `0xff` if the color has no alpha channel.
+        """
+        return self._packed
+
+    def as_named(self, *, fallback: bool = False, nearest: bool = False, metric: str = 'rgb') -> str:
+        """
+        Name of the color, see `COLORS_BY_NAME`.
+
+        :param fallback: return the hex string instead of raising an error if there's no exactly matching name
+        :param nearest: return the closest named color, ignoring alpha, if there's no exactly matching name
+        :param metric: how the closest color is chosen when `nearest=True`, one of
+          'rgb' - euclidean distance between RGB values,
+          'lab' - euclidean distance in CIE L*a*b* space (CIE76), closer to perceived difference
+        """
+        if nearest:
+            return _named_color_index(metric).nearest(self._packed >> 8)
+        if self._alpha() is None:
             try:
-                return COLORS_BY_VALUE[rgb]
+                return _names_by_rgb24[self._packed >> 8]
             except KeyError as e:
                 if fallback:
                     return self.as_hex()
@@ -112,26 +417,29 @@ class Color(_repr.Representation):
         Hex string representing the color can be 3, 4, 6 or 8 characters depending on whether the string
         a "short" representation of the color is possible and whether there's an alpha channel.
         """
-        values = [float_to_255(c) for c in self._rgba[:3]]
-        if self._rgba.alpha is not None:
-            values.append(float_to_255(self._rgba.alpha))
-
-        as_hex = ''.join(f'{v:02x}' for v in values)
-        if all(c in repeat_colors for c in values):
-            as_hex = ''.join(as_hex[c] for c in range(0, len(as_hex), 2))
-        return '#' + as_hex
+        packed = self._packed
+        r, g, b = packed >> 24, packed >> 16 & 0xFF, packed >> 8 & 0xFF
+        if self._alpha() is None:
+            # the short form can be used if the high and low digit of every channel are the same
+            if (packed & 0x0F0F0F00) << 4 == packed & 0xF0F0F000:
+                return '#' + _hex_nibble[r] + _hex_nibble[g] + _hex_nibble[b]
+            return '#' + _hex_byte[r] + _hex_byte[g] + _hex_byte[b]
+        else:
+            a = packed & 0xFF
+            if (packed & 0x0F0F0F0F) << 4 == packed & 0xF0F0F0F0:
+                return '#' + _hex_nibble[r] + _hex_nibble[g] + _hex_nibble[b] + _hex_nibble[a]
+            return '#' + _hex_byte[r] + _hex_byte[g] + _hex_byte[b] + _hex_byte[a]
 
     def as_rgb(self) -> str:
         """
         Color as an rgb(<r>, <g>, <b>) or rgba(<r>, <g>, <b>, <a>) string.
         """
-        if self._rgba.alpha is None:
-            return f'rgb({float_to_255(self._rgba.r)}, {float_to_255(self._rgba.g)}, {float_to_255(self._rgba.b)})'
+        packed = self._packed
+        r, g, b = packed >> 24, packed >> 16 & 0xFF, packed >> 8 & 0xFF
+        if self._alpha() is None:
+            return f'rgb({r}, {g}, {b})'
         else:
-            return (
-                f'rgba({float_to_255(self._rgba.r)}, {float_to_255(self._rgba.g)}, {float_to_255(self._rgba.b)}, '
-                f'{round(self._alpha_float(), 2)})'
-            )
+            return f'rgba({r}, {g}, {b}, {round(self._alpha_float(), 2)})'
 
     def as_rgb_tuple(self, *, alpha: Optional[bool] = None) -> ColorTuple:
         """
@@ -143,9 +451,10 @@ class Color(_repr.Representation):
           True - always include alpha,
           False - always omit alpha,
         """
-        r, g, b = (float_to_255(c) for c in self._rgba[:3])
+        packed = self._packed
+        r, g, b = packed >> 24, packed >> 16 & 0xFF, packed >> 8 & 0xFF
         if alpha is None:
-            if self._rgba.alpha is None:
+            if self._alpha() is None:
                 return r, g, b
             else:
                 return r, g, b, self._alpha_float()
@@ -159,7 +468,7 @@ class Color(_repr.Representation):
         """
         Color as an hsl(<h>, <s>, <l>) or hsl(<h>, <s>, <l>, <a>) string.
         """
-        if self._rgba.alpha is None:
+        if self._alpha() is None:
             h, s, li = self.as_hsl_tuple(alpha=False)  # type: ignore
             return f'hsl({h * 360:0.0f}, {s:0.0%}, {li:0.0%})'
         else:
@@ -178,20 +487,107 @@ class Color(_repr.Representation):
           True - always include alpha,
           False - always omit alpha,
         """
-        h, l, s = rgb_to_hls(self._rgba.r, self._rgba.g, self._rgba.b)  # noqa: E741
+        rgba = self._get_rgba()
+        h, l, s = rgb_to_hls(rgba.r, rgba.g, rgba.b)  # noqa: E741
         if alpha is None:
-            if self._rgba.alpha is None:
+            if rgba.alpha is None:
                 return h, s, l
             else:
-                return h, s, l, self._alpha_float()
+                return h, s, l, rgba.alpha
         if alpha:
             return h, s, l, self._alpha_float()
         else:
             # alpha is False
             return h, s, l
 
+    def mix(self, other: 'Color', t: float = 0.5, *, space: str = 'rgb') -> 'Color':
+        """
+        Color a fraction `t` of the way from this color to `other`, alpha is interpolated too.
+
+        :param other: the color to mix with
+        :param t: from 0 for this color to 1 for `other`
+        :param space: where colors are interpolated, see `gradient`
+        """
+        if not 0 <= t <= 1:
+            raise ValueError('t must be in the range 0 to 1')
+        ((start, delta),) = _gradient_segments([self, other], space)
+        return self._from_rgba(_gradient_to_rgba[space](*(c + t * d for c, d in zip(start, delta))))
+
+    def as_lab(self) -> Tuple[float, float, float]:
+        """
+        Color as CIE L*a*b* with a D65 white point, alpha is ignored.
+        """
+        return _linear_to_lab(*self._linear_rgb())
+
+    def as_oklab(self) -> Tuple[float, float, float]:
+        """
+        Color as OKLab, alpha is ignored.
+        """
+        return _linear_to_oklab(*self._linear_rgb())
+
+    def delta_e(self, other: 'Color', *, method: str = 'cie76') -> float:
+        """
+        Perceived difference between two colors, alpha is ignored.
+
+        :param other: the color to compare with
+        :param method: one of
+          'cie76' - euclidean distance in CIE L*a*b*,
+          'ciede2000' - CIEDE2000 in CIE L*a*b*, the most accurate but also the slowest,
+          'oklab' - euclidean distance in OKLab
+        """
+        if method == 'cie76':
+            return _distance(self.as_lab(), other.as_lab())
+        elif method == 'ciede2000':
+            return _ciede2000(self.as_lab(), other.as_lab())
+        elif method == 'oklab':
+            return _distance(self.as_oklab(), other.as_oklab())
+        else:
+            raise ValueError(f"method must be 'cie76', 'ciede2000' or 'oklab', not {method!r}")
+
+    def relative_luminance(self) -> float:
+        """
+        WCAG relative luminance, from 0 for black to 1 for white, alpha is ignored.
+        """
+        return _luminance(*self._linear_rgb())
+
+    def contrast_ratio(self, other: 'Color') -> float:
+        """
+        WCAG contrast ratio between two colors, from 1 to 21.
+        """
+        l1, l2 = self.relative_luminance(), other.relative_luminance()
+        return (max(l1, l2) + 0.05) / (min(l1, l2) + 0.05)
+
+    def _linear_rgb(self) -> Tuple[float, float, float]:
+        """
+        Linear light red, green and blue, looked up from a table unless the color needs float precision.
+        """
+        if self._rgba is None:
+            packed = self._packed
+            return (
+                _srgb_to_linear[packed >> 24],
+                _srgb_to_linear[packed >> 16 & 0xFF],
+                _srgb_to_linear[packed >> 8 & 0xFF],
+            )
+        rgba = self._rgba
+        return _srgb_channel_to_linear(rgba.r), _srgb_channel_to_linear(rgba.g), _srgb_channel_to_linear(rgba.b)
+
+    def _get_rgba(self) -> RGBA:
+        """
+        The color as `RGBA` floats, decoded from the packed value unless the floats were kept.
+        """
+        if self._rgba is not None:
+            return self._rgba
+        return _unpack_rgba(self._packed)
+
+    def _alpha(self) -> Optional[float]:
+        if self._rgba is not None:
+            return self._rgba.alpha
+        a = self._packed & 0xFF
+        return None if a == 0xFF else a / 255
+
     def _alpha_float(self) -> float:
-        return 1 if self._rgba.alpha is None else self._rgba.alpha
+        alpha = self._alpha()
+        return 1 if alpha is None else alpha
 
     @classmethod
     def __get_pydantic_core_schema__(cls, **_kwargs: Any) -> core_schema.PlainValidatorFunctionSchema:
@@ -201,19 +597,1147 @@ class Color(_repr.Representation):
 
     @classmethod
     def _validate(cls, __input_value: Any, _: Any) -> 'Color':
-        return cls(__input_value)
+        return cls.intern(__input_value)
 
     def __str__(self) -> str:
-        return self.as_named(fallback=True)
+        if self._str is None:
+            self._str = self.as_named(fallback=True)
+        return self._str
 
     def __repr_args__(self) -> '_repr.ReprArgs':
-        return [(None, self.as_named(fallback=True))] + [('rgb', self.as_rgb_tuple())]
+        return [(None, str(self))] + [('rgb', self.as_rgb_tuple())]
 
     def __eq__(self, other: Any) -> bool:
-        return isinstance(other, Color) and self.as_rgb_tuple() == other.as_rgb_tuple()
+        if not isinstance(other, Color) or self._packed != other._packed:
+            return False
+        # alphas which only differ beyond 8 bits, e.g. 0.5 and 0.501, give the same packed value but aren't equal
+        return (self._rgba is None and other._rgba is None) or self.as_rgb_tuple() == other.as_rgb_tuple()
 
     def __hash__(self) -> int:
-        return hash(self.as_rgb_tuple())
+        # equal to `hash(self._packed)`, small non-negative integers hash to themselves
+        return self._packed
+
+    # colors are ordered by their `0xRRGGBBAA` integer, i.e. by red, then green, blue and alpha, then colors keeping
+    # float alphas which only differ beyond 8 bits by their alpha, as `__eq__` compares them; it's a total order so
+    # colors can be sorted or searched with `bisect`, `sorted(colors, key=Color.as_int)` gives the same order several
+    # times faster apart from those ties
+
+    def __lt__(self, other: Any) -> bool:
+        if not isinstance(other, Color):
+            return NotImplemented
+        if self._packed != other._packed:
+            return self._packed < other._packed
+        return self._alpha_float() < other._alpha_float()
+
+    def __le__(self, other: Any) -> bool:
+        if not isinstance(other, Color):
+            return NotImplemented
+        if self._packed != other._packed:
+            return self._packed <= other._packed
+        return self._alpha_float() <= other._alpha_float()
+
+    def __gt__(self, other: Any) -> bool:
+        if not isinstance(other, Color):
+            return NotImplemented
+        if self._packed != other._packed:
+            return self._packed > other._packed
+        return self._alpha_float() > other._alpha_float()
+
+    def __ge__(self, other: Any) -> bool:
+        if not isinstance(other, Color):
+            return NotImplemented
+        if self._packed != other._packed:
+            return self._packed >= other._packed
+        return self._alpha_float() >= other._alpha_float()
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        """
+        Pickle as the packed integer, followed only where needed by the original value, the `RGBA` floats of
+        lossy colors and the class, so most colors cost a few bytes instead of their slots and `RGBA`.
+        """
+        args: List[Any] = [self._packed]
+        if self._original != self._packed:
+            args.append(self._original)
+        if self._rgba is None and type(self) is Color:
+            return _unpickle_color, tuple(args)
+        if len(args) == 1:
+            args.append(self._packed)
+        args.append(None if self._rgba is None else self._rgba._tuple)
+        if type(self) is not Color:
+            args.append(type(self))
+        return _unpickle_color, tuple(args)
+
+
+_same_as_packed: Any = object()
+
+
+def _unpickle_color(
+    packed: int,
+    original: Union[ColorType, int, None] = _same_as_packed,
+    rgba: Optional[Tuple[float, float, float, Optional[float]]] = None,
+    cls: Type[Color] = Color,
+) -> Color:
+    if cls is Color and rgba is None and type(original) is str:
+        named = _named_colors.get(original)
+        if named is not None:
+            return named
+    color = cls._from_packed(packed, packed if original is _same_as_packed else original)
+    if rgba is not None:
+        color._rgba = RGBA(*rgba)
+    return color
+
+
+class HexColor(str):
+    """
+    A hex color string, e.g. `#ff0000`, `#f00c` or `0xff0000`, validated entirely by pydantic-core and
+    normalized to lower case without surrounding whitespace.
+
+    Use `.color` to get the `Color`, it's only parsed when accessed.
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def __get_pydantic_core_schema__(cls, **_kwargs: Any) -> core_schema.AfterValidatorFunctionSchema:
+        return core_schema.general_after_validator_function(
+            cls._validate,
+            core_schema.str_schema(pattern=r_hex_pattern, strip_whitespace=True, to_lower=True),  # type: ignore
+            serialization=core_schema.to_string_ser_schema(),
+        )
+
+    @classmethod
+    def _validate(cls, __input_value: str, _: core_schema.ValidationInfo) -> 'HexColor':
+        return cls(__input_value)
+
+    @property
+    def color(self) -> Color:
+        return Color(str(self))
+
+
+class NamedColor(str):
+    """
+    A color name from `COLORS_BY_NAME`, e.g. `red`, validated entirely by pydantic-core and normalized to
+    lower case.
+
+    Use `.color` to get the `Color`, it's only created when accessed.
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def __get_pydantic_core_schema__(cls, **_kwargs: Any) -> core_schema.AfterValidatorFunctionSchema:
+        return core_schema.general_after_validator_function(
+            cls._validate,
+            core_schema.chain_schema(
+                [
+                    core_schema.str_schema(to_lower=True),  # type: ignore
+                    core_schema.literal_schema(list(COLORS_BY_NAME)),  # type: ignore
+                ]
+            ),
+            serialization=core_schema.to_string_ser_schema(),
+        )
+
+    @classmethod
+    def __pydantic_modify_json_schema__(cls, field_schema: Dict[str, Any]) -> Dict[str, Any]:
+        field_schema.update(type='string', enum=list(COLORS_BY_NAME))
+        return field_schema
+
+    @classmethod
+    def _validate(cls, __input_value: str, _: core_schema.ValidationInfo) -> 'NamedColor':
+        return cls(__input_value)
+
+    @property
+    def color(self) -> Color:
+        return _named_colors[self]
+
+
+class CompactColor:
+    """
+    `Annotated` marker serializing a `Color` as a `0xRRGGBBAA` integer or its 4 raw bytes rather than a string,
+    e.g. `Annotated[Color, CompactColor('bytes')]`.
+
+    Integers in the range 0 to 0xffffffff and 4 byte `bytes` are validated directly with `Color.from_int`, any other
+    value is validated as for `Color`. Packing keeps 8 bits per channel, so colors holding more precise floats are
+    rounded. JSON has no raw bytes, so the `'bytes'` format is serialized as an integer in JSON.
+    """
+
+    __slots__ = ('format',)
+
+    def __init__(self, format: str = 'int') -> None:
+        if format not in ('int', 'bytes'):
+            raise ValueError(f"format must be 'int' or 'bytes', not {format!r}")
+        self.format = format
+
+    def __get_pydantic_core_schema__(
+        self, schema: core_schema.CoreSchema, **_kwargs: Any
+    ) -> core_schema.BeforeValidatorFunctionSchema:
+        if self.format == 'int':
+            serialization = core_schema.general_plain_serializer_function_ser_schema(
+                _serialize_int, json_return_type='int'
+            )
+        else:
+            serialization = core_schema.general_plain_serializer_function_ser_schema(_serialize_bytes)
+        return core_schema.general_before_validator_function(_validate_compact, schema, serialization=serialization)
+
+    def __pydantic_modify_json_schema__(self, field_schema: Dict[str, Any]) -> Dict[str, Any]:
+        return {'anyOf': [{'type': 'integer', 'minimum': 0, 'maximum': 0xFFFFFFFF}, field_schema]}
+
+    def __repr__(self) -> str:
+        return f'CompactColor({self.format!r})'
+
+
+def _validate_compact(__input_value: Any, _: core_schema.ValidationInfo) -> Any:
+    """
+    Convert integers and 4 byte `bytes` to a `Color`, anything else is left for the `Color` validator.
+    """
+    if isinstance(__input_value, int) and not isinstance(__input_value, bool):
+        return Color.from_int(__input_value)
+    elif isinstance(__input_value, (bytes, bytearray)):
+        if len(__input_value) != 4:
+            raise PydanticCustomError('color_error', 'value is not a valid color: bytes colors must be 4 bytes long')
+        return Color.from_int(int.from_bytes(__input_value, 'big'))
+    return __input_value
+
+
+def _serialize_int(color: Color, _: core_schema.SerializationInfo) -> int:
+    return color._packed
+
+
+def _serialize_bytes(color: Color, info: core_schema.SerializationInfo) -> Union[int, bytes]:
+    if info.mode_is_json():
+        return color._packed
+    return color._packed.to_bytes(4, 'big')
+
+
+class DropOriginal:
+    """
+    `Annotated` marker dropping the value each color was validated from, e.g. `Annotated[Color, DropOriginal()]`,
+    as `original_values.configure(keep=False)` does for every color. `original()` returns the color's string form.
+    """
+
+    __slots__ = ()
+
+    def __get_pydantic_core_schema__(
+        self, schema: core_schema.CoreSchema, **_kwargs: Any
+    ) -> core_schema.AfterValidatorFunctionSchema:
+        return core_schema.general_after_validator_function(
+            _drop_original, schema, serialization=schema.get('serialization')
+        )
+
+    def __repr__(self) -> str:
+        return 'DropOriginal()'
+
+
+def _drop_original(color: Color, _: core_schema.ValidationInfo) -> Color:
+    return color._drop_original()
+
+
+class ContrastFailure(NamedTuple):
+    """
+    A pair of colors below the required contrast ratio, `key` is its index in a list or key in a dict of pairs and
+    `None` for a single pair.
+    """
+
+    key: Hashable
+    foreground: Color
+    background: Color
+    ratio: float
+
+
+def contrast_failures(pairs: Any, minimum: float = 4.5) -> List[ContrastFailure]:
+    """
+    Every `(foreground, background)` pair with a WCAG contrast ratio below `minimum`, in order.
+
+    :param pairs: a list of pairs or a dict of pairs, e.g. from a theme document, checked in one pass; relative
+      luminance is computed once per distinct RGB value. Values which aren't `Color`s, e.g. `('black', 'white')`, are
+      converted with `Color.intern`
+    :param minimum: the required contrast ratio, 4.5 is WCAG level AA for normal text
+    """
+    items: Iterable[Tuple[Hashable, Tuple[Union[ColorType, Color], Union[ColorType, Color]]]] = (
+        pairs.items() if isinstance(pairs, Mapping) else enumerate(pairs)
+    )
+    luminances: Dict[int, float] = {}
+    failures = []
+    get = luminances.get
+    for key, (foreground, background) in items:
+        if not isinstance(foreground, Color):
+            foreground = Color.intern(foreground)
+        if not isinstance(background, Color):
+            background = Color.intern(background)
+        # colors holding floats aren't cached, `get(-1)` is always `None`
+        l1 = get(-1 if foreground._rgba else foreground._packed >> 8)
+        if l1 is None:
+            l1 = _cached_luminance(foreground, luminances)
+        l2 = get(-1 if background._rgba else background._packed >> 8)
+        if l2 is None:
+            l2 = _cached_luminance(background, luminances)
+        if l1 < l2:
+            l1, l2 = l2, l1
+        if l1 + 0.05 < minimum * (l2 + 0.05):
+            failures.append(ContrastFailure(key, foreground, background, (l1 + 0.05) / (l2 + 0.05)))
+    return failures
+
+
+def _cached_luminance(color: Color, luminances: Dict[int, float]) -> float:
+    luminance = color.relative_luminance()
+    if color._rgba is None:
+        luminances[color._packed >> 8] = luminance
+    return luminance
+
+
+class MinContrast:
+    """
+    `Annotated` constraint requiring a minimum WCAG contrast ratio between `(foreground, background)` colors, e.g.
+    `Annotated[Dict[str, Tuple[Color, Color]], MinContrast(4.5)]`.
+
+    The field can hold a single pair, a list of pairs or a dict of pairs, all pairs are checked in one pass with
+    `contrast_failures` and every failing pair is reported in a single error.
+    """
+
+    __slots__ = ('minimum',)
+
+    def __init__(self, minimum: float = 4.5) -> None:
+        if not 1 <= minimum <= 21:
+            raise ValueError(f'minimum must be in the range 1 to 21, not {minimum!r}')
+        self.minimum = minimum
+
+    def __get_pydantic_core_schema__(
+        self, schema: core_schema.CoreSchema, **_kwargs: Any
+    ) -> core_schema.AfterValidatorFunctionSchema:
+        return core_schema.general_after_validator_function(
+            self._validate, schema, serialization=schema.get('serialization')
+        )
+
+    def _validate(self, __input_value: Any, _: core_schema.ValidationInfo) -> Any:
+        if __input_value is None:
+            return None
+        single = isinstance(__input_value, tuple) and len(__input_value) == 2 and isinstance(__input_value[0], Color)
+        failures = contrast_failures({None: __input_value} if single else __input_value, self.minimum)
+        if failures:
+            raise PydanticCustomError(
+                'color_contrast_error',
+                'contrast ratio must be at least {minimum}: {failures}',
+                {'minimum': self.minimum, 'failures': '; '.join(_format_contrast_failure(f) for f in failures)},
+            )
+        return __input_value
+
+    def __repr__(self) -> str:
+        return f'MinContrast({self.minimum!r})'
+
+
+def _format_contrast_failure(failure: ContrastFailure) -> str:
+    key = '' if failure.key is None else f'{failure.key!r}: '
+    return f'{key}{failure.foreground} on {failure.background} is {failure.ratio:.2f}'
+
+
+class ColorPalette:
+    """
+    A fixed list of colors, indexed with a k-d tree to find the entry closest to any color.
+
+    Lookups return the index of the closest entry, the smallest index if several are equally close, and are
+    cached by 24 bit RGB value in a bounded LRU cache. Alpha is ignored.
+
+    As a pydantic field a palette is validated from a list of values accepted by `Color` and serialized as a
+    list of color strings.
+    """
+
+    __slots__ = '_colors', '_metric', '_cache_size', '_nearest_rgb24'
+
+    def __init__(
+        self, colors: Iterable[Union[ColorType, Color]], metric: str = 'lab', cache_size: Optional[int] = 4096
+    ):
+        """
+        :param colors: the palette's entries, any value accepted by `Color`
+        :param metric: 'lab' for the closest color as perceived, 'rgb' for the closest RGB values
+        :param cache_size: maximum number of lookups cached, `None` for no limit
+        """
+        self._colors = tuple(Color.intern(c) for c in colors)
+        if not self._colors:
+            raise ValueError('a palette must have at least one color')
+        self._metric = metric
+        self._cache_size = cache_size
+        to_point = _metric_to_point(metric)
+        tree = _KDTree([(to_point(c._packed >> 8), i) for i, c in enumerate(self._colors)])
+        self._nearest_rgb24: Callable[[int], int] = lru_cache(maxsize=cache_size)(
+            lambda rgb: tree.nearest(to_point(rgb))
+        )
+
+    @property
+    def colors(self) -> Tuple[Color, ...]:
+        return self._colors
+
+    def nearest(self, color: Union[ColorType, Color]) -> int:
+        """
+        Index of the palette entry closest to a color.
+        """
+        return self._nearest_rgb24((color if isinstance(color, Color) else Color(color))._packed >> 8)
+
+    def nearest_many(self, colors: Any) -> Any:
+        """
+        Index of the palette entry closest to each color.
+
+        :param colors: an iterable of values accepted by `Color`, or a numpy array of shape `(N, 3)` or `(N, 4)`
+          with channels in the range 0 to 255
+        :return: a list of indices, or a numpy array of indices for numpy input
+        """
+        if hasattr(colors, '__array__'):
+            np = import_numpy()
+            array = np.asarray(colors)
+            if array.ndim != 2 or array.shape[1] not in (3, 4):
+                raise ValueError(f'colors array must have shape (N, 3) or (N, 4), not {array.shape}')
+            rgb = array[:, :3].astype(np.uint32)
+            unique, inverse = np.unique(rgb[:, 0] << 16 | rgb[:, 1] << 8 | rgb[:, 2], return_inverse=True)
+            indices = np.array([self._nearest_rgb24(int(v)) for v in unique], dtype=np.intp)
+            return indices[inverse.reshape(-1)]
+        return [self.nearest(c) for c in colors]
+
+    def cache_info(self) -> CacheInfo:
+        return CacheInfo(*self._nearest_rgb24.cache_info())  # type: ignore[attr-defined]
+
+    @classmethod
+    def __get_pydantic_core_schema__(cls, **_kwargs: Any) -> core_schema.PlainValidatorFunctionSchema:
+        return core_schema.general_plain_validator_function(
+            cls._validate,
+            serialization=core_schema.general_plain_serializer_function_ser_schema(
+                _serialize_palette, json_return_type='list'
+            ),
+        )
+
+    @classmethod
+    def __pydantic_modify_json_schema__(cls, field_schema: Dict[str, Any]) -> Dict[str, Any]:
+        field_schema.update(type='array', items={'type': 'string', 'format': 'color'}, minItems=1)
+        return field_schema
+
+    @classmethod
+    def _validate(cls, __input_value: Any, _: Any) -> 'ColorPalette':
+        if isinstance(__input_value, ColorPalette):
+            return __input_value
+        if not isinstance(__input_value, (list, tuple)):
+            raise PydanticCustomError(
+                'color_palette_error', 'value is not a valid color palette: value must be a list or tuple of colors'
+            )
+        colors = []
+        for i, value in enumerate(__input_value):
+            try:
+                colors.append(Color.intern(value))
+            except PydanticCustomError as e:
+                raise PydanticCustomError(
+                    'color_palette_error',
+                    'value is not a valid color palette: entry {index}: {error}',
+                    {'index': i, 'error': e.message()},
+                )
+        if not colors:
+            raise PydanticCustomError(
+                'color_palette_error', 'value is not a valid color palette: a palette must have at least one color'
+            )
+        return cls(colors)
+
+    def __len__(self) -> int:
+        return len(self._colors)
+
+    def __iter__(self) -> Iterator[Color]:
+        return iter(self._colors)
+
+    def __getitem__(self, index: int) -> Color:
+        return self._colors[index]
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, ColorPalette) and self._colors == other._colors and self._metric == other._metric
+
+    def __hash__(self) -> int:
+        return hash((self._colors, self._metric))
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return self.__class__, (self._colors, self._metric, self._cache_size)
+
+    def __repr__(self) -> str:
+        return f'ColorPalette([{", ".join(repr(str(c)) for c in self._colors)}], metric={self._metric!r})'
+
+
+def _serialize_palette(palette: ColorPalette, _: core_schema.SerializationInfo) -> List[str]:
+    return [str(c) for c in palette.colors]
+
+
+def gradient(stops: Iterable[Union[ColorType, Color]], n: int, *, space: str = 'rgb', as_array: bool = False) -> Any:
+    """
+    `n` colors evenly spaced along a gradient through `stops`, which are themselves evenly spaced, the first and
+    last colors are the first and last stops. Alpha is interpolated too.
+
+    Stops are converted to the interpolation space once per gradient, each step is then a multiply-add per
+    channel and the conversion back to RGB.
+
+    :param stops: at least two values accepted by `Color`
+    :param n: number of colors, at least 2
+    :param space: where colors are interpolated, one of
+      'rgb' - sRGB channels,
+      'hsl' - hue, saturation and lightness, hue taking the shorter way round the color wheel,
+      'oklab' - OKLab, the most perceptually even
+    :param as_array: return an `(n, 4)` numpy array of RGBA floats (see `parse_colors`), rather than a generator
+      of colors, this requires numpy to be installed
+    """
+    segments = _gradient_segments([c if isinstance(c, Color) else Color(c) for c in stops], space)
+    if n < 2:
+        raise ValueError('n must be at least 2')
+    if as_array:
+        return _gradient_array(segments, n, space)
+    return _gradient_colors(segments, n, space)
+
+
+def _gradient_segments(stops: List[Color], space: str) -> List[Tuple[List[float], List[float]]]:
+    """
+    Start and change of the interpolation space channels for each pair of consecutive stops.
+    """
+    try:
+        from_rgba = _gradient_from_rgba[space]
+    except KeyError:
+        raise ValueError(f"space must be 'rgb', 'hsl' or 'oklab', not {space!r}") from None
+    if len(stops) < 2:
+        raise ValueError('a gradient needs at least 2 stops')
+    points = [from_rgba(c) for c in stops]
+    segments = []
+    for first, end in zip(points, points[1:]):
+        start = list(first)
+        delta = [e - s for s, e in zip(start, end)]
+        if space == 'hsl':
+            # the hue of a grey is meaningless, so it takes the other color's, otherwise the shorter way round
+            if start[1] == 0:
+                start[0], delta[0] = end[0], 0
+            elif end[1] == 0:
+                delta[0] = 0
+            else:
+                delta[0] = (delta[0] + 0.5) % 1 - 0.5
+        segments.append((start, delta))
+    return segments
+
+
+def _gradient_colors(segments: List[Tuple[List[float], List[float]]], n: int, space: str) -> Iterator[Color]:
+    to_rgba = _gradient_to_rgba[space]
+    scale = len(segments) / (n - 1)
+    last = len(segments) - 1
+    for i in range(n):
+        position = i * scale
+        index = min(int(position), last)
+        t = position - index
+        (c0, c1, c2, c3), (d0, d1, d2, d3) = segments[index]
+        yield Color._from_rgba(to_rgba(c0 + t * d0, c1 + t * d1, c2 + t * d2, c3 + t * d3))
+
+
+def _gradient_array(segments: List[Tuple[List[float], List[float]]], n: int, space: str) -> 'numpy.ndarray':
+    np = import_numpy()
+    from pydantic_extra_types.types.color_array import hsla_to_rgba, oklab_to_rgba
+
+    positions = np.arange(n) * (len(segments) / (n - 1))
+    index = np.minimum(positions.astype(np.intp), len(segments) - 1)
+    t = (positions - index)[:, None]
+    starts = np.array([start for start, _ in segments])
+    deltas = np.array([delta for _, delta in segments])
+    out = np.empty((n, 4))
+    np.multiply(deltas[index], t, out=out)
+    out += starts[index]
+    if space == 'hsl':
+        return hsla_to_rgba(out)
+    elif space == 'oklab':
+        return oklab_to_rgba(out)
+    return out
+
+
+def _rgba_floats(color: Color) -> Tuple[float, float, float, float]:
+    r, g, b = color._get_rgba()[:3]
+    return r, g, b, color._alpha_float()
+
+
+def _rgba_to_hsla(color: Color) -> Tuple[float, float, float, float]:
+    h, l_, s = rgb_to_hls(*color._get_rgba()[:3])
+    return h, s, l_, color._alpha_float()
+
+
+def _rgba_to_oklab(color: Color) -> Tuple[float, float, float, float]:
+    return (*_linear_to_oklab(*color._linear_rgb()), color._alpha_float())
+
+
+def _gradient_rgba(r: float, g: float, b: float, alpha: float) -> RGBA:
+    return RGBA(r, g, b, None if _utils.almost_equal_floats(alpha, 1) else alpha)
+
+
+def _hsla_to_rgba(h: float, s: float, l_: float, alpha: float) -> RGBA:
+    return _gradient_rgba(*hls_to_rgb(h % 1, l_, s), alpha)
+
+
+def _oklab_to_rgba(lightness: float, a: float, b: float, alpha: float) -> RGBA:
+    return _gradient_rgba(*_oklab_to_srgb(lightness, a, b), alpha)
+
+
+# conversions from colors to the channels interpolated in each gradient space, and back to `RGBA`
+_gradient_from_rgba: Dict[str, Callable[[Color], Tuple[float, float, float, float]]] = {
+    'rgb': _rgba_floats,
+    'hsl': _rgba_to_hsla,
+    'oklab': _rgba_to_oklab,
+}
+_gradient_to_rgba: Dict[str, Callable[[float, float, float, float], RGBA]] = {
+    'rgb': _gradient_rgba,
+    'hsl': _hsla_to_rgba,
+    'oklab': _oklab_to_rgba,
+}
+
+
+def parse_colors(
+    values: Iterable[Union[ColorType, Color]], *, dtype: Any = 'float32', strict: bool = False
+) -> Tuple['numpy.ndarray', Dict[int, PydanticCustomError]]:
+    """
+    Parse many colors at once into an `(N, 4)` RGBA array, this requires numpy to be installed.
+
+    Values are parsed with the same grammar as `Color`, with a floating point `dtype` channels are in the range
+    0 to 1, with `uint8` they're in the range 0 to 255; alpha is 1 (or 255) where the color has no alpha channel.
+
+    :param values: colors in any form accepted by `Color`
+    :param dtype: numpy dtype of the returned array, either a floating point type or `uint8`
+    :param strict: raise the error of the first invalid value instead of collecting errors
+    :return: the array and a mapping of row index to error for invalid values, those rows are left as zeros
+    """
+    np = import_numpy()
+    dtype = np.dtype(dtype)
+    if dtype.kind == 'f':
+        scale = None
+    elif dtype == np.uint8:
+        scale = 255
+    else:
+        raise TypeError(f'dtype must be a floating point type or uint8, not {dtype}')
+
+    if not isinstance(values, (list, tuple)):
+        values = list(values)
+    out = np.zeros((len(values), 4), dtype=dtype)
+    errors: Dict[int, PydanticCustomError] = {}
+    for i, value in enumerate(values):
+        try:
+            rgba = _to_rgba(value)
+        except PydanticCustomError as e:
+            if strict:
+                raise
+            errors[i] = e
+            continue
+        r, g, b, alpha = rgba._tuple
+        if scale is None:
+            out[i] = r, g, b, 1 if alpha is None else alpha
+        else:
+            out[i] = float_to_255(r), float_to_255(g), float_to_255(b), 255 if alpha is None else float_to_255(alpha)
+    return out, errors
+
+
+def nearest_named(colors: Any, *, metric: str = 'rgb') -> Any:
+    """
+    Name of the closest named color for each color, see `Color.as_named(nearest=True)`.
+
+    :param colors: an iterable of values accepted by `Color`, or a numpy array of shape `(N, 3)` or `(N, 4)` with
+      channels in the range 0 to 255 (alpha is ignored)
+    :param metric: 'rgb' or 'lab', see `Color.as_named`
+    :return: a list of names, or a numpy array of names for numpy input
+    """
+    index = _named_color_index(metric)
+    if hasattr(colors, '__array__'):
+        np = import_numpy()
+        array = np.asarray(colors)
+        if array.ndim != 2 or array.shape[1] not in (3, 4):
+            raise ValueError(f'colors array must have shape (N, 3) or (N, 4), not {array.shape}')
+        rgb = array[:, :3].astype(np.uint32)
+        unique, inverse = np.unique(rgb[:, 0] << 16 | rgb[:, 1] << 8 | rgb[:, 2], return_inverse=True)
+        return np.array([index.nearest(int(v)) for v in unique])[inverse.reshape(-1)]
+
+    names: Dict[int, str] = {}
+    result = []
+    for color in colors:
+        rgb = (color if isinstance(color, Color) else Color(color))._packed >> 8
+        try:
+            name = names[rgb]
+        except KeyError:
+            name = names[rgb] = index.nearest(rgb)
+        result.append(name)
+    return result
+
+
+class ColorRecord(NamedTuple):
+    """
+    A row from `validate_color_column`, either `color` or `error` is set.
+    """
+
+    # row number in the file, counting from 1 and not including a CSV header or blank lines
+    row: int
+    value: Any
+    color: Union[str, int, None]
+    error: Optional[str]
+
+
+def validate_color_column(
+    lines: Iterable[str],
+    column: str,
+    *,
+    format: str = 'csv',
+    output: str = 'hex',
+    chunk_size: int = 10_000,
+    processes: Optional[int] = None,
+) -> Iterator[ColorRecord]:
+    """
+    Validate one column of a CSV or JSON Lines file as colors, yielding a `ColorRecord` for every row in order.
+
+    Rows are read and validated `chunk_size` at a time so memory use doesn't grow with the size of the file.
+    Values must be strings in one of the formats accepted by `parse_str`.
+
+    :param lines: the file's lines, e.g. the open file; CSV files should be opened with `newline=''`
+    :param column: name of the column, from the CSV header or the key in each JSON object
+    :param format: 'csv' or 'jsonl'
+    :param output: 'hex' for `as_hex()` strings or 'int' for `as_int()` integers
+    :param chunk_size: number of rows validated at a time
+    :param processes: validate chunks in a pool of this many processes, `0` means one per CPU, the default `None`
+      validates in this process
+    """
+    if output not in ('hex', 'int'):
+        raise ValueError(f"output must be 'hex' or 'int', not {output!r}")
+    if format == 'csv':
+        rows = _csv_column(lines, column)
+    elif format == 'jsonl':
+        rows = _jsonl_column(lines, column)
+    else:
+        raise ValueError(f"format must be 'csv' or 'jsonl', not {format!r}")
+
+    chunks = _chunks(rows, chunk_size)
+    if processes is None:
+        for chunk in chunks:
+            yield from _validate_column_chunk(chunk, output)
+        return
+
+    workers = processes or os.cpu_count() or 1
+    with ProcessPoolExecutor(workers) as executor:
+        # a couple of chunks per process are queued so workers don't wait, without reading the whole file ahead
+        pending: 'deque[Future[List[ColorRecord]]]' = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(_validate_column_chunk, chunk, output))
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+# row number, value and the error if the value couldn't be read from the row
+_ColumnRow = Tuple[int, Any, Optional[str]]
+
+
+def _csv_column(lines: Iterable[str], column: str) -> Iterator[_ColumnRow]:
+    reader = csv.reader(lines)
+    header = next(reader, None)
+    if header is None or column not in header:
+        raise ValueError(f'column {column!r} is not in the CSV header')
+    index = header.index(column)
+    row = 0
+    for fields in reader:
+        if not fields:
+            # blank lines are skipped, as they are in JSON Lines files
+            continue
+        row += 1
+        if index < len(fields):
+            yield row, fields[index], None
+        else:
+            yield row, None, f'row has no {column!r} column'
+
+
+def _jsonl_column(lines: Iterable[str], column: str) -> Iterator[_ColumnRow]:
+    row = 0
+    for line in lines:
+        if not line.strip():
+            continue
+        row += 1
+        try:
+            obj = json.loads(line)
+        except ValueError as e:
+            yield row, None, f'invalid JSON: {e}'
+            continue
+        if isinstance(obj, dict) and column in obj:
+            yield row, obj[column], None
+        else:
+            yield row, None, f'row has no {column!r} key'
+
+
+def _chunks(rows: Iterator[_ColumnRow], chunk_size: int) -> Iterator[List[_ColumnRow]]:
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _validate_column_chunk(chunk: List[_ColumnRow], output: str) -> List[ColorRecord]:
+    records = []
+    for row, value, error in chunk:
+        color: Union[str, int, None] = None
+        if error is None:
+            if isinstance(value, str):
+                try:
+                    c = Color(value)
+                except PydanticCustomError as e:
+                    error = e.message()
+                else:
+                    color = c.as_hex() if output == 'hex' else c._packed
+            else:
+                error = 'value is not a valid color: value must be a string'
+        records.append(ColorRecord(row, value, color, error))
+    return records
+
+
+class _KDTree:
+    """
+    Static 3 dimensional k-d tree of points each with a value, for nearest neighbour lookups.
+    """
+
+    __slots__ = ('_root',)
+
+    def __init__(self, points: List[Tuple[Tuple[float, float, float], Any]]):
+        self._root = self._build(points, 0)
+
+    @classmethod
+    def _build(cls, points: List[Tuple[Tuple[float, float, float], Any]], axis: int) -> Any:
+        if not points:
+            return None
+        points = sorted(points, key=lambda p: p[0][axis])
+        mid = len(points) // 2
+        next_axis = (axis + 1) % 3
+        point, value = points[mid]
+        return point, value, axis, cls._build(points[:mid], next_axis), cls._build(points[mid + 1 :], next_axis)
+
+    def nearest(self, point: Tuple[float, float, float]) -> Any:
+        """
+        Value of the closest point, the smallest value if several points are equally close.
+        """
+        best_distance = math.inf
+        best_value: Any = None
+
+        def search(node: Any) -> None:
+            nonlocal best_distance, best_value
+            node_point, value, axis, left, right = node
+            distance = (
+                (point[0] - node_point[0]) ** 2 + (point[1] - node_point[1]) ** 2 + (point[2] - node_point[2]) ** 2
+            )
+            if distance < best_distance or (distance == best_distance and value < best_value):
+                best_distance, best_value = distance, value
+            diff = point[axis] - node_point[axis]
+            near, far = (left, right) if diff < 0 else (right, left)
+            if near is not None:
+                search(near)
+            # the other side can only hold a point as close as the best so far if the splitting plane is that close
+            if far is not None and diff * diff <= best_distance:
+                search(far)
+
+        search(self._root)
+        return best_value
+
+
+class _NamedColorIndex:
+    __slots__ = '_tree', '_to_point'
+
+    def __init__(self, metric: str):
+        self._to_point = _metric_to_point(metric)
+        self._tree = _KDTree(
+            [(self._to_point(r << 16 | g << 8 | b), name) for (r, g, b), name in COLORS_BY_VALUE.items()]
+        )
+
+    def nearest(self, rgb: int) -> str:
+        """
+        Name of the closest named color to a `0xRRGGBB` integer.
+        """
+        return self._tree.nearest(self._to_point(rgb))
+
+
+def _metric_to_point(metric: str) -> Callable[[int], Tuple[float, float, float]]:
+    """
+    Function converting `0xRRGGBB` integers to points in the space where `metric` is the euclidean distance.
+    """
+    if metric == 'rgb':
+        return _rgb24_to_point
+    elif metric == 'lab':
+        return _rgb24_to_lab
+    else:
+        raise ValueError(f"metric must be 'rgb' or 'lab', not {metric!r}")
+
+
+@lru_cache()
+def _named_color_index(metric: str) -> _NamedColorIndex:
+    return _NamedColorIndex(metric)
+
+
+# the sRGB transfer function, encoded values up to `_SRGB_CUTOFF` (linear values up to `_SRGB_LINEAR_CUTOFF`) are
+# scaled by `_SRGB_SLOPE`, above that it's a power curve
+_SRGB_CUTOFF = 0.04045
+_SRGB_LINEAR_CUTOFF = 0.0031308
+_SRGB_SLOPE = 12.92
+_SRGB_OFFSET = 0.055
+_SRGB_SCALE = 1.055
+_SRGB_GAMMA = 2.4
+# CIE L*a*b* `f(t)` is a cube root above `_LAB_EPSILON` and linear below it
+_LAB_EPSILON = 216 / 24389
+_LAB_SLOPE = 841 / 108
+_LAB_OFFSET = 4 / 29
+
+# the matrix arithmetic below is also applied elementwise to numpy arrays by `color_array`
+_Channel = TypeVar('_Channel', float, 'numpy.ndarray')
+
+
+def _luminance(r: _Channel, g: _Channel, b: _Channel) -> _Channel:
+    """
+    WCAG relative luminance of linear sRGB.
+    """
+    return 0.2126 * r + 0.7152 * g + 0.0722 * b
+
+
+def _linear_to_xyz(r: _Channel, g: _Channel, b: _Channel) -> Tuple[_Channel, _Channel, _Channel]:
+    """
+    Linear sRGB to CIE XYZ, scaled so the D65 white point is `(1, 1, 1)`.
+    """
+    return (
+        (0.4124564 * r + 0.3575761 * g + 0.1804375 * b) / 0.95047,
+        0.2126729 * r + 0.7151522 * g + 0.0721750 * b,
+        (0.0193339 * r + 0.1191920 * g + 0.9503041 * b) / 1.08883,
+    )
+
+
+def _lab_from_f(fx: _Channel, fy: _Channel, fz: _Channel) -> Tuple[_Channel, _Channel, _Channel]:
+    """
+    CIE L*a*b* from `f(t)` of each XYZ component.
+    """
+    return 116 * fy - 16, 500 * (fx - fy), 200 * (fy - fz)
+
+
+def _rgb24_to_point(rgb: int) -> Tuple[float, float, float]:
+    return rgb >> 16, rgb >> 8 & 0xFF, rgb & 0xFF
+
+
+def _rgb24_to_lab(rgb: int) -> Tuple[float, float, float]:
+    """
+    Convert a `0xRRGGBB` sRGB integer to CIE L*a*b* with a D65 white point.
+    """
+    return _linear_to_lab(_srgb_to_linear[rgb >> 16], _srgb_to_linear[rgb >> 8 & 0xFF], _srgb_to_linear[rgb & 0xFF])
+
+
+def _linear_to_lab(r: float, g: float, b: float) -> Tuple[float, float, float]:
+    x, y, z = _linear_to_xyz(r, g, b)
+    return _lab_from_f(_lab_f(x), _lab_f(y), _lab_f(z))
+
+
+def _lab_f(t: float) -> float:
+    return t ** (1 / 3) if t > _LAB_EPSILON else t * _LAB_SLOPE + _LAB_OFFSET
+
+
+def _linear_to_oklab(r: float, g: float, b: float) -> Tuple[float, float, float]:
+    """
+    See https://bottosson.github.io/posts/oklab/
+    """
+    l_, m_, s_ = _linear_to_lms(r, g, b)
+    return _lms_to_oklab(l_ ** (1 / 3), m_ ** (1 / 3), s_ ** (1 / 3))
+
+
+def _linear_to_lms(r: _Channel, g: _Channel, b: _Channel) -> Tuple[_Channel, _Channel, _Channel]:
+    return (
+        0.4122214708 * r + 0.5363325363 * g + 0.0514459929 * b,
+        0.2119034982 * r + 0.6806995451 * g + 0.1073969566 * b,
+        0.0883024619 * r + 0.2817188376 * g + 0.6299787005 * b,
+    )
+
+
+def _lms_to_oklab(l_: _Channel, m_: _Channel, s_: _Channel) -> Tuple[_Channel, _Channel, _Channel]:
+    """
+    OKLab from the cube roots of LMS cone responses.
+    """
+    return (
+        0.2104542553 * l_ + 0.7936177850 * m_ - 0.0040720468 * s_,
+        1.9779984951 * l_ - 2.4285922050 * m_ + 0.4505937099 * s_,
+        0.0259040371 * l_ + 0.7827717662 * m_ - 0.8086757660 * s_,
+    )
+
+
+def _oklab_to_srgb(lightness: float, a: float, b: float) -> Tuple[float, float, float]:
+    """
+    `_oklab_to_linear` followed by the sRGB transfer function, colors outside the sRGB gamut are clipped.
+    """
+    r, g, b = _oklab_to_linear(lightness, a, b)
+    return _linear_to_srgb_channel(r), _linear_to_srgb_channel(g), _linear_to_srgb_channel(b)
+
+
+def _oklab_to_linear(lightness: _Channel, a: _Channel, b: _Channel) -> Tuple[_Channel, _Channel, _Channel]:
+    """
+    Inverse of `_linear_to_oklab`, colors outside the sRGB gamut give values outside 0 to 1.
+    """
+    l_ = (lightness + 0.3963377774 * a + 0.2158037573 * b) ** 3
+    m_ = (lightness - 0.1055613458 * a - 0.0638541728 * b) ** 3
+    s_ = (lightness - 0.0894841775 * a - 1.2914855480 * b) ** 3
+    return (
+        4.0767416621 * l_ - 3.3077115913 * m_ + 0.2309699292 * s_,
+        -1.2684380046 * l_ + 2.6097574011 * m_ - 0.3413193965 * s_,
+        -0.0041960863 * l_ - 0.7034186147 * m_ + 1.7076147010 * s_,
+    )
+
+
+def _linear_to_srgb_channel(c: float) -> float:
+    c = min(max(c, 0.0), 1.0)
+    return c * _SRGB_SLOPE if c <= _SRGB_LINEAR_CUTOFF else _SRGB_SCALE * c ** (1 / _SRGB_GAMMA) - _SRGB_OFFSET
+
+
+def _distance(p: Tuple[float, float, float], q: Tuple[float, float, float]) -> float:
+    return math.sqrt((p[0] - q[0]) ** 2 + (p[1] - q[1]) ** 2 + (p[2] - q[2]) ** 2)
+
+
+def _ciede2000(lab1: Tuple[float, float, float], lab2: Tuple[float, float, float]) -> float:
+    """
+    Based on: http://www2.ece.rochester.edu/~gsharma/ciede2000/ciede2000noteCRNA.pdf
+    """
+    l1, a1, b1 = lab1
+    l2, a2, b2 = lab2
+    c_bar7 = ((math.hypot(a1, b1) + math.hypot(a2, b2)) / 2) ** 7
+    g = 0.5 * (1 - math.sqrt(c_bar7 / (c_bar7 + 25**7)))
+    a1, a2 = a1 * (1 + g), a2 * (1 + g)
+    c1, c2 = math.hypot(a1, b1), math.hypot(a2, b2)
+    h1 = math.degrees(math.atan2(b1, a1)) % 360 if c1 else 0.0
+    h2 = math.degrees(math.atan2(b2, a2)) % 360 if c2 else 0.0
+
+    dh = h2 - h1
+    h_sum = h1 + h2
+    if c1 * c2 == 0:
+        dh = 0.0
+        h_bar = h_sum
+    elif abs(dh) <= 180:
+        h_bar = h_sum / 2
+    else:
+        dh += -360 if dh > 180 else 360
+        h_bar = (h_sum + 360) / 2 if h_sum < 360 else (h_sum - 360) / 2
+    dl, dc = l2 - l1, c2 - c1
+    dh_ = 2 * math.sqrt(c1 * c2) * math.sin(math.radians(dh) / 2)
+
+    l_bar50_2 = ((l1 + l2) / 2 - 50) ** 2
+    c_bar = (c1 + c2) / 2
+    t = (
+        1
+        - 0.17 * math.cos(math.radians(h_bar - 30))
+        + 0.24 * math.cos(math.radians(2 * h_bar))
+        + 0.32 * math.cos(math.radians(3 * h_bar + 6))
+        - 0.20 * math.cos(math.radians(4 * h_bar - 63))
+    )
+    d_theta = 30 * math.exp(-(((h_bar - 275) / 25) ** 2))
+    r_c = 2 * math.sqrt(c_bar**7 / (c_bar**7 + 25**7))
+    s_l = 1 + 0.015 * l_bar50_2 / math.sqrt(20 + l_bar50_2)
+    s_c = 1 + 0.045 * c_bar
+    s_h = 1 + 0.015 * c_bar * t
+    r_t = -math.sin(math.radians(2 * d_theta)) * r_c
+    return math.sqrt((dl / s_l) ** 2 + (dc / s_c) ** 2 + (dh_ / s_h) ** 2 + r_t * (dc / s_c) * (dh_ / s_h))
+
+
+def _srgb_channel_to_linear(c: float) -> float:
+    return c / _SRGB_SLOPE if c <= _SRGB_CUTOFF else ((c + _SRGB_OFFSET) / _SRGB_SCALE) ** _SRGB_GAMMA
+
+
+# linear light value of each 8 bit sRGB channel value
+_srgb_to_linear = [_srgb_channel_to_linear(i / 255) for i in range(256)]
+
+
+class BufferLayout(NamedTuple):
+    """
+    How a pixel is stored in a buffer: its size in bytes, the offsets of its channels and whether the color
+    channels are premultiplied by alpha.
+    """
+
+    size: int
+    r: int
+    g: int
+    b: int
+    a: Optional[int]
+    premultiplied: bool
+
+
+BUFFER_LAYOUTS = {
+    'RGB8': BufferLayout(3, 0, 1, 2, None, False),
+    'RGBA8': BufferLayout(4, 0, 1, 2, 3, False),
+    'BGRA8': BufferLayout(4, 2, 1, 0, 3, False),
+    'RGBA8_PREMULTIPLIED': BufferLayout(4, 0, 1, 2, 3, True),
+    'BGRA8_PREMULTIPLIED': BufferLayout(4, 2, 1, 0, 3, True),
+}
+# pixels are processed in chunks of this many by `Color.iter_buffer` to bound the memory it uses
+_buffer_chunk_pixels = 1 << 16
+# memoryview format of a native 4 byte unsigned integer
+_uint32_format = next(f for f in 'IL' if struct.calcsize(f) == 4)
+# byte offsets that make a native 4 byte unsigned integer read as `0xRRGGBBAA`
+_packed_offsets = (3, 2, 1, 0) if sys.byteorder == 'little' else (0, 1, 2, 3)
+
+
+def _buffer_layout(layout: str) -> BufferLayout:
+    try:
+        return BUFFER_LAYOUTS[layout]
+    except KeyError:
+        raise ValueError(f'layout must be one of {", ".join(map(repr, BUFFER_LAYOUTS))}, not {layout!r}') from None
+
+
+def _byte_view(buf: Any) -> memoryview:
+    """
+    A flat view of the bytes of a buffer, only non-contiguous buffers are copied.
+    """
+    view = memoryview(buf)
+    if not view.c_contiguous:
+        view = memoryview(view.tobytes())
+    return view.cast('B')
+
+
+def _pack_pixels(data: bytes, spec: BufferLayout) -> memoryview:
+    """
+    Rearrange whole pixels into native unsigned integers which read as `0xRRGGBBAA`.
+    """
+    count = len(data) // spec.size
+    out = bytearray(4 * count)
+    r, g, b, a = _packed_offsets
+    out[r::4] = data[spec.r :: spec.size]
+    out[g::4] = data[spec.g :: spec.size]
+    out[b::4] = data[spec.b :: spec.size]
+    out[a::4] = b'\xff' * count if spec.a is None else data[spec.a :: spec.size]
+    return memoryview(out).cast(_uint32_format)
+
+
+def _unpremultiply(packed: int) -> int:
+    """
+    Divide the color channels of a packed color by its alpha, rounding to 8 bits.
+    """
+    alpha = packed & 0xFF
+    if alpha == 0xFF:
+        return packed
+    elif alpha == 0:
+        return 0
+    r, g, b = packed >> 24, packed >> 16 & 0xFF, packed >> 8 & 0xFF
+    r, g, b = (min(0xFF, (c * 0xFF * 2 + alpha) // (alpha * 2)) for c in (r, g, b))
+    return r << 24 | g << 16 | b << 8 | alpha
+
+
+def _to_rgba(value: Union[ColorType, Color]) -> RGBA:
+    if isinstance(value, Color):
+        return value._get_rgba()
+    elif parse_cache.maxsize and isinstance(value, (str, tuple)):
+        return _parse_cached(value)
+    else:
+        return _parse(value)
+
+
+def _parse(value: ColorType) -> RGBA:
+    if isinstance(value, (tuple, list)):
+        return parse_tuple(value)
+    elif isinstance(value, str):
+        return parse_str(value)
+    else:
+        raise PydanticCustomError('color_error', 'value is not a valid color: value must be a tuple, list or string')
+
+
+def _parse_cached(value: ColorType) -> RGBA:
+    try:
+        rgba = parse_cache.get(value)
+    except TypeError:
+        # unhashable tuple members
+        return _parse(value)
+    if rgba is None:
+        rgba = _parse(value)
+        parse_cache.put(value, rgba)
+    return rgba
 
 
 def parse_tuple(value: Tuple[Any, ...]) -> RGBA:
@@ -232,12 +1756,16 @@ def parse_tuple(value: Tuple[Any, ...]) -> RGBA:
 
 def parse_str(value: str) -> RGBA:
     """
-    Parse a string to an RGBA tuple, trying the following formats (in this order):
+    Parse a string to an RGBA tuple, accepting the following formats:
     * named color, see COLORS_BY_NAME below
     * hex short eg. `<prefix>fff` (prefix can be `#`, `0x` or nothing)
     * hex long eg. `<prefix>ffffff` (prefix can be `#`, `0x` or nothing)
     * `rgb(<r>, <g>, <b>) `
     * `rgba(<r>, <g>, <b>, <a>)`
+    * `hsl(<h>, <s>, <l>)`
+    * `hsla(<h>, <s>, <l>, <a>)`
+
+    Named colors are looked up first, after that the leading characters decide which single grammar is tried.
     """
     value_lower = value.lower()
     try:
@@ -247,35 +1775,49 @@ def parse_str(value: str) -> RGBA:
     else:
         return ints_to_rgba(r, g, b, None)
 
-    m = re.fullmatch(r_hex_short, value_lower)
-    if m:
-        *rgb, a = m.groups()
-        r, g, b = (int(v * 2, 16) for v in rgb)
-        if a:
-            alpha: Optional[float] = int(a * 2, 16) / 255
-        else:
-            alpha = None
-        return ints_to_rgba(r, g, b, alpha)
-
-    m = re.fullmatch(r_hex_long, value_lower)
-    if m:
-        *rgb, a = m.groups()
-        r, g, b = (int(v, 16) for v in rgb)
-        if a:
-            alpha = int(a, 16) / 255
-        else:
-            alpha = None
-        return ints_to_rgba(r, g, b, alpha)
+    stripped = value_lower.strip()
+    if stripped.startswith('rgb'):
+        # commas can only match the CSS3 grammar, their absence only the CSS4 one
+        m = (_rgb_re if ',' in stripped else _rgb_v4_style_re).fullmatch(value_lower)
+        if m:
+            return ints_to_rgba(*m.groups())  # type: ignore
+    elif stripped.startswith('hsl'):
+        m = (_hsl_re if ',' in stripped else _hsl_v4_style_re).fullmatch(value_lower)
+        if m:
+            return parse_hsl(*m.groups())  # type: ignore
+    else:
+        rgba = parse_hex(stripped)
+        if rgba is not None:
+            return rgba
 
-    m = re.fullmatch(r_rgb, value_lower) or re.fullmatch(r_rgb_v4_style, value_lower)
-    if m:
-        return ints_to_rgba(*m.groups())  # type: ignore
+    raise PydanticCustomError('color_error', 'value is not a valid color: string not recognised as a valid color')
 
-    m = re.fullmatch(r_hsl, value_lower) or re.fullmatch(r_hsl_v4_style, value_lower)
-    if m:
-        return parse_hsl(*m.groups())  # type: ignore
 
-    raise PydanticCustomError('color_error', 'value is not a valid color: string not recognised as a valid color')
+def parse_hex(value: str) -> Optional[RGBA]:
+    """
+    Parse a stripped, lower case hex string with an optional `#` or `0x` prefix, returns `None` if the value
+    is not a hex color.
+    """
+    if value.startswith('#'):
+        digits = value[1:]
+    elif value.startswith('0x'):
+        digits = value[2:]
+    else:
+        digits = value
+
+    if not _hex_digits.issuperset(digits):
+        return None
+
+    length = len(digits)
+    if length in (3, 4):
+        r, g, b = (int(v, 16) * 17 for v in digits[:3])
+        alpha: Optional[float] = int(digits[3], 16) * 17 / 255 if length == 4 else None
+    elif length in (6, 8):
+        r, g, b = (int(digits[i : i + 2], 16) for i in (0, 2, 4))
+        alpha = int(digits[6:], 16) / 255 if length == 8 else None
+    else:
+        return None
+    return ints_to_rgba(r, g, b, alpha)
 
 
 def ints_to_rgba(r: Union[int, str], g: Union[int, str], b: Union[int, str], alpha: Optional[float] = None) -> RGBA:
@@ -346,6 +1888,26 @@ def float_to_255(c: float) -> int:
     return int(round(c * 255))
 
 
+def _pack_rgba(rgba: RGBA) -> Tuple[int, Optional[RGBA]]:
+    """
+    Pack `RGBA` floats into a `0xRRGGBBAA` integer, the floats are returned as well if packing loses precision.
+    """
+    r, g, b, alpha = rgba._tuple
+    r8, g8, b8 = float_to_255(r), float_to_255(g), float_to_255(b)
+    a8 = 0xFF if alpha is None else float_to_255(alpha)
+    packed = r8 << 24 | g8 << 16 | b8 << 8 | a8
+    if r8 / 255 == r and g8 / 255 == g and b8 / 255 == b and (a8 / 255 == alpha if a8 != 0xFF else alpha is None):
+        return packed, None
+    return packed, rgba
+
+
+def _unpack_rgba(packed: int) -> RGBA:
+    a8 = packed & 0xFF
+    return RGBA(
+        (packed >> 24) / 255, (packed >> 16 & 0xFF) / 255, (packed >> 8 & 0xFF) / 255, None if a8 == 0xFF else a8 / 255
+    )
+
+
 COLORS_BY_NAME = {
     'aliceblue': (240, 248, 255),
     'antiquewhite': (250, 235, 215),
@@ -497,3 +2059,8 @@ COLORS_BY_NAME = {
 }
 
 COLORS_BY_VALUE = {v: k for k, v in COLORS_BY_NAME.items()}
+_names_by_rgb24 = {r << 16 | g << 8 | b: name for (r, g, b), name in COLORS_BY_VALUE.items()}
+# shared instances of every named color, see `Color.intern`
+_named_colors = {
+    name: Color._from_packed(r << 24 | g << 16 | b << 8 | 0xFF, name) for name, (r, g, b) in COLORS_BY_NAME.items()
+}
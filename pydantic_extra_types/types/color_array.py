@@ -0,0 +1,294 @@
+"""
+Vectorized conversions between arrays of RGBA, HSLA and hex colors, and color difference and contrast for arrays of
+color pairs; this module requires numpy.
+
+RGBA and HSLA arrays have shape `(N, 4)` with every element in the range 0 to 1 (the same layout as
+`parse_colors(dtype='float32')`), an alpha of 1 means the color has no alpha channel. Hex strings and parsed hex
+colors are exactly the same as the scalar `Color` methods give, other results match them within floating point
+tolerance: hue, saturation and lightness follow `colorsys`, channels are rounded half to even.
+"""
+from typing import Any, Dict, Tuple
+
+from pydantic_core import PydanticCustomError
+
+from pydantic_extra_types.types.color import (
+    _LAB_EPSILON,
+    _LAB_OFFSET,
+    _LAB_SLOPE,
+    _SRGB_CUTOFF,
+    _SRGB_GAMMA,
+    _SRGB_LINEAR_CUTOFF,
+    _SRGB_OFFSET,
+    _SRGB_SCALE,
+    _SRGB_SLOPE,
+    _lab_from_f,
+    _linear_to_lms,
+    _linear_to_xyz,
+    _lms_to_oklab,
+    _luminance,
+    _oklab_to_linear,
+)
+
+try:
+    import numpy as np
+except ImportError as e:  # pragma: no cover
+    raise ImportError('numpy is not installed, run `pip install pydantic-extra-types[numpy]`') from e
+
+__all__ = (
+    'rgba_to_hsla',
+    'hsla_to_rgba',
+    'rgba_to_hex',
+    'hex_to_rgba',
+    'rgba_to_lab',
+    'rgba_to_oklab',
+    'oklab_to_rgba',
+    'delta_e',
+    'relative_luminance',
+    'contrast_ratio',
+)
+
+_hex_ascii = np.frombuffer(b'0123456789abcdef', dtype=np.uint8)
+# value of each ascii hex digit, 0xff for any other byte
+_ascii_nibbles = np.full(256, 0xFF, dtype=np.uint8)
+_ascii_nibbles[_hex_ascii] = np.arange(16, dtype=np.uint8)
+
+
+def rgba_to_hsla(rgba: Any) -> 'np.ndarray':
+    """
+    Convert RGBA to HSLA, row for row the same as `Color.as_hsl_tuple(alpha=True)`.
+    """
+    rgba = _as_color_array(rgba)
+    r, g, b = rgba[:, 0], rgba[:, 1], rgba[:, 2]
+    maxc = np.maximum(np.maximum(r, g), b)
+    minc = np.minimum(np.minimum(r, g), b)
+    sumc = maxc + minc
+    rangec = maxc - minc
+    light = sumc / 2.0
+    grey = rangec == 0
+    # avoid dividing by zero for greys, their hue and saturation are set to 0 below
+    safe_range = np.where(grey, 1.0, rangec)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sat = np.where(light <= 0.5, rangec / sumc, rangec / (2.0 - maxc - minc))
+    rc = (maxc - r) / safe_range
+    gc = (maxc - g) / safe_range
+    bc = (maxc - b) / safe_range
+    hue = np.where(r == maxc, bc - gc, np.where(g == maxc, 2.0 + rc - bc, 4.0 + gc - rc))
+    hue = np.mod(hue / 6.0, 1.0)
+
+    out = np.empty_like(rgba)
+    out[:, 0] = np.where(grey, 0.0, hue)
+    out[:, 1] = np.where(grey, 0.0, sat)
+    out[:, 2] = light
+    out[:, 3] = rgba[:, 3]
+    return out
+
+
+def hsla_to_rgba(hsla: Any) -> 'np.ndarray':
+    """
+    Convert HSLA to RGBA, row for row the same as `Color('hsl(...)')`.
+    """
+    hsla = _as_color_array(hsla)
+    hue, light, sat = hsla[:, 0], hsla[:, 2], hsla[:, 1]
+    m2 = np.where(light <= 0.5, light * (1.0 + sat), light + sat - (light * sat))
+    m1 = 2.0 * light - m2
+    grey = sat == 0.0
+
+    out = np.empty_like(hsla)
+    for i, offset in enumerate((1 / 3, 0.0, -1 / 3)):
+        out[:, i] = np.where(grey, light, _hue_to_channel(m1, m2, hue + offset))
+    out[:, 3] = hsla[:, 3]
+    return out
+
+
+def _hue_to_channel(m1: 'np.ndarray', m2: 'np.ndarray', hue: 'np.ndarray') -> 'np.ndarray':
+    hue = np.mod(hue, 1.0)
+    return np.select(
+        [hue < 1 / 6, hue < 0.5, hue < 2 / 3],
+        [m1 + (m2 - m1) * hue * 6.0, m2, m1 + (m2 - m1) * (2 / 3 - hue) * 6.0],
+        m1,
+    )
+
+
+def rgba_to_hex(rgba: Any) -> 'np.ndarray':
+    """
+    Convert RGBA to an array of hex strings, row for row the same as `Color.as_hex()`.
+    """
+    rgba = _as_color_array(rgba)
+    values = np.rint(rgba * 255).astype(np.uint8)
+    # matches `parse_float_alpha`, an alpha this close to 1 is no alpha at all
+    has_alpha = np.abs(rgba[:, 3] - 1) > 1e-8
+    high, low = values >> 4, values & 0xF
+    short = np.all((high == low) | [False, False, False, True], axis=1) & (~has_alpha | (high[:, 3] == low[:, 3]))
+
+    out = np.zeros((len(values), 9), dtype=np.uint8)
+    out[:, 0] = ord('#')
+    out[:, 1::2] = _hex_ascii[high]
+    out[:, 2::2] = _hex_ascii[low]
+    out[short, 1:5] = _hex_ascii[high[short]]
+    out[short, 5:] = 0
+    out[~has_alpha & short, 4] = 0
+    out[~has_alpha & ~short, 7:] = 0
+    return out.view('S9').reshape(-1).astype(str)
+
+
+def hex_to_rgba(values: Any, *, strict: bool = False) -> Tuple['np.ndarray', Dict[int, PydanticCustomError]]:
+    """
+    Parse an array of hex strings (with an optional `#` or `0x` prefix) to RGBA, row for row the same as
+    `Color(value)`.
+
+    :param values: array like of strings
+    :param strict: raise the error of the first invalid value instead of collecting errors
+    :return: the RGBA array and a mapping of row index to error for invalid values, those rows are left as zeros
+    """
+    strings = np.char.strip(np.char.lower(np.asarray(values, dtype=str).reshape(-1)))
+    lengths = np.char.str_len(strings)
+    # non ascii characters are never valid, 'replace' turns them into '?'
+    encoded = np.char.encode(strings, 'ascii', 'replace')
+    width = max(encoded.dtype.itemsize, 2)
+    codes = np.frombuffer(encoded.astype(f'S{width}').tobytes(), dtype=np.uint8).reshape(-1, width)
+
+    prefix = np.where(codes[:, 0] == ord('#'), 1, np.where((codes[:, 0] == ord('0')) & (codes[:, 1] == ord('x')), 2, 0))
+    lengths = lengths - prefix
+    positions = np.arange(8)
+    nibbles = _ascii_nibbles[codes[np.arange(len(codes))[:, None], np.minimum(prefix[:, None] + positions, width - 1)]]
+    valid = np.isin(lengths, (3, 4, 6, 8)) & np.all((nibbles != 0xFF) | (positions >= lengths[:, None]), axis=1)
+
+    nibbles = nibbles.astype(np.uint16)
+    ints = np.where((lengths <= 4)[:, None], nibbles[:, :4] * 17, nibbles[:, 0:8:2] << 4 | nibbles[:, 1:8:2])
+    # no alpha digits means an opaque color
+    ints[(lengths == 3) | (lengths == 6), 3] = 255
+    out = np.where(valid[:, None], ints / 255, 0.0)
+
+    errors: Dict[int, PydanticCustomError] = {}
+    for i in np.flatnonzero(~valid):
+        error = PydanticCustomError('color_error', 'value is not a valid color: string not recognised as a valid color')
+        if strict:
+            raise error
+        errors[int(i)] = error
+    return out, errors
+
+
+def rgba_to_lab(rgba: Any) -> 'np.ndarray':
+    """
+    Convert RGBA to an `(N, 3)` array of CIE L*a*b*, row for row the same as `Color.as_lab()`.
+    """
+    x, y, z = _linear_to_xyz(*_linear_rgb(rgba))
+    return np.stack(_lab_from_f(_lab_f(x), _lab_f(y), _lab_f(z)), axis=1)
+
+
+def _lab_f(t: 'np.ndarray') -> 'np.ndarray':
+    return np.where(t > _LAB_EPSILON, np.cbrt(t), t * _LAB_SLOPE + _LAB_OFFSET)
+
+
+def rgba_to_oklab(rgba: Any) -> 'np.ndarray':
+    """
+    Convert RGBA to an `(N, 3)` array of OKLab, row for row the same as `Color.as_oklab()`.
+    """
+    l_, m_, s_ = _linear_to_lms(*_linear_rgb(rgba))
+    return np.stack(_lms_to_oklab(np.cbrt(l_), np.cbrt(m_), np.cbrt(s_)), axis=1)
+
+
+def oklab_to_rgba(oklab: Any) -> 'np.ndarray':
+    """
+    Convert OKLab with an optional alpha column to RGBA, colors outside the sRGB gamut are clipped.
+    """
+    oklab = np.asarray(oklab, dtype=np.float64)
+    if oklab.ndim != 2 or oklab.shape[1] not in (3, 4):
+        raise ValueError(f'color array must have shape (N, 3) or (N, 4), not {oklab.shape}')
+    out = np.empty((len(oklab), 4))
+    out[:, 0], out[:, 1], out[:, 2] = _oklab_to_linear(oklab[:, 0], oklab[:, 1], oklab[:, 2])
+    rgb = np.clip(out[:, :3], 0, 1, out=out[:, :3])
+    out[:, :3] = np.where(
+        rgb <= _SRGB_LINEAR_CUTOFF, rgb * _SRGB_SLOPE, _SRGB_SCALE * rgb ** (1 / _SRGB_GAMMA) - _SRGB_OFFSET
+    )
+    out[:, 3] = oklab[:, 3] if oklab.shape[1] == 4 else 1
+    return out
+
+
+def delta_e(rgba1: Any, rgba2: Any, *, method: str = 'cie76') -> 'np.ndarray':
+    """
+    Perceived difference between each pair of colors, row for row the same as `Color.delta_e()`.
+
+    :param rgba1: RGBA array of the first color of each pair
+    :param rgba2: RGBA array of the second color of each pair
+    :param method: 'cie76', 'ciede2000' or 'oklab', see `Color.delta_e()`
+    """
+    if method == 'cie76':
+        return np.linalg.norm(rgba_to_lab(rgba1) - rgba_to_lab(rgba2), axis=1)
+    elif method == 'ciede2000':
+        return _ciede2000(rgba_to_lab(rgba1), rgba_to_lab(rgba2))
+    elif method == 'oklab':
+        return np.linalg.norm(rgba_to_oklab(rgba1) - rgba_to_oklab(rgba2), axis=1)
+    else:
+        raise ValueError(f"method must be 'cie76', 'ciede2000' or 'oklab', not {method!r}")
+
+
+def _ciede2000(lab1: 'np.ndarray', lab2: 'np.ndarray') -> 'np.ndarray':
+    l1, a1, b1 = lab1.T
+    l2, a2, b2 = lab2.T
+    c_bar7 = ((np.hypot(a1, b1) + np.hypot(a2, b2)) / 2) ** 7
+    g = 0.5 * (1 - np.sqrt(c_bar7 / (c_bar7 + 25**7)))
+    a1, a2 = a1 * (1 + g), a2 * (1 + g)
+    c1, c2 = np.hypot(a1, b1), np.hypot(a2, b2)
+    h1 = np.where(c1 != 0, np.mod(np.degrees(np.arctan2(b1, a1)), 360), 0.0)
+    h2 = np.where(c2 != 0, np.mod(np.degrees(np.arctan2(b2, a2)), 360), 0.0)
+
+    dh = h2 - h1
+    h_sum = h1 + h2
+    no_chroma = c1 * c2 == 0
+    wraps = np.abs(dh) > 180
+    dh = np.where(no_chroma, 0.0, np.where(wraps, dh + np.where(dh > 180, -360, 360), dh))
+    h_bar = np.where(
+        no_chroma | ~wraps, np.where(no_chroma, h_sum, h_sum / 2), np.where(h_sum < 360, h_sum + 360, h_sum - 360) / 2
+    )
+    dl, dc = l2 - l1, c2 - c1
+    dh_ = 2 * np.sqrt(c1 * c2) * np.sin(np.radians(dh) / 2)
+
+    l_bar50_2 = ((l1 + l2) / 2 - 50) ** 2
+    c_bar = (c1 + c2) / 2
+    t = (
+        1
+        - 0.17 * np.cos(np.radians(h_bar - 30))
+        + 0.24 * np.cos(np.radians(2 * h_bar))
+        + 0.32 * np.cos(np.radians(3 * h_bar + 6))
+        - 0.20 * np.cos(np.radians(4 * h_bar - 63))
+    )
+    d_theta = 30 * np.exp(-(((h_bar - 275) / 25) ** 2))
+    r_c = 2 * np.sqrt(c_bar**7 / (c_bar**7 + 25**7))
+    s_l = 1 + 0.015 * l_bar50_2 / np.sqrt(20 + l_bar50_2)
+    s_c = 1 + 0.045 * c_bar
+    s_h = 1 + 0.015 * c_bar * t
+    r_t = -np.sin(np.radians(2 * d_theta)) * r_c
+    return np.sqrt((dl / s_l) ** 2 + (dc / s_c) ** 2 + (dh_ / s_h) ** 2 + r_t * (dc / s_c) * (dh_ / s_h))
+
+
+def relative_luminance(rgba: Any) -> 'np.ndarray':
+    """
+    WCAG relative luminance of each color, row for row the same as `Color.relative_luminance()`.
+    """
+    return _luminance(*_linear_rgb(rgba))
+
+
+def contrast_ratio(rgba1: Any, rgba2: Any) -> 'np.ndarray':
+    """
+    WCAG contrast ratio of each pair of colors, row for row the same as `Color.contrast_ratio()`.
+    """
+    l1, l2 = relative_luminance(rgba1), relative_luminance(rgba2)
+    return (np.maximum(l1, l2) + 0.05) / (np.minimum(l1, l2) + 0.05)
+
+
+def _linear_rgb(rgba: Any) -> 'np.ndarray':
+    """
+    Linear light red, green and blue as an array of shape `(3, N)`.
+    """
+    rgb = _as_color_array(rgba)[:, :3].T
+    return np.where(rgb <= _SRGB_CUTOFF, rgb / _SRGB_SLOPE, ((rgb + _SRGB_OFFSET) / _SRGB_SCALE) ** _SRGB_GAMMA)
+
+
+def _as_color_array(values: Any) -> 'np.ndarray':
+    array = np.asarray(values, dtype=np.float64)
+    if array.ndim != 2 or array.shape[1] not in (3, 4):
+        raise ValueError(f'color array must have shape (N, 3) or (N, 4), not {array.shape}')
+    if array.shape[1] == 3:
+        array = np.concatenate([array, np.ones((len(array), 1))], axis=1)
+    return array
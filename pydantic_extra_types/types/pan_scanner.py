@@ -0,0 +1,304 @@
+"""
+Find card numbers (PANs) in large files and streams, e.g. logs, reading them in chunks so memory use doesn't depend
+on the size of the input.
+
+Candidates are runs of digits where each digit may be separated from the next by a single space or dash, e.g.
+`4242424242424242`, `4242 4242 4242 4242` or `3782-822463-10005`. Within a run, the digits between separators are
+kept together, and from each group of digits in turn the longest span of groups with 12 to 19 digits which passes
+the Luhn check and whose length is valid for its brand is a card number, the search then continues after it. So
+`4242 4242 4242 4242 100` is the card number `4242424242424242` followed by `100`, but a run of more than 19 digits
+without separators, e.g. a long ID, is never a card number.
+
+Candidates are checked with the same Luhn tables and brand ranges as `PaymentCardNumber`, without creating
+`PaymentCardNumber` instances or raising errors for the large majority of candidates which aren't card numbers.
+"""
+import os
+import re
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import IO, Deque, FrozenSet, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+from pydantic_extra_types.types.payment import _PREFIX_DIGITS, PaymentCardBrand, _lookup_brand_prefix, _luhn_sum
+
+__all__ = 'PanMatch', 'scan_pans'
+
+_MIN_DIGITS = 12
+_MAX_DIGITS = 19
+# runs with at least 12 digits, the whole run is matched since a match can't start after a digit
+_CANDIDATE = re.compile(rb'[0-9](?<![0-9]{2})(?:[ -]?[0-9]){11,}')
+_DIGITS = re.compile(rb'[0-9]+')
+# a run at the end of a chunk with too few digits to be matched by `_CANDIDATE`, which may continue in the next chunk
+_TRAILING_RUN = re.compile(rb'[0-9](?:[ -]?[0-9])*[ -]?\Z')
+_NOT_RUN = re.compile(rb'[^0-9 -]')
+_RUN_BYTES = b'0123456789 -'
+_SEPARATORS = b' -'
+_MASK = ord('*')
+_CHUNK_SIZE = 1 << 20
+# with more than one process, files are split into ranges of about this size, each scanned by one process
+_SPLIT_SIZE = 1 << 26
+
+_known_brands = frozenset(PaymentCardBrand) - {PaymentCardBrand.other}
+
+_Path = Union[str, 'os.PathLike[str]']
+
+
+class PanMatch(NamedTuple):
+    """
+    A card number found by `scan_pans`, `start` and `end` are byte offsets so `data[start:end]` is the card number
+    including any separators.
+    """
+
+    start: int
+    end: int
+    brand: PaymentCardBrand
+
+
+def scan_pans(
+    source: Union[_Path, IO[bytes]],
+    *,
+    brands: Optional[Iterable[PaymentCardBrand]] = None,
+    redact_to: Union[_Path, IO[bytes], None] = None,
+    processes: Optional[int] = 1,
+    chunk_size: int = _CHUNK_SIZE,
+) -> Iterator[PanMatch]:
+    """
+    Find card numbers in a file or binary stream, yielding them in order.
+
+    :param source: a file path or a binary file object, read from its current position
+    :param brands: the brands to find, by default every brand except `PaymentCardBrand.other`, whose card numbers
+      are any Luhn valid run of 12 to 19 digits
+    :param redact_to: a file path or binary file object to write a copy of the input to, with each card number masked
+      as `PaymentCardNumber.masked` does, so offsets are unchanged; it's written as the matches are iterated
+    :param processes: the number of processes to scan with, `None` for one per CPU; with more than one process
+      `source` and `redact_to` must be paths, and the file is split into ranges at bytes which can't be part of a card
+      number, so the result is the same as with one process
+    :param chunk_size: the number of bytes read at a time
+    """
+    if processes is None:
+        processes = os.cpu_count() or 1
+    if processes < 1:
+        raise ValueError(f'processes must be at least 1, not {processes}')
+    if chunk_size < 1:
+        raise ValueError(f'chunk_size must be at least 1, not {chunk_size}')
+    wanted = _known_brands if brands is None else frozenset(brands)
+    if processes == 1:
+        return _scan_file(source, wanted, redact_to, chunk_size)
+    paths = (str, os.PathLike)
+    if not isinstance(source, paths) or (redact_to is not None and not isinstance(redact_to, paths)):
+        raise ValueError('source and redact_to must be file paths to scan with more than one process')
+    return _scan_parallel(source, wanted, redact_to, processes, chunk_size)
+
+
+def _scan_file(
+    source: Union[_Path, IO[bytes]],
+    wanted: FrozenSet[PaymentCardBrand],
+    redact_to: Union[_Path, IO[bytes], None],
+    chunk_size: int,
+) -> Iterator[PanMatch]:
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as f:
+            yield from _scan_file(f, wanted, redact_to, chunk_size)
+    elif isinstance(redact_to, (str, os.PathLike)):
+        with open(redact_to, 'wb') as redacted:
+            yield from _scan_stream(source, wanted, redacted, chunk_size)
+    else:
+        yield from _scan_stream(source, wanted, redact_to, chunk_size)
+
+
+def _scan_parallel(
+    source: _Path, wanted: FrozenSet[PaymentCardBrand], redact_to: Optional[_Path], processes: int, chunk_size: int
+) -> Iterator[PanMatch]:
+    size = os.path.getsize(source)
+    if redact_to is not None:
+        # each process writes its range of the copy in place
+        with open(redact_to, 'wb') as f:
+            f.truncate(size)
+    with ProcessPoolExecutor(processes) as executor:
+        # submit ranges as earlier ones finish, rather than all at once, so their matches aren't all held in memory
+        pending: Deque['Future[List[PanMatch]]'] = deque()
+        for start, end in _split_ranges(source, size):
+            pending.append(executor.submit(_scan_range, source, start, end, wanted, redact_to, chunk_size))
+            if len(pending) > 2 * processes:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def _split_ranges(path: _Path, size: int) -> Iterator[Tuple[int, int]]:
+    """
+    Split a file into ranges of about `_SPLIT_SIZE` bytes, each ending before a byte which can't be part of a card
+    number, so no card number spans two ranges.
+    """
+    with open(path, 'rb') as f:
+        start = 0
+        while start < size:
+            end = start + _SPLIT_SIZE
+            f.seek(end)
+            while end < size:
+                block = f.read(1 << 16)
+                match = _NOT_RUN.search(block)
+                if match:
+                    end += match.start()
+                    break
+                end += len(block)
+            end = min(end, size)
+            yield start, end
+            start = end
+
+
+def _scan_range(
+    path: _Path,
+    start: int,
+    end: int,
+    wanted: FrozenSet[PaymentCardBrand],
+    redact_to: Optional[_Path],
+    chunk_size: int,
+) -> List[PanMatch]:
+    with open(path, 'rb') as f:
+        f.seek(start)
+        if redact_to is None:
+            return list(_scan_stream(f, wanted, None, chunk_size, start, end - start))
+        with open(redact_to, 'r+b') as redacted:
+            redacted.seek(start)
+            return list(_scan_stream(f, wanted, redacted, chunk_size, start, end - start))
+
+
+def _scan_stream(
+    f: IO[bytes],
+    wanted: FrozenSet[PaymentCardBrand],
+    redacted: Optional[IO[bytes]],
+    chunk_size: int,
+    offset: int = 0,
+    limit: Optional[int] = None,
+) -> Iterator[PanMatch]:
+    """
+    Scan `f` a chunk at a time, the end of each chunk which might be part of a card number continuing in the next
+    chunk, at most a few dozen bytes, is carried over and scanned with the next chunk.
+    """
+    carry = b''
+    while True:
+        if limit is None:
+            chunk = f.read(chunk_size)
+        else:
+            chunk = f.read(min(chunk_size, limit)) if limit else b''
+            limit -= len(chunk)
+        final = not chunk
+        buffer = carry + chunk if carry else chunk
+        found, cut = _scan_buffer(buffer, offset, wanted, final)
+        if redacted is not None:
+            redacted.write(_redact(buffer, cut, found, offset) if found else memoryview(buffer)[:cut])
+        yield from found
+        if final:
+            return
+        carry = buffer[cut:]
+        offset += cut
+
+
+def _scan_buffer(
+    buffer: bytes, offset: int, wanted: FrozenSet[PaymentCardBrand], final: bool
+) -> Tuple[List[PanMatch], int]:
+    """
+    Find card numbers in `buffer`, which starts `offset` bytes into the input, returning them and the position up to
+    which the buffer has been scanned; unless `final`, the rest might be part of a card number continuing in the next
+    chunk.
+    """
+    found: List[PanMatch] = []
+    size = len(buffer)
+    cut = size
+    last_end = 0
+    for match in _CANDIDATE.finditer(buffer):
+        start, last_end = match.span()
+        partial = not final and (last_end == size or (last_end == size - 1 and buffer[-1] in _SEPARATORS))
+        resume = _scan_run(buffer, start, last_end, offset, wanted, found, partial)
+        if partial:
+            return found, resume
+    if not final and buffer[-1] in _RUN_BYTES:
+        # a run at the end too short to be a card number, at most 11 digits and their separators
+        trailing = _TRAILING_RUN.search(buffer, max(size - 2 * _MIN_DIGITS, last_end))
+        if trailing:
+            cut = trailing.start()
+    return found, cut
+
+
+def _scan_run(
+    buffer: bytes,
+    start: int,
+    end: int,
+    offset: int,
+    wanted: FrozenSet[PaymentCardBrand],
+    found: List[PanMatch],
+    partial: bool,
+) -> int:
+    """
+    Find card numbers in the run `buffer[start:end]`, returning where scanning stopped.
+
+    If `partial`, the run may continue in the next chunk, so scanning stops at the first group of digits from which
+    a card number might include digits from the next chunk; scanning the rest as a new run in the next chunk then
+    gives the same result as scanning the whole run.
+    """
+    digits = buffer[start:end]
+    if digits.isdigit():
+        # no separators, by far the most common case
+        if len(digits) <= _MAX_DIGITS:
+            if partial:
+                return start
+            brand = _card_brand(digits, wanted)
+            if brand is not None:
+                found.append(PanMatch(offset + start, offset + end, brand))
+        # a group of more than 19 digits can't be part of a card number, carry over 20 digits so it's still too long
+        return end - _MAX_DIGITS - 1 if partial else end
+
+    groups = [m.span() for m in _DIGITS.finditer(buffer, start, end)]
+    lengths = [e - s for s, e in groups]
+    # digits in groups i onwards
+    remaining = [0] * (len(groups) + 1)
+    for j in range(len(groups) - 1, -1, -1):
+        remaining[j] = remaining[j + 1] + lengths[j]
+    i = 0
+    while i < len(groups):
+        if partial and remaining[i] <= _MAX_DIGITS:
+            return groups[i][0]
+        # spans of groups from i with 12 to 19 digits, longest first
+        spans = []
+        count = 0
+        for j in range(i, len(groups)):
+            count += lengths[j]
+            if count > _MAX_DIGITS:
+                break
+            if count >= _MIN_DIGITS:
+                spans.append(j)
+        for j in reversed(spans):
+            span_start, span_end = groups[i][0], groups[j][1]
+            brand = _card_brand(buffer[span_start:span_end].translate(None, _SEPARATORS), wanted)
+            if brand is not None:
+                found.append(PanMatch(offset + span_start, offset + span_end, brand))
+                i = j + 1
+                break
+        else:
+            i += 1
+    # as above, all groups were scanned so the last one has more than 19 digits
+    return end - _MAX_DIGITS - 1 if partial else end
+
+
+def _card_brand(digits: bytes, wanted: FrozenSet[PaymentCardBrand]) -> Optional[PaymentCardBrand]:
+    """
+    The brand of 12 to 19 ASCII digits if they're a valid card number of a brand in `wanted`, otherwise `None`.
+    """
+    if _luhn_sum(digits) % 10:
+        return None
+    brand, lengths = _lookup_brand_prefix(int(digits[:_PREFIX_DIGITS]))
+    if brand in wanted and (lengths is None or len(digits) in lengths):
+        return brand
+    return None
+
+
+def _redact(buffer: bytes, cut: int, found: List[PanMatch], offset: int) -> bytearray:
+    """
+    `buffer[:cut]` with the digits of each card number, other than the first 6 and last 4, replaced by `*`.
+    """
+    redacted = bytearray(buffer[:cut])
+    for start, end, _ in found:
+        positions = [i for i in range(start - offset, end - offset) if redacted[i] not in _SEPARATORS]
+        for i in positions[6:-4]:
+            redacted[i] = _MASK
+    return redacted
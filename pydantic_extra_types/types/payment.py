@@ -1,8 +1,21 @@
+from bisect import bisect_right
 from enum import Enum
-from typing import Any, ClassVar
+from typing import TYPE_CHECKING, Any, ClassVar, FrozenSet, Iterable, List, NamedTuple, Optional, Tuple, Union
 
 from pydantic_core import PydanticCustomError, core_schema
 
+from pydantic_extra_types.types._numpy import import_numpy
+from pydantic_extra_types.types.bin_database import BinInfo, BinLookup
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# digit characters to their value, and to the Luhn value of the doubled digit, i.e. `2 * d` or `2 * d - 9`
+_LUHN_DIGITS = bytes.maketrans(b'0123456789', bytes(range(10)))
+_LUHN_DOUBLED = bytes.maketrans(b'0123456789', bytes([0, 2, 4, 6, 8, 1, 3, 5, 7, 9]))
+# rows checked at a time by `luhn_valid_many`, bounding the size of temporary arrays
+_luhn_chunk_rows = 1 << 16
+
 
 class PaymentCardBrand(str, Enum):
     # If you add another card type, please also add it to the
@@ -10,32 +23,106 @@ class PaymentCardBrand(str, Enum):
     amex = 'American Express'
     mastercard = 'Mastercard'
     visa = 'Visa'
+    discover = 'Discover'
+    jcb = 'JCB'
+    unionpay = 'UnionPay'
+    maestro = 'Maestro'
+    diners_club = 'Diners Club'
     other = 'other'
 
     def __str__(self) -> str:
         return self.value
 
 
+class BrandRange(NamedTuple):
+    first: str
+    last: str
+    brand: PaymentCardBrand
+    lengths: Tuple[int, ...]
+
+
+_12_to_19 = tuple(range(12, 20))
+_14_to_19 = tuple(range(14, 20))
+_16_to_19 = tuple(range(16, 20))
+
+# IIN ranges by their first and last prefix, where ranges overlap the narrowest one applies, e.g. Discover's
+# 622126-622925 within UnionPay's 62
+BRAND_RANGES = (
+    BrandRange('4', '4', PaymentCardBrand.visa, (13, 16, 19)),
+    BrandRange('51', '55', PaymentCardBrand.mastercard, (16,)),
+    BrandRange('2221', '2720', PaymentCardBrand.mastercard, (16,)),
+    BrandRange('34', '34', PaymentCardBrand.amex, (15,)),
+    BrandRange('37', '37', PaymentCardBrand.amex, (15,)),
+    BrandRange('6011', '6011', PaymentCardBrand.discover, _16_to_19),
+    BrandRange('644', '649', PaymentCardBrand.discover, _16_to_19),
+    BrandRange('65', '65', PaymentCardBrand.discover, _16_to_19),
+    BrandRange('622126', '622925', PaymentCardBrand.discover, _16_to_19),
+    BrandRange('3528', '3589', PaymentCardBrand.jcb, _16_to_19),
+    BrandRange('62', '62', PaymentCardBrand.unionpay, _16_to_19),
+    BrandRange('5018', '5018', PaymentCardBrand.maestro, _12_to_19),
+    BrandRange('5020', '5020', PaymentCardBrand.maestro, _12_to_19),
+    BrandRange('5038', '5038', PaymentCardBrand.maestro, _12_to_19),
+    BrandRange('5893', '5893', PaymentCardBrand.maestro, _12_to_19),
+    BrandRange('6304', '6304', PaymentCardBrand.maestro, _12_to_19),
+    BrandRange('6759', '6759', PaymentCardBrand.maestro, _12_to_19),
+    BrandRange('6761', '6763', PaymentCardBrand.maestro, _12_to_19),
+    BrandRange('300', '305', PaymentCardBrand.diners_club, _14_to_19),
+    BrandRange('3095', '3095', PaymentCardBrand.diners_club, _14_to_19),
+    BrandRange('36', '36', PaymentCardBrand.diners_club, _14_to_19),
+    BrandRange('38', '39', PaymentCardBrand.diners_club, _14_to_19),
+)
+# number of digits of the prefixes `BRAND_RANGES` is flattened to
+_PREFIX_DIGITS = 8
+
+
+def _flatten_brand_ranges(
+    ranges: Iterable[BrandRange],
+) -> Tuple[List[int], List[Tuple[int, PaymentCardBrand, FrozenSet[int]]]]:
+    """
+    Flatten overlapping ranges into sorted, disjoint `_PREFIX_DIGITS` digit ranges, returned as the list of their
+    first prefixes, for `bisect`, and a list of `(last prefix, brand, lengths)`.
+    """
+    spans = [
+        (int(r.first.ljust(_PREFIX_DIGITS, '0')), int(r.last.ljust(_PREFIX_DIGITS, '9')), r.brand, frozenset(r.lengths))
+        for r in ranges
+    ]
+    bounds = sorted({first for first, *_ in spans} | {last + 1 for _, last, *_ in spans})
+    starts: List[int] = []
+    entries: List[Tuple[int, PaymentCardBrand, FrozenSet[int]]] = []
+    for first, end in zip(bounds, bounds[1:]):
+        covering = [span for span in spans if span[0] <= first and end - 1 <= span[1]]
+        if not covering:
+            continue
+        _, _, brand, lengths = min(covering, key=lambda span: span[1] - span[0])
+        if entries and entries[-1][0] == first - 1 and entries[-1][1:] == (brand, lengths):
+            entries[-1] = (end - 1, brand, lengths)
+        else:
+            starts.append(first)
+            entries.append((end - 1, brand, lengths))
+    return starts, entries
+
+
+_brand_starts, _brand_entries = _flatten_brand_ranges(BRAND_RANGES)
+
+
 class PaymentCardNumber(str):
     """
     Based on: https://en.wikipedia.org/wiki/Payment_card_number
+
+    Instances are plain strings without an instance `__dict__`, `bin`, `last4` and `brand` are derived from the
+    string when accessed.
     """
 
+    __slots__ = ()
+
     strip_whitespace: ClassVar[bool] = True
     min_length: ClassVar[int] = 12
     max_length: ClassVar[int] = 19
-    bin: str
-    last4: str
-    brand: PaymentCardBrand
+    # where `bin_info` is looked up, e.g. a `BinDatabase`
+    bin_database: ClassVar[Optional[BinLookup]] = None
 
     def __init__(self, card_number: str):
-        self.validate_digits(card_number)
-
-        card_number = self.validate_luhn_check_digit(card_number)
-
-        self.bin = card_number[:6]
-        self.last4 = card_number[-4:]
-        self.brand = self.validate_brand(card_number)
+        self._validate_card_number(card_number)
 
     @classmethod
     def __get_pydantic_core_schema__(cls, **_kwargs: Any) -> core_schema.AfterValidatorFunctionSchema:
@@ -48,7 +135,37 @@ class PaymentCardNumber(str):
 
     @classmethod
     def validate(cls, __input_value: str, _: core_schema.ValidationInfo) -> 'PaymentCardNumber':
-        return cls(__input_value)
+        cls._validate_card_number(__input_value)
+        # already validated, so skip `__init__`
+        return str.__new__(cls, __input_value)
+
+    @classmethod
+    def _validate_card_number(cls, card_number: str) -> None:
+        cls.validate_digits(card_number)
+        cls.validate_luhn_check_digit(card_number)
+        cls.validate_brand(card_number)
+
+    @property
+    def bin(self) -> str:
+        return self[:6]
+
+    @property
+    def last4(self) -> str:
+        return self[-4:]
+
+    @property
+    def brand(self) -> PaymentCardBrand:
+        return _lookup_brand(self)[0]
+
+    @property
+    def bin_info(self) -> Optional[BinInfo]:
+        """
+        Issuer country, card type and bank from `bin_database`, looked up when accessed; `None` if the card's BIN
+        isn't in the database.
+        """
+        if self.bin_database is None:
+            raise ValueError('no BIN database, set `PaymentCardNumber.bin_database` first')
+        return self.bin_database.lookup(self)
 
     @property
     def masked(self) -> str:
@@ -64,54 +181,121 @@ class PaymentCardNumber(str):
     def validate_luhn_check_digit(cls, card_number: str) -> str:
         """
         Based on: https://en.wikipedia.org/wiki/Luhn_algorithm
+
+        Digits are mapped to their Luhn values with `bytes.translate`, every other digit from the right through a
+        table of doubled digits, so the sum is computed without a Python loop.
         """
-        sum_ = int(card_number[-1])
-        length = len(card_number)
-        parity = length % 2
-        for i in range(length - 1):
-            digit = int(card_number[i])
-            if i % 2 == parity:
-                digit *= 2
-            if digit > 9:
-                digit -= 9
-            sum_ += digit
-        valid = sum_ % 10 == 0
-        if not valid:
+        if _luhn_sum(_ascii_digits(card_number)) % 10:
             raise PydanticCustomError('payment_card_number_luhn', 'Card number is not luhn valid')
         return card_number
 
     @staticmethod
     def validate_brand(card_number: str) -> PaymentCardBrand:
         """
-        Validate length based on BIN for major brands:
+        Validate length based on BIN for major brands, see `BRAND_RANGES`:
         https://en.wikipedia.org/wiki/Payment_card_number#Issuer_identification_number_(IIN)
         """
-        if card_number[0] == '4':
-            brand = PaymentCardBrand.visa
-        elif 51 <= int(card_number[:2]) <= 55:
-            brand = PaymentCardBrand.mastercard
-        elif card_number[:2] in {'34', '37'}:
-            brand = PaymentCardBrand.amex
-        else:
-            brand = PaymentCardBrand.other
-
-        required_length: None | int | str = None
-        if brand in PaymentCardBrand.mastercard:
-            required_length = 16
-            valid = len(card_number) == required_length
-        elif brand == PaymentCardBrand.visa:
-            required_length = '13, 16 or 19'
-            valid = len(card_number) in {13, 16, 19}
-        elif brand == PaymentCardBrand.amex:
-            required_length = 15
-            valid = len(card_number) == required_length
-        else:
-            valid = True
-
-        if not valid:
+        brand, lengths = _lookup_brand(card_number)
+        if lengths and len(card_number) not in lengths:
             raise PydanticCustomError(
                 'payment_card_number_brand',
                 'Length for a {brand} card must be {required_length}',
-                {'brand': brand, 'required_length': required_length},
+                {'brand': brand, 'required_length': _format_lengths(lengths)},
             )
         return brand
+
+
+def luhn_valid_many(pans: Any, width: Optional[int] = None) -> 'np.ndarray':
+    """
+    Check the Luhn check digit of many fixed width card numbers in one vectorized pass, returning a boolean mask.
+
+    Shorter numbers must be padded on the left with zeros, which doesn't change their check digit; rows containing
+    anything other than the digits 0-9 are invalid.
+
+    :param pans: a numpy array of `bytes` or `str` (dtype `S` or `U`), a 2 dimensional `uint8` array of ASCII digits
+      with one number per row, or any contiguous buffer of ASCII digits, e.g. `bytes` or a memory map of a file
+    :param width: the number of digits per card number, required for buffers
+    """
+    np = import_numpy()
+    if isinstance(pans, np.ndarray) and pans.dtype.kind == 'U':
+        # checked by code point rather than encoded, anything beyond ASCII becomes 0xFF so its row is invalid
+        code_points = np.ascontiguousarray(pans, dtype=pans.dtype.newbyteorder('=')).view(np.uint32)
+        digits = np.minimum(code_points, 0xFF).astype(np.uint8).reshape(len(pans), pans.dtype.itemsize // 4)
+    elif isinstance(pans, np.ndarray) and pans.dtype.kind == 'S':
+        digits = np.ascontiguousarray(pans).view(np.uint8).reshape(len(pans), pans.dtype.itemsize)
+    elif isinstance(pans, np.ndarray) and pans.ndim == 2:
+        if pans.dtype != np.uint8:
+            raise ValueError(f'a 2 dimensional array of card numbers must have dtype uint8, not {pans.dtype}')
+        digits = pans
+    else:
+        if width is None:
+            raise ValueError('width is required to split a buffer into card numbers')
+        data = np.frombuffer(pans, dtype=np.uint8)
+        if width < 1 or len(data) % width:
+            raise ValueError(f'buffer length must be a multiple of width {width}, not {len(data)}')
+        digits = data.reshape(-1, width)
+
+    values = np.frombuffer(_LUHN_DIGITS, dtype=np.uint8)
+    doubled = np.frombuffer(_LUHN_DOUBLED, dtype=np.uint8)
+    # indices of doubled digits, counted from the left as `validate_luhn_check_digit` does
+    parity = digits.shape[1] % 2
+    mask = np.empty(len(digits), dtype=bool)
+    for start in range(0, len(digits), _luhn_chunk_rows):
+        block = digits[start : start + _luhn_chunk_rows]
+        total = values.take(block[:, 1 - parity :: 2]).sum(axis=1, dtype=np.uint32)
+        total += doubled.take(block[:, parity::2]).sum(axis=1, dtype=np.uint32)
+        is_digits = ((block >= 0x30) & (block <= 0x39)).all(axis=1)
+        mask[start : start + len(block)] = is_digits & (total % 10 == 0)
+    return mask
+
+
+def _ascii_digits(card_number: str) -> bytes:
+    """
+    The card number as ASCII digits, other unicode digits are converted to their ASCII equivalent.
+    """
+    try:
+        digits = card_number.encode('ascii')
+    except UnicodeEncodeError:
+        digits = ''.join(str(int(c)) for c in card_number).encode('ascii')
+    if not digits.isdigit():
+        raise PydanticCustomError('payment_card_number_digits', 'Card number is not all digits')
+    return digits
+
+
+def _luhn_sum(digits: bytes) -> int:
+    """
+    Luhn sum of ASCII digits, the check digit is valid if it's a multiple of 10.
+    """
+    parity = len(digits) % 2
+    return sum(digits[1 - parity :: 2].translate(_LUHN_DIGITS)) + sum(digits[parity::2].translate(_LUHN_DOUBLED))
+
+
+def _lookup_brand(card_number: str) -> Tuple[PaymentCardBrand, Optional[FrozenSet[int]]]:
+    """
+    Brand and allowed lengths for a card number, found with a binary search of the flattened `BRAND_RANGES`.
+    """
+    return _lookup_brand_prefix(int(card_number[:_PREFIX_DIGITS].ljust(_PREFIX_DIGITS, '0')))
+
+
+def _lookup_brand_prefix(prefix: int) -> Tuple[PaymentCardBrand, Optional[FrozenSet[int]]]:
+    """
+    Brand and allowed lengths for the first `_PREFIX_DIGITS` digits of a card number, as an integer.
+    """
+    i = bisect_right(_brand_starts, prefix) - 1
+    if i >= 0:
+        last, brand, lengths = _brand_entries[i]
+        if prefix <= last:
+            return brand, lengths
+    return PaymentCardBrand.other, None
+
+
+def _format_lengths(lengths: FrozenSet[int]) -> Union[int, str]:
+    """
+    Allowed lengths for error messages, e.g. `16`, `'13, 16 or 19'` or `'16 to 19'`.
+    """
+    ordered = sorted(lengths)
+    if len(ordered) == 1:
+        return ordered[0]
+    elif len(ordered) > 2 and ordered[-1] - ordered[0] == len(ordered) - 1:
+        return f'{ordered[0]} to {ordered[-1]}'
+    return f'{", ".join(map(str, ordered[:-1]))} or {ordered[-1]}'
@@ -0,0 +1,54 @@
+import pytest
+
+from pydantic_extra_types import Color
+
+numpy = pytest.importorskip('numpy')
+
+from pydantic_extra_types.types.color_array import hex_to_rgba, hsla_to_rgba, rgba_to_hex, rgba_to_hsla  # noqa: E402
+
+COLORS = [Color.from_int(i * 0x9E3779B1 % 0x100000000) for i in range(10_000)]
+RGBA = numpy.array([c._get_rgba()[:3] + (c._alpha_float(),) for c in COLORS])
+HSLA = rgba_to_hsla(RGBA)
+HEX = rgba_to_hex(RGBA)
+
+
+@pytest.mark.benchmark(group='rgb-to-hsl')
+def test_rgba_to_hsla(benchmark):
+    benchmark(rgba_to_hsla, RGBA)
+
+
+@pytest.mark.benchmark(group='rgb-to-hsl')
+def test_as_hsl_tuple(benchmark):
+    benchmark(lambda: [c.as_hsl_tuple(alpha=True) for c in COLORS])
+
+
+@pytest.mark.benchmark(group='hsl-to-rgb')
+def test_hsla_to_rgba(benchmark):
+    benchmark(hsla_to_rgba, HSLA)
+
+
+@pytest.mark.benchmark(group='hsl-to-rgb')
+def test_hsl_strings(benchmark):
+    values = [f'hsl({h}turn, {s * 100}%, {l_ * 100}%, {a})' for h, s, l_, a in HSLA.tolist()]
+    benchmark(lambda: [Color(v).as_rgb_tuple() for v in values])
+
+
+@pytest.mark.benchmark(group='rgb-to-hex')
+def test_rgba_to_hex(benchmark):
+    benchmark(rgba_to_hex, RGBA)
+
+
+@pytest.mark.benchmark(group='rgb-to-hex')
+def test_as_hex(benchmark):
+    benchmark(lambda: [c.as_hex() for c in COLORS])
+
+
+@pytest.mark.benchmark(group='hex-to-rgb')
+def test_hex_to_rgba(benchmark):
+    benchmark(hex_to_rgba, HEX)
+
+
+@pytest.mark.benchmark(group='hex-to-rgb')
+def test_hex_colors(benchmark):
+    values = HEX.tolist()
+    benchmark(lambda: [Color(v)._get_rgba() for v in values])
@@ -0,0 +1,51 @@
+import pytest
+
+from pydantic_extra_types import Color
+from pydantic_extra_types.types.color import COLORS_BY_VALUE, nearest_named, parse_colors
+
+numpy = pytest.importorskip('numpy')
+
+VALUES = [f'rgba({i % 256}, {i // 256 % 256}, 128, 0.5)' for i in range(10_000)]
+
+
+@pytest.mark.benchmark(group='parse_colors')
+def test_parse_colors(benchmark):
+    array, errors = benchmark(parse_colors, VALUES, dtype=numpy.uint8)
+    assert array.shape == (len(VALUES), 4)
+    assert not errors
+
+
+@pytest.mark.benchmark(group='parse_colors')
+def test_color_per_row(benchmark):
+    def run():
+        return numpy.array([Color(v).as_rgb_tuple(alpha=True) for v in VALUES])
+
+    assert benchmark(run).shape == (len(VALUES), 4)
+
+
+COLORS = [Color.from_int(i * 0x9E3779B1 % 0x100000000 | 0xFF) for i in range(2_000)]
+
+
+@pytest.mark.parametrize('metric', ['rgb', 'lab'])
+@pytest.mark.benchmark(group='nearest_named')
+def test_nearest_named(benchmark, metric: str):
+    assert len(benchmark(nearest_named, COLORS, metric=metric)) == len(COLORS)
+
+
+@pytest.mark.benchmark(group='nearest_named')
+def test_nearest_named_scan(benchmark):
+    named = list(COLORS_BY_VALUE.items())
+
+    def run():
+        return [
+            min(named, key=lambda n: (n[0][0] - r) ** 2 + (n[0][1] - g) ** 2 + (n[0][2] - b) ** 2)[1]
+            for r, g, b in (c.as_rgb_tuple(alpha=False) for c in COLORS)
+        ]
+
+    assert len(benchmark(run)) == len(COLORS)
+
+
+@pytest.mark.benchmark(group='nearest_named')
+def test_nearest_named_numpy(benchmark):
+    array = numpy.array([c.as_rgb_tuple(alpha=False) for c in COLORS], dtype=numpy.uint8)
+    assert len(benchmark(nearest_named, array)) == len(COLORS)
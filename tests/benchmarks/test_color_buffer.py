@@ -0,0 +1,31 @@
+import pytest
+
+from pydantic_extra_types import Color
+
+# a 256x256 RGBA image with 4096 distinct colors
+IMAGE = bytes(v for i in range(256 * 256) for v in (i % 16 * 17, i // 16 % 16 * 17, i // 256 % 16 * 17, 0xFF))
+
+
+@pytest.mark.benchmark(group='buffer-unique')
+def test_iter_buffer_unique(benchmark):
+    colors = benchmark(lambda: list(Color.iter_buffer(IMAGE, unique=True)))
+    assert len(colors) == 4096
+
+
+@pytest.mark.benchmark(group='buffer-unique')
+def test_tuples_unique(benchmark):
+    """
+    What `iter_buffer` replaces: a tuple per pixel, deduplicated then parsed.
+    """
+    colors = benchmark(lambda: [Color((r, g, b, a / 255)) for r, g, b, a in dict.fromkeys(zip(*(iter(IMAGE),) * 4))])
+    assert len(colors) == 4096
+
+
+@pytest.mark.benchmark(group='buffer-all')
+def test_iter_buffer(benchmark):
+    benchmark(lambda: list(Color.iter_buffer(IMAGE)))
+
+
+@pytest.mark.benchmark(group='buffer-all')
+def test_from_buffer(benchmark):
+    benchmark(lambda: [Color.from_buffer(IMAGE, offset) for offset in range(0, len(IMAGE), 4)])
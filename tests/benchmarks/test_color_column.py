@@ -0,0 +1,43 @@
+import csv
+import io
+
+import pytest
+
+from pydantic_extra_types import Color
+from pydantic_extra_types.types.color import validate_color_column
+
+ROWS = 20_000
+CSV = 'id,color\n' + ''.join(
+    f'{i},{v}\n' for i, v in enumerate(['#12345678', 'red', 'rgb(1, 2, 3)', 'nope', 'hsl(270, 60%, 70%)'] * (ROWS // 5))
+)
+
+
+@pytest.mark.benchmark(group='color-column')
+def test_validate_color_column(benchmark):
+    benchmark(lambda: sum(1 for _ in validate_color_column(io.StringIO(CSV), 'color')))
+
+
+@pytest.mark.benchmark(group='color-column')
+def test_validate_color_column_processes(benchmark):
+    """
+    Only faster than one process on files much bigger than this, where the pool's start up cost is amortised.
+    """
+    benchmark(lambda: sum(1 for _ in validate_color_column(io.StringIO(CSV), 'color', chunk_size=2_000, processes=2)))
+
+
+@pytest.mark.benchmark(group='color-column')
+def test_dict_reader(benchmark):
+    """
+    The loop `validate_color_column` replaces, which also keeps every row in memory.
+    """
+
+    def validate():
+        results = []
+        for row in csv.DictReader(io.StringIO(CSV)):
+            try:
+                results.append(Color(row['color']).as_hex())
+            except ValueError as e:
+                results.append(str(e))
+        return results
+
+    benchmark(validate)
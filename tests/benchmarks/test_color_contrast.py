@@ -0,0 +1,50 @@
+from typing import Dict, Tuple
+
+import pytest
+from typing_extensions import Annotated
+
+from pydantic import BaseModel
+from pydantic_extra_types import Color, MinContrast
+from pydantic_extra_types.types.color import contrast_failures
+
+# a theme file with 20k pairs drawn from 200 distinct colors, as theme tokens reuse a small palette
+PALETTE = [f'#{i * 0x9E3779B1 % 0x1000000:06x}' for i in range(200)]
+PAIRS = {f'token-{i}': (PALETTE[i % 200], PALETTE[i * 7 % 199]) for i in range(20_000)}
+COLOR_PAIRS = {k: (Color(fg), Color(bg)) for k, (fg, bg) in PAIRS.items()}
+
+
+class Theme(BaseModel):
+    pairs: Dict[str, Tuple[Color, Color]]
+
+
+class CheckedTheme(BaseModel):
+    pairs: Annotated[Dict[str, Tuple[Color, Color]], MinContrast(1.5)]
+
+
+@pytest.mark.benchmark(group='contrast')
+def test_contrast_failures(benchmark):
+    benchmark(contrast_failures, COLOR_PAIRS)
+
+
+@pytest.mark.benchmark(group='contrast')
+def test_contrast_ratio(benchmark):
+    """
+    Calling `contrast_ratio` for every pair, computing luminance twice per pair.
+    """
+    benchmark(lambda: [k for k, (fg, bg) in COLOR_PAIRS.items() if fg.contrast_ratio(bg) < 4.5])
+
+
+@pytest.mark.benchmark(group='contrast-validation')
+@pytest.mark.parametrize('model', [Theme, CheckedTheme])
+def test_validate_theme(benchmark, model):
+    """
+    Validating the whole theme, with and without the contrast check.
+    """
+
+    def validate():
+        try:
+            model(pairs=PAIRS)
+        except ValueError:
+            pass
+
+    benchmark(validate)
@@ -0,0 +1,34 @@
+import pytest
+
+from pydantic_extra_types import Color
+
+numpy = pytest.importorskip('numpy')
+
+from pydantic_extra_types.types.color_array import contrast_ratio, delta_e  # noqa: E402
+
+COLORS = [Color.from_int(i * 0x9E3779B1 % 0x100000000) for i in range(10_000)]
+OTHERS = COLORS[1:] + COLORS[:1]
+RGBA = numpy.array([c._get_rgba()[:3] + (c._alpha_float(),) for c in COLORS])
+OTHER_RGBA = numpy.roll(RGBA, -1, axis=0)
+
+
+@pytest.mark.benchmark(group='contrast-ratio')
+def test_contrast_ratio(benchmark):
+    benchmark(lambda: [c1.contrast_ratio(c2) for c1, c2 in zip(COLORS, OTHERS)])
+
+
+@pytest.mark.benchmark(group='contrast-ratio')
+def test_contrast_ratio_batch(benchmark):
+    benchmark(contrast_ratio, RGBA, OTHER_RGBA)
+
+
+@pytest.mark.parametrize('method', ['cie76', 'ciede2000', 'oklab'])
+@pytest.mark.benchmark(group='delta-e')
+def test_delta_e(benchmark, method):
+    benchmark(lambda: [c1.delta_e(c2, method=method) for c1, c2 in zip(COLORS, OTHERS)])
+
+
+@pytest.mark.parametrize('method', ['cie76', 'ciede2000', 'oklab'])
+@pytest.mark.benchmark(group='delta-e')
+def test_delta_e_batch(benchmark, method):
+    benchmark(delta_e, RGBA, OTHER_RGBA, method=method)
@@ -0,0 +1,51 @@
+import colorsys
+from collections import deque
+
+import pytest
+
+from pydantic_extra_types import Color
+from pydantic_extra_types.types.color import gradient
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+STOPS = [Color('red'), Color('rgba(0, 255, 0, 0.5)'), Color('hsl(240, 50%, 50%)'), Color('white')]
+
+
+@pytest.mark.skipif(numpy is None, reason='numpy not installed')
+@pytest.mark.benchmark(group='gradient-array')
+@pytest.mark.parametrize('space', ['rgb', 'hsl', 'oklab'])
+def test_gradient_array(benchmark, space):
+    """
+    A 10^6 step gradient written straight into one (N, 4) array.
+    """
+    benchmark(gradient, STOPS, 1_000_000, space=space, as_array=True)
+
+
+@pytest.mark.benchmark(group='gradient')
+@pytest.mark.parametrize('space', ['rgb', 'hsl', 'oklab'])
+def test_gradient_colors(benchmark, space):
+    """
+    Consume a 10^5 step gradient of `Color` objects without keeping them.
+    """
+    benchmark(lambda: deque(gradient(STOPS, 100_000, space=space), maxlen=0))
+
+
+@pytest.mark.benchmark(group='gradient')
+def test_naive_hsl(benchmark):
+    """
+    Converting both stops and building a `Color` from an hsl string at every step, the way it's done without `gradient`.
+    """
+
+    def naive(n):
+        for i in range(n):
+            t = i / (n - 1)
+            h1, l1, s1 = colorsys.rgb_to_hls(*[v / 255 for v in STOPS[0].as_rgb_tuple(alpha=False)])
+            h2, l2, s2 = colorsys.rgb_to_hls(*[v / 255 for v in STOPS[1].as_rgb_tuple(alpha=False)])
+            yield Color(
+                f'hsl({(h1 + (h2 - h1) * t) * 360}, {(s1 + (s2 - s1) * t) * 100}%, {(l1 + (l2 - l1) * t) * 100}%)'
+            )
+
+    benchmark(lambda: deque(naive(100_000), maxlen=0))
@@ -0,0 +1,64 @@
+import bisect
+
+import pytest
+
+from pydantic_extra_types import Color
+
+
+class TupleColor(Color):
+    """
+    Compared and hashed through `as_rgb_tuple()`, as colors were before they were packed.
+    """
+
+    __slots__ = ()
+
+    def __eq__(self, other):
+        return isinstance(other, Color) and self.as_rgb_tuple() == other.as_rgb_tuple()
+
+    def __hash__(self):
+        return hash(self.as_rgb_tuple())
+
+
+# a quarter of the colors are duplicates
+N = 200_000
+PACKED = [i * 0x9E3779B1 % (N * 3 // 4) * 0x2545F491 % 0x100000000 for i in range(N)]
+
+
+@pytest.fixture(scope='module', params=[Color, TupleColor], ids=['packed', 'tuple'])
+def colors(request):
+    return [request.param.from_int(p) for p in PACKED]
+
+
+@pytest.mark.benchmark(group='color-set')
+def test_dedup(benchmark, colors):
+    assert len(benchmark(set, colors)) == N * 3 // 4
+
+
+@pytest.mark.benchmark(group='color-dict')
+def test_dict_lookup(benchmark, colors):
+    counts = dict.fromkeys(colors, 0)
+
+    def count():
+        for c in colors:
+            counts[c] += 1
+
+    benchmark(count)
+
+
+@pytest.mark.benchmark(group='color-sort')
+def test_sort(benchmark):
+    colors = [Color.from_int(p) for p in PACKED]
+    assert benchmark(sorted, colors)[0].as_int() == min(PACKED)
+
+
+@pytest.mark.benchmark(group='color-sort')
+def test_sort_by_key(benchmark):
+    colors = [Color.from_int(p) for p in PACKED]
+    benchmark(sorted, colors, key=Color.as_int)
+
+
+@pytest.mark.benchmark(group='color-bisect')
+def test_bisect(benchmark):
+    palette = sorted({Color.from_int(p) for p in PACKED})
+    needles = [Color.from_int(p) for p in PACKED[:10_000]]
+    benchmark(lambda: [bisect.bisect_left(palette, c) for c in needles])
@@ -0,0 +1,90 @@
+import gc
+import json
+import tracemalloc
+from typing import Callable, List
+
+import pytest
+from typing_extensions import Annotated
+
+from pydantic import BaseModel
+from pydantic_extra_types import Color, DropOriginal
+
+N = 10_000
+# every value is exact with 8 bit channels, so is stored as a single packed integer
+PACKED_VALUES = [f'#{i * 97 % 0xFFFFFF:06x}' for i in range(N)]
+# a fractional channel needs float precision, so these keep the `RGBA` floats as well
+FLOAT_VALUES = [f'rgb({i % 256}, {i // 256 % 256}, 0.5)' for i in range(N)]
+
+
+def allocated_per_color(build: Callable[[], List[Color]]) -> float:
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        colors = build()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    assert len(colors) == N
+    return sum(stat.size_diff for stat in after.compare_to(before, 'filename')) / N
+
+
+@pytest.mark.benchmark(group='color-memory')
+def test_packed_colors(benchmark):
+    def build():
+        return [Color(v) for v in PACKED_VALUES]
+
+    benchmark.extra_info['bytes_per_color'] = packed = allocated_per_color(build)
+    benchmark.extra_info['bytes_per_float_color'] = floats = allocated_per_color(
+        lambda: [Color(v) for v in FLOAT_VALUES]
+    )
+    assert packed < floats / 2
+    benchmark(build)
+
+
+@pytest.mark.benchmark(group='color-memory')
+def test_float_colors(benchmark):
+    benchmark(lambda: [Color(v) for v in FLOAT_VALUES])
+
+
+DOCUMENT = json.dumps({'colors': [[i & 0xFF, i >> 8 & 0xFF, i >> 16 & 0xFF] for i in range(0, 20_000 * 97, 97)]})
+
+
+class Model(BaseModel):
+    colors: List[Color]
+
+
+class DropModel(BaseModel):
+    colors: List[Annotated[Color, DropOriginal()]]
+
+
+def retained(model):
+    """
+    Bytes still allocated by validating `DOCUMENT` once the parsed document itself is gone.
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        m = model(**json.loads(DOCUMENT))
+        gc.collect()
+        return tracemalloc.get_traced_memory()[0], m
+    finally:
+        tracemalloc.stop()
+
+
+@pytest.mark.benchmark(group='original-memory')
+@pytest.mark.parametrize('model', [Model, DropModel])
+def test_validate(benchmark, model):
+    """
+    Time to validate 20k colors given as `[r, g, b]` lists, the retained memory is in `extra_info`.
+    """
+    benchmark.extra_info['retained_bytes'], _ = retained(model)
+    benchmark(lambda: model(**json.loads(DOCUMENT)))
+
+
+def test_retained():
+    """
+    Not a benchmark, checks the lists are freed when the originals are dropped.
+    """
+    kept, _ = retained(Model)
+    dropped, _ = retained(DropModel)
+    assert dropped < kept * 0.6
@@ -0,0 +1,56 @@
+import pytest
+
+from pydantic_extra_types import Color, ColorPalette
+from pydantic_extra_types.types.color import _rgb24_to_lab
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+PALETTE = ColorPalette([Color.from_int(i * 0x9E3779B1 % 0x100000000 | 0xFF) for i in range(1, 65)])
+COLORS = [Color.from_int(i * 0x2545F491 % 0x100000000) for i in range(10_000)]
+
+
+@pytest.mark.benchmark(group='palette')
+def test_nearest_many(benchmark):
+    """
+    Every lookup is a cache miss, the palette is rebuilt each round to start with an empty cache.
+    """
+    benchmark.pedantic(
+        lambda palette: palette.nearest_many(COLORS), setup=lambda: ((ColorPalette(PALETTE),), {}), rounds=5
+    )
+
+
+@pytest.mark.benchmark(group='palette')
+def test_nearest_many_cached(benchmark):
+    """
+    1000 distinct colors, so after the first round every lookup is a cache hit.
+    """
+    colors = COLORS[:1_000] * 10
+    benchmark(PALETTE.nearest_many, colors)
+
+
+@pytest.mark.benchmark(group='palette')
+def test_scan(benchmark):
+    """
+    Comparing every color with every palette entry.
+    """
+    points = [_rgb24_to_lab(c.as_int() >> 8) for c in PALETTE]
+
+    def nearest(c):
+        point = _rgb24_to_lab(c.as_int() >> 8)
+        return min(range(len(points)), key=lambda i: sum((a - b) ** 2 for a, b in zip(point, points[i])))
+
+    benchmark.pedantic(lambda: [nearest(c) for c in COLORS], rounds=1)
+
+
+@pytest.mark.skipif(numpy is None, reason='numpy not installed')
+@pytest.mark.benchmark(group='palette-image')
+def test_quantize_image(benchmark):
+    """
+    Map a 512x512 image with 16k distinct colors onto the palette.
+    """
+    rgb = numpy.arange(512 * 512, dtype=numpy.uint32) * 0x9E3779B1 % 0x4000
+    image = numpy.stack([rgb >> 6 << 2 & 0xFF, rgb << 2 & 0xFF, rgb >> 12 << 6], axis=1).astype(numpy.uint8)
+    benchmark(PALETTE.nearest_many, image)
@@ -0,0 +1,80 @@
+import re
+from typing import Optional
+
+import pytest
+
+from pydantic_extra_types.types.color import (
+    COLORS_BY_NAME,
+    RGBA,
+    ints_to_rgba,
+    parse_hsl,
+    parse_str,
+    r_hex_long,
+    r_hex_short,
+    r_hsl,
+    r_hsl_v4_style,
+    r_rgb,
+    r_rgb_v4_style,
+)
+
+FORMATS = {
+    'named': 'cornflowerblue',
+    'hex_short': '#fa0c',
+    'hex_long': '#6495edcc',
+    'rgb': 'rgb(100, 149, 237)',
+    'rgba': 'rgba(100, 149, 237, 0.5)',
+    'rgb_v4': 'rgb(100 149 237 / 50%)',
+    'hsl': 'hsl(219, 79%, 66%)',
+    'hsla': 'hsla(219, 79%, 66%, 0.5)',
+    'hsl_v4': 'hsl(219deg 79% 66% / 50%)',
+}
+
+
+def parse_str_sequential(value: str) -> RGBA:
+    """
+    The previous implementation of `parse_str`, every grammar is tried in turn until one matches.
+    """
+    value_lower = value.lower()
+    try:
+        r, g, b = COLORS_BY_NAME[value_lower]
+    except KeyError:
+        pass
+    else:
+        return ints_to_rgba(r, g, b, None)
+
+    m = re.fullmatch(r_hex_short, value_lower)
+    if m:
+        *rgb, a = m.groups()
+        r, g, b = (int(v * 2, 16) for v in rgb)
+        alpha: Optional[float] = int(a * 2, 16) / 255 if a else None
+        return ints_to_rgba(r, g, b, alpha)
+
+    m = re.fullmatch(r_hex_long, value_lower)
+    if m:
+        *rgb, a = m.groups()
+        r, g, b = (int(v, 16) for v in rgb)
+        alpha = int(a, 16) / 255 if a else None
+        return ints_to_rgba(r, g, b, alpha)
+
+    m = re.fullmatch(r_rgb, value_lower) or re.fullmatch(r_rgb_v4_style, value_lower)
+    if m:
+        return ints_to_rgba(*m.groups())  # type: ignore
+
+    m = re.fullmatch(r_hsl, value_lower) or re.fullmatch(r_hsl_v4_style, value_lower)
+    if m:
+        return parse_hsl(*m.groups())  # type: ignore
+
+    raise ValueError(value)
+
+
+@pytest.mark.parametrize('fmt', FORMATS)
+@pytest.mark.benchmark(group='parse_str')
+def test_parse_str(benchmark, fmt: str):
+    value = FORMATS[fmt]
+    assert benchmark(parse_str, value)._tuple == parse_str_sequential(value)._tuple
+
+
+@pytest.mark.parametrize('fmt', FORMATS)
+@pytest.mark.benchmark(group='parse_str')
+def test_parse_str_sequential(benchmark, fmt: str):
+    benchmark(parse_str_sequential, FORMATS[fmt])
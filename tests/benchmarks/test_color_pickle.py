@@ -0,0 +1,44 @@
+import pickle
+
+import pytest
+
+from pydantic_extra_types import Color
+
+
+class SlotsColor(Color):
+    """
+    Pickled with the generic protocol for objects with `__slots__`, as colors were before `Color.__reduce__`.
+    """
+
+    __slots__ = ()
+    __reduce__ = object.__reduce__
+
+
+VALUES = [f'#{i * 0x9E3779B1 % 0x1000000:06x}' for i in range(20_000)]
+VALUES[::10] = ['hsl(10, 33%, 47%)'] * len(VALUES[::10])
+VALUES[1::10] = ['red'] * len(VALUES[1::10])
+
+
+@pytest.mark.benchmark(group='pickle-dumps')
+@pytest.mark.parametrize('cls', [Color, SlotsColor])
+def test_dumps(benchmark, cls):
+    colors = [cls(v) for v in VALUES]
+    data = benchmark(pickle.dumps, colors, protocol=pickle.HIGHEST_PROTOCOL)
+    benchmark.extra_info['size'] = len(data)
+
+
+@pytest.mark.benchmark(group='pickle-loads')
+@pytest.mark.parametrize('cls', [Color, SlotsColor])
+def test_loads(benchmark, cls):
+    data = pickle.dumps([cls(v) for v in VALUES], protocol=pickle.HIGHEST_PROTOCOL)
+    benchmark.extra_info['size'] = len(data)
+    assert benchmark(pickle.loads, data)[:10] == [Color(v) for v in VALUES[:10]]
+
+
+def test_size():
+    """
+    Not a benchmark, just checks the compact form stays well under the generic one.
+    """
+    compact = len(pickle.dumps([Color(v) for v in VALUES], protocol=pickle.HIGHEST_PROTOCOL))
+    generic = len(pickle.dumps([SlotsColor(v) for v in VALUES], protocol=pickle.HIGHEST_PROTOCOL))
+    assert compact < generic * 0.7
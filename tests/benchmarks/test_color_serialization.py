@@ -0,0 +1,89 @@
+import pickle
+from typing import List
+
+import pytest
+from typing_extensions import Annotated
+
+from pydantic import BaseModel
+from pydantic_extra_types import Color, CompactColor
+
+VALUES = [f'#{i * 0x9E3779B1 % 0x100000000:08x}' for i in range(5_000)] + ['red', 'navy']
+
+
+class Palette(BaseModel):
+    colors: List[Color]
+
+
+class IntPalette(BaseModel):
+    colors: List[Annotated[Color, CompactColor('int')]]
+
+
+class BytesPalette(BaseModel):
+    colors: List[Annotated[Color, CompactColor('bytes')]]
+
+
+def json_size(model: type) -> int:
+    return len(model(colors=VALUES).model_dump_json())
+
+
+def python_size(model: type) -> int:
+    """
+    The size of the data `model` dumps in a binary format, pickle standing in for e.g. msgpack.
+    """
+    data = model(colors=VALUES).model_dump(mode='json' if model is Palette else 'python')
+    return len(pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+@pytest.mark.benchmark(group='model_dump_json')
+def test_dump_json(benchmark):
+    """
+    Dumping the same model repeatedly, every color's serialized form is computed once then reused.
+    """
+    palette = Palette(colors=VALUES)
+    benchmark(palette.model_dump_json)
+
+
+@pytest.mark.benchmark(group='model_dump_json')
+def test_dump_json_first(benchmark):
+    """
+    Dumping a freshly validated model, so every color's serialized form has to be computed.
+    """
+    benchmark.pedantic(
+        lambda palette: palette.model_dump_json(), setup=lambda: ((Palette(colors=VALUES),), {}), rounds=20
+    )
+
+
+@pytest.mark.benchmark(group='as_hex')
+def test_as_hex(benchmark):
+    colors = [Color(v) for v in VALUES]
+    benchmark(lambda: [c.as_hex() for c in colors])
+
+
+@pytest.mark.parametrize('model', [Palette, IntPalette, BytesPalette], ids=['str', 'int', 'bytes'])
+@pytest.mark.benchmark(group='json-round-trip')
+def test_json_round_trip(benchmark, model):
+    """
+    Validating a model from JSON then dumping it back, with these values the JSON is ~10% smaller as integers,
+    the bytes format is also serialized as integers in JSON.
+    """
+    data = model(colors=VALUES).model_dump_json()
+    benchmark.extra_info['size'] = len(data)
+    benchmark(lambda: model.model_validate_json(data).model_dump_json())
+
+
+@pytest.mark.parametrize('model', [Palette, IntPalette, BytesPalette], ids=['str', 'int', 'bytes'])
+@pytest.mark.benchmark(group='python-round-trip')
+def test_python_round_trip(benchmark, model):
+    """
+    Validating a model from the JSON compatible python data the model dumps, e.g. for msgpack, then dumping it
+    back; as bytes each color is 4 bytes rather than a string of up to 9 characters.
+    """
+    data = model(colors=VALUES).model_dump(mode='json' if model is Palette else 'python')
+    benchmark.extra_info['size'] = python_size(model)
+    benchmark(lambda: model(**data).model_dump(mode='json' if model is Palette else 'python'))
+
+
+def test_sizes():
+    assert json_size(BytesPalette) == json_size(IntPalette) < json_size(Palette) * 0.95
+    # pickle adds a length to each bytes value, so they're a little larger than the integers
+    assert python_size(IntPalette) < python_size(BytesPalette) < python_size(Palette) * 0.6
@@ -0,0 +1,42 @@
+from typing import List
+
+import pytest
+
+from pydantic import BaseModel
+from pydantic_extra_types import Color, HexColor, NamedColor
+from pydantic_extra_types.types.color import COLORS_BY_NAME
+
+HEX_VALUES = [f'#{i * 0x9E3779B1 % 0x1000000:06x}' for i in range(10_000)]
+NAMES = list(COLORS_BY_NAME) * 70
+
+
+class HexColors(BaseModel):
+    colors: List[HexColor]
+
+
+class NamedColors(BaseModel):
+    colors: List[NamedColor]
+
+
+class Colors(BaseModel):
+    colors: List[Color]
+
+
+@pytest.mark.benchmark(group='validate-hex')
+def test_hex_color(benchmark):
+    benchmark(HexColors, colors=HEX_VALUES)
+
+
+@pytest.mark.benchmark(group='validate-hex')
+def test_color_from_hex(benchmark):
+    benchmark(Colors, colors=HEX_VALUES)
+
+
+@pytest.mark.benchmark(group='validate-named')
+def test_named_color(benchmark):
+    benchmark(NamedColors, colors=NAMES)
+
+
+@pytest.mark.benchmark(group='validate-named')
+def test_color_from_name(benchmark):
+    benchmark(Colors, colors=NAMES)
@@ -0,0 +1,75 @@
+import csv
+import io
+import random
+
+import pytest
+
+from pydantic_extra_types.types.bin_database import BinDatabase, convert_bin_csv
+
+ROWS = 100_000
+
+
+@pytest.fixture(scope='module')
+def bin_csv():
+    """
+    A CSV with 100k distinct 6 and 8 digit BINs.
+    """
+    r = random.Random(0)
+    bins = {f'{r.randrange(10**6):06d}' for _ in range(ROWS // 2)}
+    bins |= {f'{r.randrange(10**8):08d}' for _ in range(ROWS - len(bins))}
+    f = io.StringIO()
+    writer = csv.writer(f)
+    writer.writerow(['bin', 'country', 'card_type', 'bank'])
+    for b in bins:
+        writer.writerow(
+            [b, r.choice(['GB', 'US', 'DE', 'FR']), r.choice(['credit', 'debit']), f'bank {r.randrange(500)}']
+        )
+    return f.getvalue()
+
+
+@pytest.fixture(scope='module')
+def bin_path(bin_csv, tmp_path_factory):
+    path = tmp_path_factory.mktemp('bins') / 'bins.bin'
+    convert_bin_csv(io.StringIO(bin_csv), path)
+    return path
+
+
+@pytest.fixture(scope='module')
+def card_numbers():
+    r = random.Random(1)
+    return [f'{r.randrange(10**16):016d}' for _ in range(10_000)]
+
+
+@pytest.mark.benchmark(group='bin-convert')
+def test_convert(benchmark, bin_csv):
+    benchmark.pedantic(lambda: convert_bin_csv(io.StringIO(bin_csv), io.BytesIO()), rounds=1)
+
+
+@pytest.mark.benchmark(group='bin-cold-start')
+def test_cold_start(benchmark, bin_path):
+    """
+    Open the database and look up one card number.
+    """
+
+    def cold_start():
+        with BinDatabase(bin_path) as db:
+            db.lookup('4242424242424242')
+
+    benchmark(cold_start)
+
+
+@pytest.mark.benchmark(group='bin-cold-start')
+def test_cold_start_csv(benchmark, bin_csv):
+    """
+    Reading the CSV into a dict instead, for comparison.
+    """
+    benchmark.pedantic(lambda: {row['bin']: row for row in csv.DictReader(io.StringIO(bin_csv))}, rounds=1)
+
+
+@pytest.mark.benchmark(group='bin-lookup')
+def test_lookup(benchmark, bin_path, card_numbers):
+    """
+    10k lookups, about half of them found.
+    """
+    with BinDatabase(bin_path) as db:
+        benchmark(lambda: [db.lookup(c) for c in card_numbers])
@@ -0,0 +1,39 @@
+import random
+
+import pytest
+
+from pydantic_extra_types import PaymentCardBrand, PaymentCardNumber
+from pydantic_extra_types.types.payment import BRAND_RANGES
+
+r = random.Random(0)
+PREFIXES = ['4', '51', '2221', '34', '37', '6011', '65', '622126', '62', '3528', '5018', '6761', '36', '7']
+CARD_NUMBERS = [
+    p.ljust(15 if p in ('34', '37') else 16, r.choice('0123456789')) for p in r.choices(PREFIXES, k=100_000)
+]
+NARROWEST_FIRST = sorted(BRAND_RANGES, key=lambda r: -len(r.first))
+
+
+def brand_scan(card_number: str) -> PaymentCardBrand:
+    """
+    Checking every range in turn, narrowest first, as an if-chain would.
+    """
+    for first, last, brand, _ in NARROWEST_FIRST:
+        if first <= card_number[: len(first)] <= last:
+            return brand
+    return PaymentCardBrand.other
+
+
+def test_same_brands():
+    assert [brand_scan(c) for c in CARD_NUMBERS[:1000]] == [
+        PaymentCardNumber.validate_brand(c) for c in CARD_NUMBERS[:1000]
+    ]
+
+
+@pytest.mark.benchmark(group='brand')
+def test_scan(benchmark):
+    benchmark(lambda: [brand_scan(c) for c in CARD_NUMBERS])
+
+
+@pytest.mark.benchmark(group='brand')
+def test_table(benchmark):
+    benchmark(lambda: [PaymentCardNumber.validate_brand(c) for c in CARD_NUMBERS])
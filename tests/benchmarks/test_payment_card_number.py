@@ -0,0 +1,82 @@
+import random
+import tracemalloc
+from typing import List
+
+import pytest
+
+from pydantic import BaseModel
+from pydantic_extra_types import PaymentCardNumber
+from pydantic_extra_types.types.payment import _lookup_brand
+
+r = random.Random(0)
+PREFIXES = [r.choice(['4', '51', '37', '6011']) for _ in range(50_000)]
+PREFIXES = [p + ''.join(r.choices('0123456789', k=(14 if p == '37' else 15) - len(p))) for p in PREFIXES]
+
+
+def check_digit(prefix: str) -> str:
+    digits = [int(d) for d in reversed(prefix)]
+    total = sum(sum(divmod(d * 2, 10)) if i % 2 == 0 else d for i, d in enumerate(digits))
+    return str(-total % 10)
+
+
+CARD_NUMBERS = [p + check_digit(p) for p in PREFIXES]
+
+
+class DictCardNumber(PaymentCardNumber):
+    """
+    How `PaymentCardNumber` was before: validated in `validate` and again in `__init__`, with `bin`, `last4` and
+    `brand` stored in each instance's `__dict__`.
+    """
+
+    def __init__(self, card_number: str):
+        self.validate_digits(card_number)
+        card_number = self.validate_luhn_check_digit(card_number)
+        self.__dict__.update(bin=card_number[:6], last4=card_number[-4:], brand=_lookup_brand(card_number)[0])
+
+    @classmethod
+    def validate(cls, __input_value, _):
+        return cls(__input_value)
+
+
+class Model(BaseModel):
+    card_numbers: List[PaymentCardNumber]
+
+
+class DictModel(BaseModel):
+    card_numbers: List[DictCardNumber]
+
+
+def test_same():
+    assert [(c.bin, c.last4, c.brand) for c in Model(card_numbers=CARD_NUMBERS[:1000]).card_numbers] == [
+        (c.bin, c.last4, c.brand) for c in DictModel(card_numbers=CARD_NUMBERS[:1000]).card_numbers
+    ]
+
+
+@pytest.mark.benchmark(group='card-number')
+def test_validate_dict(benchmark):
+    benchmark(DictModel, card_numbers=CARD_NUMBERS)
+
+
+@pytest.mark.benchmark(group='card-number')
+def test_validate(benchmark):
+    benchmark(Model, card_numbers=CARD_NUMBERS)
+
+
+def retained(model):
+    tracemalloc.start()
+    try:
+        m = model(card_numbers=CARD_NUMBERS)
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert len(m.card_numbers) == len(CARD_NUMBERS)
+    return size
+
+
+def test_memory():
+    """
+    Per instance memory, the old layout's `__dict__` more than doubles each card number.
+    """
+    per_card = retained(Model) / len(CARD_NUMBERS)
+    per_card_dict = retained(DictModel) / len(CARD_NUMBERS)
+    assert per_card < per_card_dict / 2
@@ -0,0 +1,72 @@
+import random
+
+import pytest
+
+from pydantic_extra_types import PaymentCardNumber
+from pydantic_extra_types.types.payment import luhn_valid_many
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def luhn_sum(card_number: str) -> int:
+    """
+    The per digit loop `validate_luhn_check_digit` used before.
+    """
+    sum_ = int(card_number[-1])
+    length = len(card_number)
+    parity = length % 2
+    for i in range(length - 1):
+        digit = int(card_number[i])
+        if i % 2 == parity:
+            digit *= 2
+        if digit > 9:
+            digit -= 9
+        sum_ += digit
+    return sum_
+
+
+def luhn_loop(card_number: str) -> bool:
+    return luhn_sum(card_number) % 10 == 0
+
+
+r = random.Random(0)
+# valid card numbers, so exceptions don't dominate the timings
+PREFIXES = [''.join(r.choices('0123456789', k=15)) for _ in range(100_000)]
+CARD_NUMBERS = [p + str(-luhn_sum(p + '0') % 10) for p in PREFIXES]
+
+
+def luhn_table(card_number: str) -> bool:
+    try:
+        PaymentCardNumber.validate_luhn_check_digit(card_number)
+    except ValueError:
+        return False
+    return True
+
+
+@pytest.mark.benchmark(group='luhn')
+def test_loop(benchmark):
+    benchmark(lambda: [luhn_loop(c) for c in CARD_NUMBERS])
+
+
+@pytest.mark.benchmark(group='luhn')
+def test_table(benchmark):
+    benchmark(lambda: [luhn_table(c) for c in CARD_NUMBERS])
+
+
+@pytest.mark.skipif(numpy is None, reason='numpy not installed')
+@pytest.mark.benchmark(group='luhn')
+def test_many_array(benchmark):
+    pans = numpy.array(CARD_NUMBERS, dtype='S16')
+    assert benchmark(luhn_valid_many, pans).all()
+
+
+@pytest.mark.skipif(numpy is None, reason='numpy not installed')
+@pytest.mark.benchmark(group='luhn')
+def test_many_buffer(benchmark):
+    """
+    Card numbers as one contiguous buffer, e.g. a fixed width file read or memory mapped in one go.
+    """
+    benchmark(luhn_valid_many, ''.join(CARD_NUMBERS).encode(), 16)
@@ -0,0 +1,70 @@
+import io
+import random
+import re
+import tracemalloc
+
+import pytest
+from pydantic_core import PydanticCustomError
+
+from pydantic_extra_types import PaymentCardNumber
+from pydantic_extra_types.types.pan_scanner import scan_pans
+
+r = random.Random(0)
+LINES = [
+    f'2023-01-{r.randrange(1, 29):02d} 12:{r.randrange(60):02d}:{r.randrange(60):02d}.{r.randrange(1000):03d} '
+    f'INFO request id={r.randrange(10**16)} user={r.randrange(10**6)} took {r.randrange(1000)}ms '
+    + ('card=4242 4242 4242 4242\n' if i % 100 == 0 else 'status=200\n')
+    for i in range(20_000)
+]
+LOG = ''.join(LINES).encode()
+CANDIDATE = re.compile(r'(?<!\d)\d(?:[ -]?\d){11,18}(?!\d)')
+
+
+def scan_regex(data: bytes) -> int:
+    """
+    A regex for candidates, each checked by creating a `PaymentCardNumber`.
+    """
+    found = 0
+    for match in CANDIDATE.finditer(data.decode()):
+        try:
+            PaymentCardNumber(re.sub('[ -]', '', match.group()))
+        except PydanticCustomError:
+            continue
+        found += 1
+    return found
+
+
+@pytest.mark.benchmark(group='pan-scanner')
+def test_regex(benchmark):
+    benchmark(scan_regex, LOG)
+
+
+@pytest.mark.benchmark(group='pan-scanner')
+def test_scan(benchmark):
+    assert benchmark(lambda: sum(1 for _ in scan_pans(io.BytesIO(LOG)))) >= 200
+
+
+@pytest.mark.benchmark(group='pan-scanner')
+def test_scan_redact(benchmark):
+    benchmark(lambda: sum(1 for _ in scan_pans(io.BytesIO(LOG), redact_to=io.BytesIO())))
+
+
+def peak_memory(data: bytes) -> int:
+    source = io.BytesIO(data)
+    tracemalloc.start()
+    try:
+        for _ in scan_pans(source, chunk_size=1 << 16):
+            pass
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def test_constant_memory():
+    """
+    Peak memory is about the chunk size, however much is scanned.
+    """
+    small, large = peak_memory(LOG), peak_memory(LOG * 4)
+    assert large < 4 * (1 << 16)
+    assert large < small * 1.5
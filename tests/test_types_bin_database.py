@@ -0,0 +1,178 @@
+import io
+import random
+
+import pytest
+
+from pydantic import BaseModel
+from pydantic_extra_types import PaymentCardNumber
+from pydantic_extra_types.bin_database import main
+from pydantic_extra_types.types import bin_database
+from pydantic_extra_types.types.bin_database import BinDatabase, BinInfo, CardType, convert_bin_csv
+
+CSV = """\
+bin,country,card_type,bank,ignored
+424242,gb,credit,Example Bank,x
+42424250,US,Debit,Other Bank,
+555555,,prepaid,,
+400000,DE,,Example Bank,
+37000000,FR,charge,Banque Éxample,
+"""
+
+
+@pytest.fixture
+def database(tmp_path):
+    path = tmp_path / 'bins.bin'
+    assert convert_bin_csv(io.StringIO(CSV), path) == 6
+    with BinDatabase(path) as db:
+        yield db
+
+
+@pytest.fixture
+def card_database(database):
+    PaymentCardNumber.bin_database = database
+    yield database
+    PaymentCardNumber.bin_database = None
+
+
+def test_lookup(database):
+    assert len(database) == 6
+    assert database.lookup('4242424242424242') == BinInfo('42424200', '42424249', 'GB', CardType.credit, 'Example Bank')
+    assert database.lookup('4242425000000000') == BinInfo('42424250', '42424250', 'US', CardType.debit, 'Other Bank')
+    # the 6 digit BIN either side of the 8 digit BIN within it
+    assert database.lookup('4242425100000000') == BinInfo('42424251', '42424299', 'GB', CardType.credit, 'Example Bank')
+    assert database.lookup('424242') == BinInfo('42424200', '42424249', 'GB', CardType.credit, 'Example Bank')
+    assert database.lookup('4000000000000002').country == 'DE'
+    assert database.lookup('4000000000000002').card_type == CardType.unknown
+    assert database.lookup('5555555555554444') == BinInfo('55555500', '55555599', None, CardType.prepaid, None)
+    assert database.lookup('370000000000002').bank == 'Banque Éxample'
+    for card_number in ['4111111111111111', '0000000000000', '9999999999999', '4242430000000000', '3700000100000000']:
+        assert database.lookup(card_number) is None
+
+
+def test_iter(database):
+    assert [(info.first, info.last, info.country) for info in database] == [
+        ('37000000', '37000000', 'FR'),
+        ('40000000', '40000099', 'DE'),
+        ('42424200', '42424249', 'GB'),
+        ('42424250', '42424250', 'US'),
+        ('42424251', '42424299', 'GB'),
+        ('55555500', '55555599', None),
+    ]
+
+
+@pytest.mark.parametrize('stride', [1, 2, 3, 64])
+def test_lookup_random(tmp_path, monkeypatch, stride):
+    monkeypatch.setattr(bin_database, '_INDEX_STRIDE', stride)
+    r = random.Random(stride)
+    bins = {f'{r.randrange(10**6):06d}' for _ in range(200)} | {f'{r.randrange(10**8):08d}' for _ in range(200)}
+    # 8 digit BINs within 6 digit BINs
+    bins |= {b + f'{r.randrange(100):02d}' for b in list(bins) if len(b) == 6 and r.random() < 0.3}
+    banks = {b: f'bank {i}' for i, b in enumerate(sorted(bins))}
+    lines = ['bin,bank'] + [f'{b},{bank}' for b, bank in banks.items()]
+    path = tmp_path / 'bins.bin'
+    convert_bin_csv(lines, path)
+
+    def expected(card_number):
+        for length in (8, 6):
+            if card_number[:length] in banks:
+                return banks[card_number[:length]]
+
+    card_numbers = [b.ljust(16, '7') for b in bins] + [f'{r.randrange(10**16):016d}' for _ in range(2000)]
+    with BinDatabase(path) as db:
+        for card_number in card_numbers:
+            info = db.lookup(card_number)
+            assert (info and info.bank) == expected(card_number), card_number
+
+
+def test_empty(tmp_path):
+    path = tmp_path / 'bins.bin'
+    assert convert_bin_csv(['bin,country'], path) == 0
+    with BinDatabase(path) as db:
+        assert len(db) == 0
+        assert db.lookup('4242424242424242') is None
+
+
+def test_convert_to_file_object():
+    f = io.BytesIO()
+    assert convert_bin_csv(io.StringIO(CSV), f) == 6
+    assert f.getvalue().startswith(b'PXBIN\x00\x01\x00')
+    # header, 16 byte records and each bank name once
+    assert len(f.getvalue()) == 16 + 6 * 16 + len('Example BankOther BankBanque Éxample'.encode())
+
+
+@pytest.mark.parametrize(
+    'csv, message',
+    [
+        ('country\nGB', "column 'bin' is not in the CSV header"),
+        ('', "column 'bin' is not in the CSV header"),
+        ('bin\n12345', "row 1: BIN must be 6 to 8 digits, not '12345'"),
+        ('bin\n123456\n123456789', "row 2: BIN must be 6 to 8 digits, not '123456789'"),
+        ('bin\n12345a', "row 1: BIN must be 6 to 8 digits, not '12345a'"),
+        ('bin,country\n123456,GBR', "row 1: country must be a 2 letter code, not 'GBR'"),
+        ('bin,card_type\n123456,gold', 'row 1: card_type must be one of credit, debit, prepaid, charge, unknown'),
+        ('bin\n123456\n123456', 'BIN range 12345600 to 12345699 is in the CSV more than once'),
+        ('bin\n12345678\n12345678', 'BIN range 12345678 to 12345678 is in the CSV more than once'),
+    ],
+)
+def test_convert_errors(csv, message):
+    with pytest.raises(ValueError, match=message):
+        convert_bin_csv(io.StringIO(csv), io.BytesIO())
+
+
+@pytest.mark.parametrize(
+    'data', [b'', b'not a bin database', b'PXBIN\x00\x01\x00' + b'\x00\x00\x00\x01\x00\x00\x00\x10']
+)
+def test_not_a_database(tmp_path, data):
+    path = tmp_path / 'bins.bin'
+    path.write_bytes(data)
+    with pytest.raises(ValueError, match=r"'.*bins\.bin' is not a BIN database"):
+        BinDatabase(path)
+
+
+def test_bin_info(card_database):
+    class Model(BaseModel):
+        card_number: PaymentCardNumber
+
+    card = Model(card_number='4242424242424242').card_number
+    assert card.bin_info == BinInfo('42424200', '42424249', 'GB', CardType.credit, 'Example Bank')
+    assert card.bin_info.bank == 'Example Bank'
+
+
+def test_bin_info_not_found(card_database):
+    assert PaymentCardNumber('4111111111111111').bin_info is None
+
+
+def test_bin_info_no_database():
+    with pytest.raises(ValueError, match='no BIN database, set `PaymentCardNumber.bin_database` first'):
+        PaymentCardNumber('4242424242424242').bin_info
+
+
+def test_bin_info_custom_lookup():
+    class Lookup:
+        def lookup(self, card_number):
+            return BinInfo(card_number[:8], card_number[:8], 'NL', CardType.debit, None)
+
+    PaymentCardNumber.bin_database = Lookup()
+    try:
+        assert PaymentCardNumber('4242424242424242').bin_info.country == 'NL'
+    finally:
+        PaymentCardNumber.bin_database = None
+
+
+def test_main(tmp_path, capsys):
+    source = tmp_path / 'bins.csv'
+    source.write_text(CSV, encoding='utf-8')
+    output = tmp_path / 'bins.bin'
+    assert main([str(source), str(output)]) == 0
+    assert capsys.readouterr().err.startswith(f'6 BIN ranges written to {output} in ')
+    with BinDatabase(output) as db:
+        assert db.lookup('4242424242424242').bank == 'Example Bank'
+
+
+def test_main_error(tmp_path, capsys):
+    source = tmp_path / 'bins.csv'
+    source.write_text('bin\n1', encoding='utf-8')
+    with pytest.raises(SystemExit) as exc_info:
+        main([str(source), str(tmp_path / 'bins.bin')])
+    assert exc_info.value.code == 2
+    assert "row 1: BIN must be 6 to 8 digits, not '1'" in capsys.readouterr().err
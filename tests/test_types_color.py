@@ -1,115 +1,163 @@
+import array
+import bisect
+import io
+import json
+import pickle
+import random
+import re
+import sys
+import threading
+import time
 from datetime import datetime
+from typing import Dict, List, Optional, Tuple
 
 import pytest
 from pydantic_core import PydanticCustomError
+from typing_extensions import Annotated
 
 from pydantic import BaseModel, ValidationError
-from pydantic_extra_types import Color
+from pydantic_extra_types import Color, ColorPalette, CompactColor, DropOriginal, HexColor, MinContrast, NamedColor
+from pydantic_extra_types.color import main
+from pydantic_extra_types.types.color import (
+    COLORS_BY_NAME,
+    COLORS_BY_VALUE,
+    CacheInfo,
+    ColorRecord,
+    ContrastFailure,
+    _ciede2000,
+    _rgb24_to_lab,
+    _rgb24_to_point,
+    contrast_failures,
+    gradient,
+    intern_table,
+    ints_to_rgba,
+    nearest_named,
+    original_values,
+    parse_cache,
+    parse_colors,
+    parse_hsl,
+    parse_str,
+    r_hsl,
+    r_hsl_v4_style,
+    r_rgb,
+    r_rgb_v4_style,
+    validate_color_column,
+)
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
-@pytest.mark.parametrize(
-    'raw_color, as_tuple',
-    [
-        # named colors
-        ('aliceblue', (240, 248, 255)),
-        ('Antiquewhite', (250, 235, 215)),
-        ('#000000', (0, 0, 0)),
-        ('#DAB', (221, 170, 187)),
-        ('#dab', (221, 170, 187)),
-        ('#000', (0, 0, 0)),
-        ('0x797979', (121, 121, 121)),
-        ('0x777', (119, 119, 119)),
-        ('0x777777', (119, 119, 119)),
-        ('0x777777cc', (119, 119, 119, 0.8)),
-        ('777', (119, 119, 119)),
-        ('777c', (119, 119, 119, 0.8)),
-        (' 777', (119, 119, 119)),
-        ('777 ', (119, 119, 119)),
-        (' 777 ', (119, 119, 119)),
-        ((0, 0, 128), (0, 0, 128)),
-        ([0, 0, 128], (0, 0, 128)),
-        ((0, 0, 205, 1.0), (0, 0, 205)),
-        ((0, 0, 205, 0.5), (0, 0, 205, 0.5)),
-        ('rgb(0, 0, 205)', (0, 0, 205)),
-        ('rgb(0, 0, 205.2)', (0, 0, 205)),
-        ('rgb(0, 0.2, 205)', (0, 0, 205)),
-        ('rgba(0, 0, 128, 0.6)', (0, 0, 128, 0.6)),
-        ('rgba(0, 0, 128, .6)', (0, 0, 128, 0.6)),
-        ('rgba(0, 0, 128, 60%)', (0, 0, 128, 0.6)),
-        (' rgba(0, 0, 128,0.6) ', (0, 0, 128, 0.6)),
-        ('rgba(00,0,128,0.6  )', (0, 0, 128, 0.6)),
-        ('rgba(0, 0, 128, 0)', (0, 0, 128, 0)),
-        ('rgba(0, 0, 128, 1)', (0, 0, 128)),
-        ('rgb(0 0.2 205)', (0, 0, 205)),
-        ('rgb(0 0.2 205 / 0.6)', (0, 0, 205, 0.6)),
-        ('rgb(0 0.2 205 / 60%)', (0, 0, 205, 0.6)),
-        ('rgba(0 0 128)', (0, 0, 128)),
-        ('rgba(0 0 128 / 0.6)', (0, 0, 128, 0.6)),
-        ('rgba(0 0 128 / 60%)', (0, 0, 128, 0.6)),
-        ('hsl(270, 60%, 70%)', (178, 133, 224)),
-        ('hsl(180, 100%, 50%)', (0, 255, 255)),
-        ('hsl(630, 60%, 70%)', (178, 133, 224)),
-        ('hsl(270deg, 60%, 70%)', (178, 133, 224)),
-        ('hsl(.75turn, 60%, 70%)', (178, 133, 224)),
-        ('hsl(-.25turn, 60%, 70%)', (178, 133, 224)),
-        ('hsl(-0.25turn, 60%, 70%)', (178, 133, 224)),
-        ('hsl(4.71238rad, 60%, 70%)', (178, 133, 224)),
-        ('hsl(10.9955rad, 60%, 70%)', (178, 133, 224)),
-        ('hsl(270, 60%, 50%, .15)', (127, 51, 204, 0.15)),
-        ('hsl(270.00deg, 60%, 50%, 15%)', (127, 51, 204, 0.15)),
-        ('hsl(630 60% 70%)', (178, 133, 224)),
-        ('hsl(270 60% 50% / .15)', (127, 51, 204, 0.15)),
-        ('hsla(630, 60%, 70%)', (178, 133, 224)),
-        ('hsla(630 60% 70%)', (178, 133, 224)),
-        ('hsla(270 60% 50% / .15)', (127, 51, 204, 0.15)),
-    ],
-)
+
+COLOR_SUCCESS = [
+    # named colors
+    ('aliceblue', (240, 248, 255)),
+    ('Antiquewhite', (250, 235, 215)),
+    ('#000000', (0, 0, 0)),
+    ('#DAB', (221, 170, 187)),
+    ('#dab', (221, 170, 187)),
+    ('#000', (0, 0, 0)),
+    ('0x797979', (121, 121, 121)),
+    ('0x777', (119, 119, 119)),
+    ('0x777777', (119, 119, 119)),
+    ('0x777777cc', (119, 119, 119, 0.8)),
+    ('777', (119, 119, 119)),
+    ('777c', (119, 119, 119, 0.8)),
+    (' 777', (119, 119, 119)),
+    ('777 ', (119, 119, 119)),
+    (' 777 ', (119, 119, 119)),
+    ((0, 0, 128), (0, 0, 128)),
+    ([0, 0, 128], (0, 0, 128)),
+    ((0, 0, 205, 1.0), (0, 0, 205)),
+    ((0, 0, 205, 0.5), (0, 0, 205, 0.5)),
+    ('rgb(0, 0, 205)', (0, 0, 205)),
+    ('rgb(0, 0, 205.2)', (0, 0, 205)),
+    ('rgb(0, 0.2, 205)', (0, 0, 205)),
+    ('rgba(0, 0, 128, 0.6)', (0, 0, 128, 0.6)),
+    ('rgba(0, 0, 128, .6)', (0, 0, 128, 0.6)),
+    ('rgba(0, 0, 128, 60%)', (0, 0, 128, 0.6)),
+    (' rgba(0, 0, 128,0.6) ', (0, 0, 128, 0.6)),
+    ('rgba(00,0,128,0.6  )', (0, 0, 128, 0.6)),
+    ('rgba(0, 0, 128, 0)', (0, 0, 128, 0)),
+    ('rgba(0, 0, 128, 1)', (0, 0, 128)),
+    ('rgb(0 0.2 205)', (0, 0, 205)),
+    ('rgb(0 0.2 205 / 0.6)', (0, 0, 205, 0.6)),
+    ('rgb(0 0.2 205 / 60%)', (0, 0, 205, 0.6)),
+    ('rgba(0 0 128)', (0, 0, 128)),
+    ('rgba(0 0 128 / 0.6)', (0, 0, 128, 0.6)),
+    ('rgba(0 0 128 / 60%)', (0, 0, 128, 0.6)),
+    ('hsl(270, 60%, 70%)', (178, 133, 224)),
+    ('hsl(180, 100%, 50%)', (0, 255, 255)),
+    ('hsl(630, 60%, 70%)', (178, 133, 224)),
+    ('hsl(270deg, 60%, 70%)', (178, 133, 224)),
+    ('hsl(.75turn, 60%, 70%)', (178, 133, 224)),
+    ('hsl(-.25turn, 60%, 70%)', (178, 133, 224)),
+    ('hsl(-0.25turn, 60%, 70%)', (178, 133, 224)),
+    ('hsl(4.71238rad, 60%, 70%)', (178, 133, 224)),
+    ('hsl(10.9955rad, 60%, 70%)', (178, 133, 224)),
+    ('hsl(270, 60%, 50%, .15)', (127, 51, 204, 0.15)),
+    ('hsl(270.00deg, 60%, 50%, 15%)', (127, 51, 204, 0.15)),
+    ('hsl(630 60% 70%)', (178, 133, 224)),
+    ('hsl(270 60% 50% / .15)', (127, 51, 204, 0.15)),
+    ('hsla(630, 60%, 70%)', (178, 133, 224)),
+    ('hsla(630 60% 70%)', (178, 133, 224)),
+    ('hsla(270 60% 50% / .15)', (127, 51, 204, 0.15)),
+]
+
+
+@pytest.mark.parametrize('raw_color, as_tuple', COLOR_SUCCESS)
 def test_color_success(raw_color, as_tuple):
     c = Color(raw_color)
     assert c.as_rgb_tuple() == as_tuple
     assert c.original() == raw_color
 
 
-@pytest.mark.parametrize(
-    'color',
-    [
-        # named colors
-        'nosuchname',
-        'chucknorris',
-        # hex
-        '#0000000',
-        'x000',
-        # rgb/rgba tuples
-        (256, 256, 256),
-        (128, 128, 128, 0.5, 128),
-        (0, 0, 'x'),
-        (0, 0, 0, 1.5),
-        (0, 0, 0, 'x'),
-        (0, 0, 1280),
-        (0, 0, 1205, 0.1),
-        (0, 0, 1128, 0.5),
-        (0, 0, 1128, -0.5),
-        (0, 0, 1128, 1.5),
-        # rgb/rgba strings
-        'rgb(0, 0, 1205)',
-        'rgb(0, 0, 1128)',
-        'rgb(0, 0, 200 / 0.2)',
-        'rgb(72 122 18, 0.3)',
-        'rgba(0, 0, 11205, 0.1)',
-        'rgba(0, 0, 128, 11.5)',
-        'rgba(0, 0, 128 / 11.5)',
-        'rgba(72 122 18 0.3)',
-        # hsl/hsla strings
-        'hsl(180, 101%, 50%)',
-        'hsl(72 122 18 / 0.3)',
-        'hsl(630 60% 70%, 0.3)',
-        'hsla(72 122 18 / 0.3)',
-        # neither a tuple, not a string
-        datetime(2017, 10, 5, 19, 47, 7),
-        object,
-        range(10),
-    ],
-)
+COLOR_FAIL = [
+    # named colors
+    'nosuchname',
+    'chucknorris',
+    # hex
+    '#0000000',
+    'x000',
+    '#00',
+    '0x0x000',
+    '# 000',
+    # rgb/rgba tuples
+    (256, 256, 256),
+    (128, 128, 128, 0.5, 128),
+    (0, 0, 'x'),
+    (0, 0, 0, 1.5),
+    (0, 0, 0, 'x'),
+    (0, 0, 1280),
+    (0, 0, 1205, 0.1),
+    (0, 0, 1128, 0.5),
+    (0, 0, 1128, -0.5),
+    (0, 0, 1128, 1.5),
+    # rgb/rgba strings
+    'rgb(0, 0, 1205)',
+    'rgb(0, 0, 1128)',
+    'rgb(0, 0, 200 / 0.2)',
+    'rgb(72 122 18, 0.3)',
+    'rgba(0, 0, 11205, 0.1)',
+    'rgba(0, 0, 128, 11.5)',
+    'rgba(0, 0, 128 / 11.5)',
+    'rgba(72 122 18 0.3)',
+    'rgbfoo',
+    ' rgb(0, 0, 0 / 0.3)',
+    # hsl/hsla strings
+    'hsl(180, 101%, 50%)',
+    'hsl(72 122 18 / 0.3)',
+    'hsl(630 60% 70%, 0.3)',
+    'hsla(72 122 18 / 0.3)',
+    # neither a tuple, not a string
+    datetime(2017, 10, 5, 19, 47, 7),
+    object,
+    range(10),
+]
+
+
+@pytest.mark.parametrize('color', COLOR_FAIL)
 def test_color_fail(color):
     with pytest.raises(PydanticCustomError) as exc_info:
         Color(color)
@@ -183,6 +231,9 @@ def test_as_hex():
     assert Color('B0B').as_hex() == '#b0b'
     assert Color((1, 2, 3, 0.123456)).as_hex() == '#0102031f'
     assert Color((1, 2, 3, 0.1)).as_hex() == '#0102031a'
+    assert Color((17, 34, 51, 0.2)).as_hex() == '#1233'
+    assert Color((17, 34, 51, 0.25)).as_hex() == '#11223340'
+    assert Color((17, 34, 52)).as_hex() == '#112234'
 
 
 def test_as_named():
@@ -199,6 +250,118 @@ def test_as_named():
     assert Color((1, 2, 3, 0.1)).as_named(fallback=True) == '#0102031a'
 
 
+def test_as_named_nearest():
+    assert Color('red').as_named(nearest=True) == 'red'
+    assert Color((250, 5, 1)).as_named(nearest=True) == 'red'
+    assert Color((250, 5, 1, 0.5)).as_named(nearest=True) == 'red'
+    assert Color((1, 2, 3)).as_named(nearest=True) == 'black'
+    assert Color((100, 149, 230)).as_named(nearest=True, metric='lab') == 'cornflowerblue'
+    # RGB distance and perceived distance disagree here
+    assert Color((0, 0, 100)).as_named(nearest=True) == 'navy'
+    assert Color((0, 0, 100)).as_named(nearest=True, metric='lab') == 'midnightblue'
+
+    with pytest.raises(ValueError, match="metric must be 'rgb' or 'lab', not 'xyz'"):
+        Color('red').as_named(nearest=True, metric='xyz')
+
+
+@pytest.mark.parametrize('metric', ['rgb', 'lab'])
+def test_nearest_named_brute_force(metric):
+    def to_point(rgb):
+        return _rgb24_to_lab(rgb) if metric == 'lab' else (rgb >> 16, rgb >> 8 & 0xFF, rgb & 0xFF)
+
+    def distance(rgb, name):
+        r, g, b = Color(name).as_rgb_tuple()
+        return sum((p - q) ** 2 for p, q in zip(to_point(rgb), to_point(r << 16 | g << 8 | b)))
+
+    colors = [(i * 37 % 256, i * 101 % 256, i * 211 % 256) for i in range(500)]
+    for (r, g, b), name in zip(colors, nearest_named(colors, metric=metric)):
+        rgb = r << 16 | g << 8 | b
+        # compare distances rather than names, equidistant named colors may be returned in any order
+        assert distance(rgb, name) == min(distance(rgb, n) for n in COLORS_BY_VALUE.values())
+
+
+@pytest.mark.skipif(numpy is None, reason='numpy not installed')
+def test_nearest_named_numpy():
+    names = nearest_named(numpy.array([[255, 0, 1, 0], [0, 0, 0, 255], [255, 0, 1, 255]], dtype=numpy.uint8))
+    assert names.tolist() == ['red', 'black', 'red']
+    assert nearest_named(numpy.zeros((0, 3))).tolist() == []
+
+    with pytest.raises(ValueError, match=r'colors array must have shape \(N, 3\) or \(N, 4\), not \(3,\)'):
+        nearest_named(numpy.zeros(3))
+
+
+@pytest.mark.parametrize(
+    'color, lab',
+    [
+        ('white', (100, 0, 0)),
+        ('black', (0, 0, 0)),
+        ('red', (53.2408, 80.0925, 67.2032)),
+        ('#777', (50.0344, 0, 0)),
+        ('blue', (32.2970, 79.1875, -107.8602)),
+    ],
+)
+def test_as_lab(color, lab):
+    assert Color(color).as_lab() == pytest.approx(lab, abs=1e-3)
+
+
+def test_as_oklab():
+    assert Color('white').as_oklab() == pytest.approx((1, 0, 0), abs=1e-6)
+    assert Color('red').as_oklab() == pytest.approx((0.62796, 0.22486, 0.12585), abs=1e-5)
+
+
+# reference pairs from Sharma, Wu & Dalal "The CIEDE2000 Color-Difference Formula"
+@pytest.mark.parametrize(
+    'lab1, lab2, expected',
+    [
+        ((50, 2.6772, -79.7751), (50, 0, -82.7485), 2.0425),
+        ((50, -1, 2), (50, 0, 0), 2.3669),
+        ((50, 2.49, -0.001), (50, -2.49, 0.0011), 7.2195),
+        ((50, 2.5, 0), (73, 25, -18), 27.1492),
+        ((50, 2.5, 0), (50, 0, -2.5), 4.3065),
+        ((60.2574, -34.0099, 36.2677), (60.4626, -34.1751, 39.4387), 1.2644),
+        ((22.7233, 20.0904, -46.694), (23.0331, 14.973, -42.5619), 2.0373),
+        ((90.9257, -0.5406, -0.9208), (88.6381, -0.8985, -0.7239), 1.5381),
+        ((2.0776, 0.0795, -1.135), (0.9033, -0.0636, -0.5514), 0.9082),
+    ],
+)
+def test_ciede2000(lab1, lab2, expected):
+    assert _ciede2000(lab1, lab2) == pytest.approx(expected, abs=1e-4)
+    assert _ciede2000(lab2, lab1) == pytest.approx(expected, abs=1e-4)
+
+
+def test_delta_e():
+    red, orange = Color('red'), Color('orangered')
+    assert red.delta_e(red) == 0
+    assert red.delta_e(orange) == pytest.approx(13.1702, abs=1e-4)
+    assert red.delta_e(orange, method='ciede2000') == pytest.approx(6.3987, abs=1e-4)
+    assert red.delta_e(orange, method='oklab') == pytest.approx(0.0503, abs=1e-4)
+    assert Color('white').delta_e(Color('black'), method='ciede2000') == pytest.approx(100)
+    with pytest.raises(ValueError, match="method must be 'cie76', 'ciede2000' or 'oklab', not 'foo'"):
+        red.delta_e(orange, method='foo')
+
+
+@pytest.mark.parametrize(
+    'color1, color2, ratio',
+    [
+        ('white', 'black', 21),
+        ('black', 'white', 21),
+        ('white', 'white', 1),
+        ('#777', 'white', 4.4781),
+        ('navy', 'yellow', 14.9089),
+        ('rgba(0, 0, 0, 0.5)', 'white', 21),
+        ('rgb(119.4, 119.4, 119.4)', 'white', 4.4528),
+    ],
+)
+def test_contrast_ratio(color1, color2, ratio):
+    assert Color(color1).contrast_ratio(Color(color2)) == pytest.approx(ratio, abs=1e-4)
+
+
+def test_relative_luminance():
+    assert Color('white').relative_luminance() == 1
+    assert Color('black').relative_luminance() == 0
+    assert Color('lime').relative_luminance() == pytest.approx(0.7152)
+
+
 def test_str_repr():
     assert str(Color('red')) == 'red'
     assert repr(Color('red')) == "Color('red', rgb=(255, 0, 0))"
@@ -206,6 +369,21 @@ def test_str_repr():
     assert repr(Color((1, 2, 3))) == "Color('#010203', rgb=(1, 2, 3))"
 
 
+def test_str_memoized():
+    c = Color((1, 2, 3))
+    assert c._str is None
+    assert str(c) is str(c)
+    assert c._str == '#010203'
+    assert str(Color(c)) is str(c)
+
+    class Model(BaseModel):
+        colors: List[Color]
+
+    m = Model(colors=['red', (1, 2, 3, 0.1), '#abc', c])
+    assert m.model_dump_json() == '{"colors":["red","#0102031a","#abc","#010203"]}'
+    assert [color._str for color in m.colors] == ['red', '#0102031a', '#abc', '#010203']
+
+
 def test_eq():
     assert Color('red') == Color('red')
     assert Color('red') != Color('blue')
@@ -221,6 +399,96 @@ def test_color_hashable():
     assert hash(Color('red')) != hash(Color((255, 0, 0, 0.5)))
 
 
+def test_eq_8_bit_channels():
+    assert Color('rgb(0, 0, 205.2)') == Color((0, 0, 205))
+    assert Color((0, 0, 0, 0.5)) == Color('rgba(0, 0, 0, 50%)')
+    # alphas which differ beyond 8 bits, and so give different `as_rgb_tuple()`s, aren't equal
+    assert Color((0, 0, 0, 0.5)).as_int() == Color((0, 0, 0, 0.501)).as_int()
+    assert Color((0, 0, 0, 0.5)) != Color((0, 0, 0, 0.501))
+    assert Color((0, 0, 0, 0.5)) != Color((0, 0, 0, 128 / 255))
+    assert hash(Color((0, 0, 0, 0.5))) == hash(Color((0, 0, 0, 0.501)))
+    assert len({Color('#f00'), Color('red'), Color('rgb(255, 0, 0)'), Color('hsl(0, 100%, 50%)')}) == 1
+
+
+def test_hash_is_packed_hash():
+    for value in ['red', '#0000', '#fff', (1, 2, 3, 0.5), 'hsl(10, 33%, 47%)']:
+        assert hash(Color(value)) == hash(Color(value).as_int())
+
+
+def test_ordering():
+    colors = [Color('white'), Color('black'), Color('#0000'), Color('red'), Color('#ff000080'), Color('blue')]
+    assert [str(c) for c in sorted(colors)] == ['#0000', 'black', 'blue', '#ff000080', 'red', 'white']
+    assert sorted(colors) == sorted(colors, key=Color.as_int)
+    assert Color('black') < Color('#fffe') < Color('white') <= Color('#fff')
+    assert Color('white') > Color('black') >= Color('#000')
+    assert bisect.bisect_left(sorted(colors), Color('red')) == 4
+    with pytest.raises(TypeError, match="'<' not supported between instances of 'Color' and 'str'"):
+        Color('red') < 'blue'
+    with pytest.raises(TypeError):
+        Color('red') >= 0
+
+
+def test_ordering_float_alphas():
+    # the same packed value, ordered by alpha consistently with ==
+    a, b = Color((1, 2, 3, 0.5001)), Color((1, 2, 3, 0.5))
+    assert a.as_int() == b.as_int()
+    assert a != b
+    assert b < a and b <= a and a > b and a >= b
+    assert not (a < b or a <= b or b > a or b >= a)
+    c = Color((1, 2, 3, 0.5))
+    assert b == c and b <= c and b >= c and not (b < c or b > c)
+    # 0x80 is an alpha of 128 / 255, above both
+    assert sorted([Color('#01020380'), a, b]) == [b, a, Color('#01020380')]
+
+
+def test_intern_named():
+    assert Color.intern('red') is Color.intern('red')
+    assert Color.intern('red').original() == 'red'
+    assert Color.intern('red') is not Color('red')
+    # only exact names are shared, so `original()` is unchanged
+    assert Color.intern('Red') is not Color.intern('Red')
+    assert Color.intern('Red').original() == 'Red'
+    assert Color.intern('#f00') is not Color.intern('#f00')
+    c = Color((1, 2, 3))
+    assert Color.intern(c) is c
+
+    class Model(BaseModel):
+        color: Color
+
+    assert Model(color='red').color is Model(color='red').color
+    assert Model(color=c).color is c
+
+
+def test_intern_table():
+    intern_table.configure(enabled=True)
+    try:
+        c = Color.intern('#f00')
+        assert Color.intern('#f00') is c
+        c2 = Color.intern(' #f00')
+        assert c2 is not c
+        assert len(intern_table) == 2
+        assert Color.intern('red') is not c
+
+        # entries are dropped once the color isn't referenced anywhere else
+        del c
+        assert len(intern_table) == 1
+        intern_table.clear()
+        assert len(intern_table) == 0
+        assert Color.intern((0, 0, 0)) is not Color.intern((0, 0, 0))
+    finally:
+        intern_table.configure(enabled=False)
+    assert Color.intern('#f00') is not Color.intern('#f00')
+
+
+def test_intern_subclass():
+    class MyColor(Color):
+        __slots__ = ()
+
+    c = MyColor.intern('red')
+    assert type(c) is MyColor
+    assert c is not MyColor.intern('red')
+
+
 def test_schema():
     class Model(BaseModel):
         color: Color
@@ -231,3 +499,891 @@ def test_schema():
         'title': 'Model',
         'type': 'object',
     }
+
+
+@pytest.mark.parametrize(
+    'value, packed, has_floats',
+    [
+        ('red', 0xFF0000FF, False),
+        ('#12345678', 0x12345678, False),
+        ('0x1234', 0x11223344, False),
+        ((1, 2, 3, 0), 0x01020300, False),
+        ('rgb(1, 2, 3)', 0x010203FF, False),
+        ('rgba(0, 0, 0, 0.5)', 0x00000080, True),
+        ('rgb(0, 0, 205.2)', 0x0000CDFF, True),
+        ((1, 2, 3, 0.999), 0x010203FF, True),
+        ('hsl(270, 60%, 70%)', 0xB285E0FF, True),
+        ('hsl(0, 0%, 100%)', 0xFFFFFFFF, False),
+    ],
+)
+def test_packed(value, packed, has_floats):
+    c = Color(value)
+    assert c.as_int() == packed
+    assert (c._rgba is not None) is has_floats
+    assert Color(c).as_int() == packed
+
+
+def test_packed_precision():
+    c = Color('hsl(270, 60%, 70%)')
+    assert c.as_hsl_tuple() == pytest.approx((0.75, 0.6, 0.7))
+    assert Color.from_int(c.as_int()).as_hsl_tuple() != pytest.approx((0.75, 0.6, 0.7), abs=1e-6)
+
+    c = Color((1, 2, 3, 0.999))
+    assert c.as_rgb_tuple() == (1, 2, 3, 0.999)
+    assert c.as_hex() == '#010203ff'
+
+
+def test_from_int():
+    c = Color.from_int(0xFF000080)
+    assert c.as_rgb_tuple() == (255, 0, 0, 128 / 255)
+    assert c.as_hex() == '#ff000080'
+    assert c.original() == 0xFF000080
+    assert c.as_int() == 0xFF000080
+    assert c == Color('#ff000080')
+
+    c = Color.from_int(0x00FFFFFF)
+    assert c.as_named() == 'cyan'
+    assert c.as_rgb_tuple(alpha=True) == (0, 255, 255, 1)
+    assert c.as_hsl_tuple() == (0.5, 1, 0.5)
+
+    for value in (-1, 0x100000000):
+        with pytest.raises(PydanticCustomError, match='integer colors must be in the range 0 to 0xffffffff'):
+            Color.from_int(value)
+    for value in (3.0, True, '3'):
+        with pytest.raises(PydanticCustomError, match='integer colors must be an int'):
+            Color.from_int(value)
+
+
+@pytest.mark.parametrize(
+    'value, expected',
+    [
+        ('#ff0000', '#ff0000'),
+        (' #FFAA00 ', '#ffaa00'),
+        ('0XABCD', '0xabcd'),
+        ('777', '777'),
+        ('#12345678', '#12345678'),
+    ],
+)
+def test_hex_color(value, expected):
+    class Model(BaseModel):
+        color: HexColor
+
+    m = Model(color=value)
+    assert type(m.color) is HexColor
+    assert m.color == expected
+    assert m.color.color == Color(value)
+    assert m.model_dump_json() == f'{{"color":"{expected}"}}'
+
+
+@pytest.mark.parametrize('value', ['#ff', '#fffff', 'red', '#ff00001', 'rgb(0, 0, 0)', '0x', '#ggg', 1])
+def test_hex_color_fail(value):
+    class Model(BaseModel):
+        color: HexColor
+
+    with pytest.raises(ValidationError) as exc_info:
+        Model(color=value)
+    assert exc_info.value.errors()[0]['type'] in {'string_pattern_mismatch', 'string_type'}
+
+
+def test_named_color():
+    class Model(BaseModel):
+        color: NamedColor
+
+    m = Model(color='CornflowerBlue')
+    assert type(m.color) is NamedColor
+    assert m.color == 'cornflowerblue'
+    assert m.color.color == Color('cornflowerblue')
+    assert m.color.color.original() == 'cornflowerblue'
+    assert m.model_dump() == {'color': 'cornflowerblue'}
+
+    with pytest.raises(ValidationError) as exc_info:
+        Model(color='#fff')
+    assert exc_info.value.errors()[0]['type'] == 'literal_error'
+
+    assert Model.model_json_schema()['properties']['color'] == {
+        'title': 'Color',
+        'type': 'string',
+        'enum': list(COLORS_BY_NAME),
+    }
+
+
+BUFFER = bytes([255, 0, 0, 255, 0, 0, 255, 128, 255, 0, 0, 255, 10, 20, 30, 40])
+
+
+@pytest.mark.parametrize(
+    'offset, layout, expected',
+    [
+        (0, 'RGBA8', 'red'),
+        (4, 'RGBA8', '#0000ff80'),
+        (4, 'BGRA8', '#ff000080'),
+        (4, 'RGB8', 'blue'),
+        (5, 'RGB8', '#00ff80'),
+        (13, 'RGB8', '#141e28'),
+        (4, 'RGBA8_PREMULTIPLIED', '#0000ff80'),
+        (12, 'RGBA8_PREMULTIPLIED', '#4080bf28'),
+        (12, 'BGRA8_PREMULTIPLIED', '#bf804028'),
+    ],
+)
+def test_from_buffer(offset, layout, expected):
+    c = Color.from_buffer(BUFFER, offset, layout)
+    assert c == Color(expected)
+    assert c.original() == c.as_int()
+
+
+@pytest.mark.parametrize(
+    'buf',
+    [
+        BUFFER,
+        bytearray(BUFFER),
+        memoryview(BUFFER),
+        array.array('B', BUFFER),
+        array.array('I', BUFFER),
+        # non-contiguous
+        memoryview(bytes(b for v in BUFFER for b in (v, 0)))[::2],
+    ],
+)
+def test_buffer_types(buf):
+    assert Color.from_buffer(buf, 4) == Color('#0000ff80')
+    assert [c.as_hex() for c in Color.iter_buffer(buf)] == ['#f00', '#0000ff80', '#f00', '#0a141e28']
+
+
+@pytest.mark.skipif(numpy is None, reason='numpy not installed')
+def test_buffer_numpy():
+    image = numpy.frombuffer(BUFFER, dtype=numpy.uint8).reshape(2, 2, 4)
+    assert Color.from_buffer(image, 12) == Color('#0a141e28')
+    assert [c.as_hex() for c in Color.iter_buffer(image[:, :, :3].copy(), 'RGB8')] == [
+        '#f00',
+        '#00f',
+        '#f00',
+        '#0a141e',
+    ]
+    # a transposed, so non-contiguous, image
+    assert [c.as_hex() for c in Color.iter_buffer(image.transpose(1, 0, 2))][1] == '#f00'
+
+
+def test_iter_buffer_unique(monkeypatch):
+    monkeypatch.setattr('pydantic_extra_types.types.color._buffer_chunk_pixels', 3)
+    buf = BUFFER * 3 + bytes([128, 0, 0, 128, 200, 0, 0, 128])
+    assert [c.as_hex() for c in Color.iter_buffer(buf, unique=True)] == [
+        '#f00',
+        '#0000ff80',
+        '#0a141e28',
+        '#80000080',
+        '#c8000080',
+    ]
+    # both premultiplied pixels are red with half alpha
+    unique = list(Color.iter_buffer(buf, 'RGBA8_PREMULTIPLIED', unique=True))
+    assert [c.as_hex() for c in unique] == ['#f00', '#0000ff80', '#4080bf28', '#ff000080']
+    assert len(list(Color.iter_buffer(buf))) == 14
+
+
+def test_iter_buffer_subclass():
+    class MyColor(Color):
+        pass
+
+    assert all(type(c) is MyColor for c in MyColor.iter_buffer(BUFFER))
+    assert type(MyColor.from_buffer(BUFFER)) is MyColor
+
+
+def test_unpremultiply_transparent():
+    assert Color.from_buffer(bytes([10, 20, 30, 0]), layout='RGBA8_PREMULTIPLIED').as_int() == 0
+
+
+def test_buffer_errors():
+    with pytest.raises(ValueError, match="layout must be one of 'RGB8', 'RGBA8', 'BGRA8', .*, not 'ARGB8'"):
+        Color.from_buffer(BUFFER, layout='ARGB8')
+    with pytest.raises(ValueError, match='offset 13 is out of range for a buffer of 16 bytes'):
+        Color.from_buffer(BUFFER, 13)
+    with pytest.raises(ValueError, match='offset -1 is out of range'):
+        Color.from_buffer(BUFFER, -1)
+    with pytest.raises(ValueError, match="buffer length must be a multiple of 3 bytes for layout 'RGB8', not 16"):
+        list(Color.iter_buffer(BUFFER, 'RGB8'))
+    with pytest.raises(TypeError):
+        Color.from_buffer('red')
+
+
+def test_compact_int():
+    class Model(BaseModel):
+        color: Annotated[Color, CompactColor()]
+        colors: List[Annotated[Color, CompactColor('int')]] = []
+
+    m = Model(color='red', colors=['#12345678', 'rgba(0, 0, 0, 0.5)'])
+    assert m.model_dump() == {'color': 0xFF0000FF, 'colors': [0x12345678, 0x00000080]}
+    assert m.model_dump_json() == '{"color":4278190335,"colors":[305419896,128]}'
+
+    m2 = Model.model_validate_json(m.model_dump_json())
+    assert m2.color == Color('red')
+    assert m2.color.original() == 0xFF0000FF
+    assert m2.colors == [Color('#12345678'), Color('#00000080')]
+    assert Model(**m.model_dump()) == m2
+
+    with pytest.raises(ValidationError, match='integer colors must be in the range 0 to 0xffffffff'):
+        Model(color=0x100000000)
+    with pytest.raises(ValidationError, match='value must be a tuple, list or string'):
+        Model(color=True)
+
+
+def test_compact_bytes():
+    class Model(BaseModel):
+        color: Annotated[Color, CompactColor('bytes')]
+
+    m = Model(color='#12345678')
+    assert m.model_dump() == {'color': b'\x12\x34\x56\x78'}
+    # JSON can't hold raw bytes so the integer is used
+    assert m.model_dump_json() == '{"color":305419896}'
+    assert Model(color=b'\x12\x34\x56\x78').color == m.color
+    assert Model(color=bytearray(b'\xff\x00\x00\xff')).color == Color('red')
+    assert Model.model_validate_json(m.model_dump_json()).color == m.color
+
+    with pytest.raises(ValidationError, match='bytes colors must be 4 bytes long'):
+        Model(color=b'\x12\x34\x56')
+
+
+def test_compact_subclass():
+    class MyColor(Color):
+        pass
+
+    class Model(BaseModel):
+        color: Annotated[MyColor, CompactColor()]
+
+    assert type(Model(color=0xFF0000FF).color) is MyColor
+    assert type(Model(color='red').color) is MyColor
+
+
+def test_compact_schema():
+    class Model(BaseModel):
+        color: Annotated[Color, CompactColor()]
+
+    assert Model.model_json_schema()['properties']['color'] == {
+        'title': 'Color',
+        'anyOf': [{'type': 'integer', 'minimum': 0, 'maximum': 0xFFFFFFFF}, {'type': 'string', 'format': 'color'}],
+    }
+
+
+def test_compact_format():
+    assert repr(CompactColor('bytes')) == "CompactColor('bytes')"
+    with pytest.raises(ValueError, match="format must be 'int' or 'bytes', not 'hex'"):
+        CompactColor('hex')
+
+
+def parse_functional_regex(value):
+    """
+    Parse `rgb()`/`hsl()` strings trying both the CSS3 and CSS4 grammars, `parse_str` must behave identically while
+    only trying the one selected by the presence of commas.
+    """
+    value_lower = value.lower()
+    m = re.fullmatch(r_rgb, value_lower) or re.fullmatch(r_rgb_v4_style, value_lower)
+    if m:
+        return ints_to_rgba(*m.groups())
+    m = re.fullmatch(r_hsl, value_lower) or re.fullmatch(r_hsl_v4_style, value_lower)
+    if m:
+        return parse_hsl(*m.groups())
+    raise PydanticCustomError('color_error', 'value is not a valid color: string not recognised as a valid color')
+
+
+def outcome(parse, value):
+    try:
+        return parse(value)._tuple
+    except PydanticCustomError as e:
+        return e.message()
+
+
+FUNCTIONAL_FRAGMENTS = [
+    *['rgb', 'rgba', 'hsl', 'hsla', 'RGB', 'Hsla', '(', ')', ',', ', ', '/', ' / ', ' ', '  ', '\t', '\u00a0', '\n'],
+    *['0', '1', '5', '9', '00', '50', '100', '255', '256', '1000', '.', '.5', '0.5', '1.', '-', '%', '50%', '100%'],
+    *['deg', 'rad', 'turn', 'e', 'x', '+', '_', '\u0663', '\u00b2', '\u0130'],
+]
+
+
+def random_functional(rnd):
+    if rnd.random() < 0.5:
+        # mutate a valid value so most cases get deep into the grammar
+        value = list(rnd.choice(['rgb(0, 0.2, 205)', 'rgba(0 0 128 / 60%)', 'hsl(-.25turn, 60%, 70%, .5)']))
+        for _ in range(rnd.randint(1, 3)):
+            i = rnd.randrange(len(value) + 1)
+            action = rnd.random()
+            if action < 0.4:
+                value[i:i] = rnd.choice(FUNCTIONAL_FRAGMENTS)
+            elif action < 0.7:
+                del value[i : i + 1]
+            else:
+                value[i : i + 1] = rnd.choice(FUNCTIONAL_FRAGMENTS)
+        return ''.join(value)
+    prefix = rnd.choice(['rgb(', 'rgba(', 'hsl(', 'hsla(', ' hsl(', 'rgb ('])
+    return prefix + ''.join(rnd.choice(FUNCTIONAL_FRAGMENTS) for _ in range(rnd.randint(0, 12)))
+
+
+def test_functional_fuzz():
+    rnd = random.Random(0)
+    values = [v for v, _ in COLOR_SUCCESS if isinstance(v, str)]
+    values += [v for v in COLOR_FAIL if isinstance(v, str)]
+    values += [random_functional(rnd) for _ in range(20_000)]
+    parsed = 0
+    for value in values:
+        expected = outcome(parse_functional_regex, value)
+        if value.strip().lower().startswith(('rgb', 'hsl')):
+            assert outcome(parse_str, value) == expected, value
+        parsed += not isinstance(expected, str)
+    # make sure the fuzzing isn't just comparing errors
+    assert parsed > 500
+
+
+def fail_time(value):
+    """
+    The shortest of a few attempts to parse `value`, which must fail.
+    """
+    times = []
+    for _ in range(3):
+        start = time.perf_counter()
+        with pytest.raises(PydanticCustomError, match='string not recognised as a valid color'):
+            parse_str(value)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+@pytest.mark.parametrize(
+    'make_value',
+    [
+        lambda n: 'rgb(' + ' ' * n + '0 0 0' + ' ' * n + 'x)',
+        lambda n: 'rgb(0,' + ' ' * n + '0,0,' + ' ' * n + ')',
+        lambda n: 'hsl(' + '1' * n + 'x 0% 0%)',
+        lambda n: 'hsl(' + '1' * n + '.' + '1' * n + ', 0%, 0%' + ' ' * n,
+        lambda n: 'rgba(0 0 0 / ' + '.' * n + ')',
+    ],
+    ids=['whitespace', 'commas', 'digits', 'fraction', 'dots'],
+)
+def test_functional_pathological(make_value):
+    """
+    Long runs of whitespace or digits take time linear in their length, 10 times the input takes well under the
+    100 times longer it would if backtracking made parsing quadratic.
+    """
+    assert fail_time(make_value(100_000)) < 30 * fail_time(make_value(10_000)) + 0.001
+
+
+@pytest.fixture(name='cache')
+def cache_fixture():
+    parse_cache.configure(maxsize=2)
+    parse_cache.cache_clear()
+    yield parse_cache
+    parse_cache.configure(maxsize=0)
+    parse_cache.cache_clear()
+
+
+def test_parse_cache_disabled():
+    assert parse_cache.cache_info() == CacheInfo(hits=0, misses=0, maxsize=0, currsize=0)
+    Color('red')
+    Color('red')
+    assert parse_cache.cache_info() == CacheInfo(hits=0, misses=0, maxsize=0, currsize=0)
+
+
+def test_parse_cache(cache):
+    c1 = Color('rgba(0, 0, 0, 0.5)')
+    c2 = Color('rgba(0, 0, 0, 0.5)')
+    assert c1._rgba is c2._rgba
+    assert c2.original() == 'rgba(0, 0, 0, 0.5)'
+    assert cache.cache_info() == CacheInfo(hits=1, misses=1, maxsize=2, currsize=1)
+
+    assert Color((0, 0, 255)) == Color('blue')
+    Color('RED')
+    assert cache.cache_info() == CacheInfo(hits=1, misses=4, maxsize=2, currsize=2)
+
+    # the first color was evicted, it's the least recently used entry
+    Color('rgba(0, 0, 0, 0.5)')
+    assert cache.cache_info().misses == 5
+
+    cache.configure(maxsize=1)
+    assert cache.cache_info().currsize == 1
+    cache.cache_clear()
+    assert cache.cache_info() == CacheInfo(hits=0, misses=0, maxsize=1, currsize=0)
+
+
+def test_parse_cache_uncached_values(cache):
+    assert Color([0, 0, 255]) == Color(((0), 0, 255))
+    with pytest.raises(PydanticCustomError):
+        Color('snot')
+    # unhashable values skip the cache and fail parsing as usual
+    with pytest.raises(TypeError, match='float'):
+        Color((0, 0, [255]))
+    assert cache.cache_info().currsize == 1
+
+    with pytest.raises(ValueError, match='maxsize must be greater than or equal to 0'):
+        cache.configure(maxsize=-1)
+
+
+def test_parse_cache_threads(cache):
+    cache.configure(maxsize=8)
+    values = [f'#{i:06x}' for i in range(16)] * 50
+
+    def parse(offset: int) -> None:
+        for v in values[offset:] + values[:offset]:
+            assert Color(v).as_hex() == Color(v).as_hex()
+
+    threads = [threading.Thread(target=parse, args=(i,)) for i in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    info = cache.cache_info()
+    assert info.hits + info.misses == len(values) * 8
+    assert info.currsize == 8
+
+
+@pytest.mark.skipif(numpy is None, reason='numpy not installed')
+def test_parse_colors():
+    values = ['red', '#0000ff80', (0, 128, 0), 'snot', Color('hsl(0, 0%, 100%)'), (0, 0, 1280)]
+    array, errors = parse_colors(iter(values))
+    assert array.shape == (6, 4)
+    assert array.dtype == numpy.float32
+    half = pytest.approx(128 / 255)
+    assert array[:3].tolist() == [[1, 0, 0, 1], [0, 0, 1, half], [0, half, 0, 1]]
+    assert array[3].tolist() == [0, 0, 0, 0]
+    assert array[4].tolist() == [1, 1, 1, 1]
+    assert {i: e.type for i, e in errors.items()} == {3: 'color_error', 5: 'color_error'}
+
+    array, errors = parse_colors(values, dtype=numpy.uint8)
+    assert array.dtype == numpy.uint8
+    assert array.tolist() == [
+        [255, 0, 0, 255],
+        [0, 0, 255, 128],
+        [0, 128, 0, 255],
+        [0, 0, 0, 0],
+        [255, 255, 255, 255],
+        [0, 0, 0, 0],
+    ]
+    assert list(errors) == [3, 5]
+
+    assert parse_colors([])[0].shape == (0, 4)
+
+
+@pytest.mark.skipif(numpy is None, reason='numpy not installed')
+def test_parse_colors_strict():
+    with pytest.raises(PydanticCustomError, match='string not recognised as a valid color'):
+        parse_colors(['red', 'snot'], strict=True)
+
+    with pytest.raises(TypeError, match='dtype must be a floating point type or uint8, not int64'):
+        parse_colors(['red'], dtype='int64')
+
+
+def test_parse_colors_no_numpy(monkeypatch):
+    monkeypatch.setitem(sys.modules, 'numpy', None)
+    with pytest.raises(ImportError, match=r'numpy is not installed, run `pip install pydantic-extra-types\[numpy\]`'):
+        parse_colors(['red'])
+    assert Color('red').as_hex() == '#f00'
+
+
+CSV = 'name,color\nred,#F00\n\nbad,nope\nshort\nblue,"rgb(0, 0, 255)"\n\n'
+CSV_RECORDS = [
+    ColorRecord(1, '#F00', '#f00', None),
+    ColorRecord(2, 'nope', None, 'value is not a valid color: string not recognised as a valid color'),
+    ColorRecord(3, None, None, "row has no 'color' column"),
+    ColorRecord(4, 'rgb(0, 0, 255)', '#00f', None),
+]
+
+
+@pytest.mark.parametrize('chunk_size', [1, 3, 10_000])
+def test_validate_color_column_csv(chunk_size):
+    assert list(validate_color_column(io.StringIO(CSV), 'color', chunk_size=chunk_size)) == CSV_RECORDS
+
+
+def test_validate_color_column_jsonl():
+    lines = ['{"color": "red"}', '', '{"color": [1, 2, 3]}', '{"colour": "red"}', '[1]', '{bad', '{"color": "#abcd"}']
+    records = list(validate_color_column(lines, 'color', format='jsonl', output='int'))
+    assert [r.row for r in records] == [1, 2, 3, 4, 5, 6]
+    assert [r.color for r in records] == [0xFF0000FF, None, None, None, None, 0xAABBCCDD]
+    assert [r.error for r in records][1:5] == [
+        'value is not a valid color: value must be a string',
+        "row has no 'color' key",
+        "row has no 'color' key",
+        'invalid JSON: Expecting property name enclosed in double quotes: line 1 column 2 (char 1)',
+    ]
+
+
+def test_validate_color_column_processes():
+    csv_data = 'color\n' + '\n'.join(['red', 'nope', '#123'] * 1_000)
+    expected = list(validate_color_column(io.StringIO(csv_data), 'color'))
+    assert list(validate_color_column(io.StringIO(csv_data), 'color', chunk_size=100, processes=2)) == expected
+
+
+def test_validate_color_column_errors():
+    with pytest.raises(ValueError, match="column 'colour' is not in the CSV header"):
+        list(validate_color_column(io.StringIO(CSV), 'colour'))
+    with pytest.raises(ValueError, match="column 'color' is not in the CSV header"):
+        list(validate_color_column(io.StringIO(''), 'color'))
+    with pytest.raises(ValueError, match="format must be 'csv' or 'jsonl', not 'xml'"):
+        list(validate_color_column([], 'color', format='xml'))
+    with pytest.raises(ValueError, match="output must be 'hex' or 'int', not 'rgb'"):
+        list(validate_color_column([], 'color', output='rgb'))
+
+
+def test_color_column_main(tmp_path, capsys):
+    path = tmp_path / 'tokens.jsonl'
+    path.write_text('{"color": "red"}\n{"color": "nope"}\n')
+    assert main([str(path), '--column', 'color', '--output', 'int']) == 1
+    out, err = capsys.readouterr()
+    assert [json.loads(line) for line in out.splitlines()] == [
+        {'row': 1, 'color': 0xFF0000FF},
+        {'row': 2, 'error': 'value is not a valid color: string not recognised as a valid color'},
+    ]
+    assert err.startswith('2 rows, 1 errors in ')
+    assert err.endswith(' rows/sec\n')
+
+    path = tmp_path / 'tokens.csv'
+    path.write_text(CSV.replace('nope', 'navy').replace('short\n', ''))
+    assert main([str(path), '-c', 'color', '-p', '1']) == 0
+    out, _ = capsys.readouterr()
+    assert [json.loads(line)['color'] for line in out.splitlines()] == ['#f00', '#000080', '#00f']
+
+
+def test_color_column_main_bad_column(tmp_path, capsys):
+    path = tmp_path / 'tokens.csv'
+    path.write_text(CSV)
+    with pytest.raises(SystemExit):
+        main([str(path), '-c', 'colour'])
+    assert "column 'colour' is not in the CSV header" in capsys.readouterr().err
+
+
+def test_color_column_main_missing_file(tmp_path, capsys):
+    with pytest.raises(SystemExit) as exc_info:
+        main([str(tmp_path / 'missing.csv'), '-c', 'color'])
+    assert exc_info.value.code == 2
+    err = capsys.readouterr().err
+    assert 'error: [Errno 2] No such file or directory' in err
+    assert 'missing.csv' in err
+
+
+PALETTE = ['red', 'lime', 'blue', 'white', 'black', '#777', 'rgb(255, 128, 0)', 'hsl(270, 60%, 70%)', 'red']
+
+
+@pytest.mark.parametrize('metric, to_point', [('lab', _rgb24_to_lab), ('rgb', _rgb24_to_point)])
+def test_palette_nearest(metric, to_point):
+    palette = ColorPalette(PALETTE, metric)
+    colors = [Color.from_int(i * 0x9E3779B1 % 0x100000000) for i in range(500)] + [Color(c) for c in PALETTE]
+    points = [to_point(Color(c).as_int() >> 8) for c in PALETTE]
+
+    def brute_force(c):
+        point = to_point(c.as_int() >> 8)
+        return min(range(len(points)), key=lambda i: (sum((a - b) ** 2 for a, b in zip(point, points[i])), i))
+
+    expected = [brute_force(c) for c in colors]
+    assert palette.nearest_many(colors) == expected
+    assert [palette.nearest(c.as_hex()) for c in colors] == expected
+    # duplicate entries give the first index
+    assert palette.nearest('red') == 0
+
+
+@pytest.mark.skipif(numpy is None, reason='numpy not installed')
+def test_palette_nearest_numpy():
+    palette = ColorPalette(PALETTE)
+    image = numpy.array([[250, 0, 0, 255], [0, 0, 0, 0], [250, 0, 0, 128], [120, 120, 130, 255]], dtype=numpy.uint8)
+    assert palette.nearest_many(image).tolist() == [0, 4, 0, 5]
+    assert palette.nearest_many(image[:, :3]).tolist() == [0, 4, 0, 5]
+    with pytest.raises(ValueError, match=r'colors array must have shape \(N, 3\) or \(N, 4\), not \(4,\)'):
+        palette.nearest_many(image[:, 0])
+
+
+def test_palette_cache():
+    palette = ColorPalette(PALETTE, cache_size=2)
+    assert [palette.nearest(c) for c in ['#f00', '#f00', '#0f0', '#00f', '#f00']] == [0, 0, 1, 2, 0]
+    assert palette.cache_info() == CacheInfo(hits=1, misses=4, maxsize=2, currsize=2)
+
+
+def test_palette_container():
+    palette = ColorPalette(PALETTE)
+    assert len(palette) == 9
+    assert palette[1] == Color('lime')
+    assert list(palette) == list(palette.colors) == [Color(c) for c in PALETTE]
+    assert palette.colors[0] is Color.intern('red')
+    assert palette == ColorPalette(PALETTE)
+    assert palette != ColorPalette(PALETTE, 'rgb')
+    assert hash(palette) == hash(ColorPalette(PALETTE))
+    assert pickle.loads(pickle.dumps(palette)) == palette
+    assert repr(ColorPalette(['red', (0, 0, 255)], 'rgb')) == "ColorPalette(['red', 'blue'], metric='rgb')"
+
+
+def test_palette_errors():
+    with pytest.raises(ValueError, match='a palette must have at least one color'):
+        ColorPalette([])
+    with pytest.raises(ValueError, match="metric must be 'rgb' or 'lab', not 'hsl'"):
+        ColorPalette(PALETTE, 'hsl')
+    with pytest.raises(PydanticCustomError, match='string not recognised as a valid color'):
+        ColorPalette(['nope'])
+
+
+def test_palette_field():
+    class Model(BaseModel):
+        palette: ColorPalette
+
+    m = Model(palette=('red', (0, 0, 255), Color('#123')))
+    assert m.palette == ColorPalette(['red', 'blue', '#123'])
+    assert Model(palette=m.palette).palette is m.palette
+    assert m.model_dump() == {'palette': ['red', 'blue', '#123']}
+    assert Model.model_validate_json(m.model_dump_json()) == m
+    assert Model.model_json_schema()['properties']['palette'] == {
+        'title': 'Palette',
+        'type': 'array',
+        'items': {'type': 'string', 'format': 'color'},
+        'minItems': 1,
+    }
+
+
+@pytest.mark.parametrize(
+    'value, message',
+    [
+        ('red', 'value must be a list or tuple of colors'),
+        ([], 'a palette must have at least one color'),
+        (['red', 'nope'], 'entry 1: value is not a valid color: string not recognised as a valid color'),
+    ],
+)
+def test_palette_field_errors(value, message):
+    class Model(BaseModel):
+        palette: ColorPalette
+
+    with pytest.raises(ValidationError) as exc_info:
+        Model(palette=value)
+    error = exc_info.value.errors()[0]
+    assert error['type'] == 'color_palette_error'
+    assert error['msg'] == f'value is not a valid color palette: {message}'
+
+
+@pytest.mark.parametrize(
+    'color1, color2, t, space, expected',
+    [
+        ('red', 'blue', 0.5, 'rgb', 'rgb(127.5, 0, 127.5)'),
+        ('red', 'blue', 0, 'rgb', 'red'),
+        ('red', 'blue', 1, 'rgb', 'blue'),
+        ('red', 'blue', 0.5, 'hsl', 'magenta'),
+        ('red', 'hsl(270, 100%, 50%)', 0.5, 'hsl', 'hsl(315, 100%, 50%)'),
+        ('white', 'red', 0.5, 'hsl', 'hsl(0, 50%, 75%)'),
+        ('red', 'blue', 0.5, 'oklab', '#8c53a2'),
+        ('rgba(255, 0, 0, 0.5)', 'black', 0.5, 'rgb', 'rgba(127.5, 0, 0, 0.75)'),
+    ],
+)
+def test_mix(color1, color2, t, space, expected):
+    mixed = Color(color1).mix(Color(color2), t, space=space)
+    assert mixed == Color(expected)
+    assert mixed.as_rgb_tuple(alpha=True) == Color(expected).as_rgb_tuple(alpha=True)
+
+
+def test_mix_errors():
+    with pytest.raises(ValueError, match='t must be in the range 0 to 1'):
+        Color('red').mix(Color('blue'), 1.5)
+    with pytest.raises(ValueError, match="space must be 'rgb', 'hsl' or 'oklab', not 'lab'"):
+        Color('red').mix(Color('blue'), space='lab')
+
+
+@pytest.mark.parametrize('space', ['rgb', 'hsl', 'oklab'])
+def test_gradient(space):
+    stops = ['red', 'rgba(0, 255, 0, 0.5)', 'hsl(240, 50%, 50%)', 'white']
+    colors = list(gradient(stops, 7, space=space))
+    assert [c.as_hex() for c in colors[::2]] == [Color(s).as_hex() for s in stops]
+    a, b = Color(stops[0]), Color(stops[1])
+    assert colors[1] == a.mix(b, space=space)
+    assert colors[1]._get_rgba()._tuple == a.mix(b, space=space)._get_rgba()._tuple
+
+
+def test_gradient_lazy():
+    colors = gradient([Color('black'), Color('white')], 10**12)
+    assert [next(colors), next(colors)] == [Color('black'), Color('black')]
+
+
+@pytest.mark.skipif(numpy is None, reason='numpy not installed')
+@pytest.mark.parametrize('space', ['rgb', 'hsl', 'oklab'])
+def test_gradient_array(space):
+    stops = ['red', 'rgba(0, 255, 0, 0.5)', 'hsl(240, 50%, 50%)', 'white', '#123']
+    array = gradient(stops, 101, space=space, as_array=True)
+    assert array.shape == (101, 4)
+    for color, row in zip(gradient(stops, 101, space=space), array.tolist()):
+        assert row == pytest.approx(color._get_rgba()[:3] + (color._alpha_float(),), abs=1e-9)
+
+
+def test_gradient_errors():
+    with pytest.raises(ValueError, match='a gradient needs at least 2 stops'):
+        gradient(['red'], 10)
+    with pytest.raises(ValueError, match='n must be at least 2'):
+        gradient(['red', 'blue'], 1)
+    with pytest.raises(ValueError, match="space must be 'rgb', 'hsl' or 'oklab', not 'hsv'"):
+        gradient(['red', 'blue'], 10, space='hsv')
+    with pytest.raises(PydanticCustomError, match='string not recognised as a valid color'):
+        gradient(['red', 'nope'], 10)
+
+
+class SubColor(Color):
+    __slots__ = ()
+
+
+@pytest.mark.parametrize(
+    'color',
+    [
+        Color('red'),
+        Color(' #ABC '),
+        Color('#123456'),
+        Color((1, 2, 3, 0.5)),
+        Color('hsl(10, 33%, 47%)'),
+        Color.from_int(0x12345678),
+        Color('red').mix(Color('blue'), 0.3),
+        SubColor('#123'),
+        SubColor('hsl(10, 33%, 47%)'),
+    ],
+)
+@pytest.mark.parametrize('protocol', range(pickle.HIGHEST_PROTOCOL + 1))
+def test_pickle(color, protocol):
+    unpickled = pickle.loads(pickle.dumps(color, protocol=protocol))
+    assert type(unpickled) is type(color)
+    assert unpickled == color
+    assert unpickled.original() == color.original()
+    assert unpickled._get_rgba()._tuple == color._get_rgba()._tuple
+    assert str(unpickled) == str(color)
+
+
+def test_pickle_compact():
+    assert Color('#123').__reduce__()[1] == (0x112233FF, '#123')
+    assert Color.from_int(0x11223380).__reduce__()[1] == (0x11223380,)
+    assert Color('hsl(0, 50%, 50%)').__reduce__()[1] == (0xBF4040FF, 'hsl(0, 50%, 50%)', (0.75, 0.25, 0.25, None))
+    assert SubColor.from_int(0x11223380).__reduce__()[1] == (0x11223380, 0x11223380, None, SubColor)
+    assert pickle.loads(pickle.dumps(Color('red'))) is Color.intern('red')
+    # just the integer, a memo and a reduce opcode per color
+    assert len(pickle.dumps([Color.from_int(i * 0x9E3779B1 % 0x100000000) for i in range(1000)])) < 13_000
+
+
+def test_pickle_model():
+    class Model(BaseModel):
+        color: Color
+
+    m = Model(color='hsl(10, 33%, 47%)')
+    unpickled = pickle.loads(pickle.dumps(m.color))
+    assert Model(color=unpickled).color == m.color
+
+
+@pytest.fixture
+def drop_originals():
+    original_values.configure(keep=False)
+    yield
+    original_values.configure(keep=True)
+
+
+@pytest.mark.usefixtures('drop_originals')
+def test_original_values_dropped():
+    value = [10, 20, 30, 0.5]
+    color = Color(value)
+    assert color._original is None
+    assert color.original() == '#0a141e80'
+    assert color == Color('rgba(10, 20, 30, 0.5)')
+    assert color.as_rgb_tuple() == (10, 20, 30, 0.5)
+    assert Color('hsl(10, 33%, 47%)')._get_rgba()._tuple == (0.6251, 0.3665999999999999, 0.31489999999999996, None)
+    assert Color.from_int(0x11223344).original() == 0x11223344
+    # shared named colors are unaffected
+    assert Color.intern('red').original() == 'red'
+    unpickled = pickle.loads(pickle.dumps(color))
+    assert unpickled._original is None
+    assert unpickled.original() == '#0a141e80'
+
+
+def test_original_values_configure():
+    assert original_values.keep is True
+    original_values.configure(keep=False)
+    try:
+        assert Color('#123').original() == '#123'
+        assert Color('#123')._original is None
+    finally:
+        original_values.configure(keep=True)
+    assert Color('#123')._original == '#123'
+
+
+def test_drop_original():
+    class Model(BaseModel):
+        color: Annotated[Color, DropOriginal()]
+        colors: List[Annotated[Color, DropOriginal()]]
+        compact: Annotated[Color, CompactColor(), DropOriginal()]
+
+    m = Model(color=[1, 2, 3], colors=['#112233', 'red', 'hsl(10, 33%, 47%)'], compact=b'\x11\x22\x33\x44')
+    assert m.color._original is None
+    assert m.color.original() == '#010203'
+    assert [c.original() for c in m.colors] == ['#123', 'red', '#9f5d50']
+    assert m.colors[1] is Color.intern('red')
+    assert m.colors[2]._get_rgba()._tuple == Color('hsl(10, 33%, 47%)')._get_rgba()._tuple
+    assert m.compact.original() == 0x11223344
+    assert json.loads(m.model_dump_json()) == {
+        'color': '#010203',
+        'colors': ['#123', 'red', '#9f5d50'],
+        'compact': 0x11223344,
+    }
+    assert Model.model_json_schema()['properties']['color'] == {'type': 'string', 'format': 'color', 'title': 'Color'}
+    assert repr(DropOriginal()) == 'DropOriginal()'
+
+
+def test_contrast_failures():
+    pairs = [('black', 'white'), ('#777', 'white'), ('white', '#777'), ('#767676', 'white'), ('navy', 'blue')]
+    pairs = [(Color(fg), Color(bg)) for fg, bg in pairs]
+    failures = contrast_failures(pairs)
+    assert [(f.key, str(f.foreground), str(f.background)) for f in failures] == [
+        (1, '#777', 'white'),
+        (2, 'white', '#777'),
+        (4, 'navy', 'blue'),
+    ]
+    assert failures[0] == ContrastFailure(1, Color('#777'), Color('white'), pytest.approx(4.4781, abs=1e-4))
+    assert [f.ratio for f in failures] == [pairs[f.key][0].contrast_ratio(pairs[f.key][1]) for f in failures]
+    assert [f.key for f in contrast_failures(pairs, 3)] == [4]
+    assert contrast_failures(pairs, 1) == []
+    assert [f.key for f in contrast_failures(dict(zip('abcde', pairs)))] == ['b', 'c', 'e']
+    assert contrast_failures([]) == []
+
+
+def test_contrast_failures_values():
+    failures = contrast_failures([('black', 'white'), ('#777', (255, 255, 255)), (Color('navy'), 'blue')])
+    assert failures == [
+        ContrastFailure(1, Color('#777'), Color('white'), pytest.approx(4.4781, abs=1e-4)),
+        ContrastFailure(2, Color('navy'), Color('blue'), pytest.approx(1.8632, abs=1e-4)),
+    ]
+    assert [f.key for f in contrast_failures({'text': ('black', 'white'), 'link': ('navy', 'blue')})] == ['link']
+    with pytest.raises(PydanticCustomError, match='string not recognised as a valid color'):
+        contrast_failures([('black', 'nope')])
+
+
+def test_contrast_failures_float_colors():
+    # not cached by packed value, so the float channels are used
+    pairs = [(Color('hsl(0, 0%, 46.5%)'), Color('white')), (Color('hsl(0, 0%, 46.55%)'), Color('white'))]
+    assert [f.key for f in contrast_failures(pairs)] == [1]
+    assert Color('#777').contrast_ratio(Color('white')) < 4.5
+    assert pairs[0][0] == pairs[1][0]
+
+
+def test_min_contrast():
+    class Theme(BaseModel):
+        pairs: Annotated[Dict[str, Tuple[Color, Color]], MinContrast(4.5)]
+        button: Annotated[Optional[Tuple[Color, Color]], MinContrast(3)]
+        rows: Annotated[List[Tuple[Color, Color]], MinContrast()]
+
+    theme = Theme(pairs={'text': ('black', 'white')}, button=('#767676', 'white'), rows=[])
+    assert theme.pairs == {'text': (Color('black'), Color('white'))}
+    assert Theme(pairs={}, button=None, rows=[]).button is None
+    assert json.loads(theme.model_dump_json()) == {
+        'pairs': {'text': ['black', 'white']},
+        'button': ['#767676', 'white'],
+        'rows': [],
+    }
+
+    with pytest.raises(ValidationError) as exc_info:
+        Theme(
+            pairs={'text': ('#777', 'white'), 'ok': ('black', 'white'), 'link': ('navy', 'blue')},
+            button=('#aaa', 'white'),
+            rows=[('black', 'white'), ('#888', '#999')],
+        )
+    assert [(e['loc'], e['type'], e['msg']) for e in exc_info.value.errors()] == [
+        (
+            ('pairs',),
+            'color_contrast_error',
+            "contrast ratio must be at least 4.5: 'text': #777 on white is 4.48; 'link': navy on blue is 1.86",
+        ),
+        (('button',), 'color_contrast_error', 'contrast ratio must be at least 3: #aaa on white is 2.32'),
+        (('rows',), 'color_contrast_error', 'contrast ratio must be at least 4.5: 1: #888 on #999 is 1.24'),
+    ]
+
+    with pytest.raises(ValidationError, match='value is not a valid color'):
+        Theme(pairs={'text': ('nope', 'white')}, button=None, rows=[])
+
+
+def test_min_contrast_errors():
+    assert repr(MinContrast(7)) == 'MinContrast(7)'
+    with pytest.raises(ValueError, match='minimum must be in the range 1 to 21, not 0.5'):
+        MinContrast(0.5)
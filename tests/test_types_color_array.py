@@ -0,0 +1,144 @@
+import pytest
+from pydantic_core import PydanticCustomError
+
+from pydantic_extra_types import Color
+from pydantic_extra_types.types.color import parse_colors
+
+numpy = pytest.importorskip('numpy')
+
+from pydantic_extra_types.types.color_array import (  # noqa: E402
+    contrast_ratio,
+    delta_e,
+    hex_to_rgba,
+    hsla_to_rgba,
+    oklab_to_rgba,
+    relative_luminance,
+    rgba_to_hex,
+    rgba_to_hsla,
+    rgba_to_lab,
+    rgba_to_oklab,
+)
+
+COLORS = [
+    Color('red'),
+    Color('white'),
+    Color('black'),
+    Color('#777'),
+    Color('#12345678'),
+    Color('#abcd'),
+    Color((1, 2, 3, 0.999)),
+    Color((1, 2, 3, 0.999999999)),
+    Color('rgb(0, 0, 205.2)'),
+    Color('rgba(0, 0, 128, 0.6)'),
+    Color('hsl(270, 60%, 70%)'),
+    Color('hsl(-0.25turn, 60%, 50%, 0.15)'),
+    Color('hsl(180, 100%, 50%)'),
+] + [Color.from_int(i * 0x9E3779B1 % 0x100000000) for i in range(2_000)]
+
+
+def to_rgba(colors):
+    return numpy.array([c._get_rgba()[:3] + (c._alpha_float(),) for c in colors])
+
+
+def test_rgba_to_hsla():
+    hsla = rgba_to_hsla(to_rgba(COLORS))
+    assert hsla.shape == (len(COLORS), 4)
+    for c, row in zip(COLORS, hsla.tolist()):
+        assert row == pytest.approx(c.as_hsl_tuple(alpha=True), abs=1e-12)
+
+
+def test_hsla_to_rgba():
+    hsla = numpy.array([[i / 37 % 1, i / 11 % 1, i / 7 % 1, i / 13 % 1] for i in range(2_000)])
+    hsla[:10, 1] = 0
+    rgba = hsla_to_rgba(hsla)
+    for (h, s, l_, a), row in zip(hsla.tolist(), rgba.tolist()):
+        c = Color(f'hsl({h}turn, {s * 100}%, {l_ * 100}%, {a})')
+        assert row == pytest.approx(c._get_rgba()[:3] + (c._alpha_float(),), abs=1e-9)
+
+
+def test_rgba_to_hex():
+    assert rgba_to_hex(to_rgba(COLORS)).tolist() == [c.as_hex() for c in COLORS]
+    assert rgba_to_hex([[1, 0, 0], [0, 0, 1]]).tolist() == ['#f00', '#00f']
+    assert rgba_to_hex(numpy.zeros((0, 4))).tolist() == []
+
+
+def test_hex_to_rgba():
+    values = [c.as_hex() for c in COLORS] + [' 0x0000FF80 ', '777', '777c', '#DAB']
+    rgba, errors = hex_to_rgba(values)
+    assert not errors
+    colors = [Color(v) for v in values]
+    assert rgba.tolist() == to_rgba(colors).tolist()
+    assert rgba_to_hex(rgba).tolist() == [c.as_hex() for c in colors]
+
+
+def test_hex_to_rgba_errors():
+    rgba, errors = hex_to_rgba(['#fff', '##fff', '0x', '#12345', 'red', '#ffü', '0x0x000', ''])
+    assert rgba[0].tolist() == [1, 1, 1, 1]
+    assert not rgba[1:].any()
+    assert list(errors) == [1, 2, 3, 4, 5, 6, 7]
+    assert errors[1].type == 'color_error'
+
+    with pytest.raises(PydanticCustomError, match='string not recognised as a valid color'):
+        hex_to_rgba(['#fff', 'red'], strict=True)
+
+
+def test_parse_colors_round_trip():
+    values = [c.as_hex() for c in COLORS]
+    rgba, _ = parse_colors(values, dtype=numpy.float64)
+    assert rgba_to_hex(rgba).tolist() == [Color(v).as_hex() for v in values]
+
+
+def test_rgba_to_lab():
+    lab = rgba_to_lab(to_rgba(COLORS))
+    assert lab.shape == (len(COLORS), 3)
+    for c, row in zip(COLORS, lab.tolist()):
+        assert row == pytest.approx(c.as_lab(), abs=1e-9)
+
+
+def test_rgba_to_oklab():
+    oklab = rgba_to_oklab(to_rgba(COLORS))
+    for c, row in zip(COLORS, oklab.tolist()):
+        assert row == pytest.approx(c.as_oklab(), abs=1e-9)
+
+
+@pytest.mark.parametrize('method', ['cie76', 'ciede2000', 'oklab'])
+def test_delta_e(method):
+    others = COLORS[1:] + COLORS[:1]
+    # include pairs of achromatic colors and hue differences either side of 180 degrees
+    others[:4] = [Color('black'), Color('#777'), Color('white'), Color('white')]
+    distances = delta_e(to_rgba(COLORS), to_rgba(others), method=method)
+    assert distances.shape == (len(COLORS),)
+    for c1, c2, d in zip(COLORS, others, distances.tolist()):
+        assert d == pytest.approx(c1.delta_e(c2, method=method), abs=1e-9)
+
+
+def test_oklab_to_rgba():
+    rgba = to_rgba(COLORS)
+    assert oklab_to_rgba(numpy.column_stack([rgba_to_oklab(rgba), rgba[:, 3]])) == pytest.approx(rgba, abs=1e-5)
+    assert oklab_to_rgba(rgba_to_oklab(rgba))[:, 3].tolist() == [1] * len(COLORS)
+    # out of gamut colors are clipped
+    assert oklab_to_rgba([[1.5, 0, 0], [0.5, 0.5, 0]]) == pytest.approx(
+        numpy.array([[1, 1, 1, 1], [1, 0, 0.3437, 1]]), abs=1e-4
+    )
+    with pytest.raises(ValueError, match=r'color array must have shape \(N, 3\) or \(N, 4\), not \(3,\)'):
+        oklab_to_rgba([1, 0, 0])
+
+
+def test_delta_e_method():
+    with pytest.raises(ValueError, match="method must be 'cie76', 'ciede2000' or 'oklab', not 'foo'"):
+        delta_e([[0, 0, 0]], [[1, 1, 1]], method='foo')
+
+
+def test_contrast_ratio():
+    rgba = to_rgba(COLORS)
+    luminance = relative_luminance(rgba)
+    ratios = contrast_ratio(rgba, rgba[::-1])
+    for c1, c2, lum, ratio in zip(COLORS, COLORS[::-1], luminance.tolist(), ratios.tolist()):
+        assert lum == pytest.approx(c1.relative_luminance(), abs=1e-12)
+        assert ratio == pytest.approx(c1.contrast_ratio(c2), abs=1e-12)
+    assert contrast_ratio([[1, 1, 1]], [[0, 0, 0]]).tolist() == [21]
+
+
+def test_invalid_shape():
+    with pytest.raises(ValueError, match=r'color array must have shape \(N, 3\) or \(N, 4\), not \(2, 5\)'):
+        rgba_to_hsla(numpy.zeros((2, 5)))
@@ -0,0 +1,222 @@
+import io
+import random
+import re
+
+import pytest
+from pydantic_core import PydanticCustomError
+
+from pydantic_extra_types import PaymentCardBrand, PaymentCardNumber
+from pydantic_extra_types.pan_scanner import main
+from pydantic_extra_types.types import pan_scanner
+from pydantic_extra_types.types.pan_scanner import PanMatch, scan_pans
+
+TEXT = (
+    b'visa=4242424242424242, amex 3782-822463-10005\n'
+    b'mastercard 5555 5555 5555 4444 100 and 4000056655665556!\n'
+    b'id 42424242424242424242 not a card, nor 4242424242424241 or 9999999999999995\n'
+)
+
+
+def scan(data, **kwargs):
+    return list(scan_pans(io.BytesIO(data), **kwargs))
+
+
+def reference(data, brands):
+    """
+    Scan the whole input at once, checking candidates with `PaymentCardNumber`.
+    """
+    found = []
+    for run in re.finditer(rb'[0-9]+(?:[ -][0-9]+)*', data):
+        groups = [m.span() for m in re.compile(rb'[0-9]+').finditer(data, run.start(), run.end())]
+        i = 0
+        while i < len(groups):
+            # spans of whole groups with at most 19 digits, longest first
+            spans = []
+            for j in range(i, len(groups)):
+                if len(re.findall(rb'[0-9]', data[groups[i][0] : groups[j][1]])) > 19:
+                    break
+                spans.append(j)
+            for j in reversed(spans):
+                start, end = groups[i][0], groups[j][1]
+                digits = re.sub(rb'[ -]', b'', data[start:end]).decode()
+                if len(digits) < 12:
+                    continue
+                try:
+                    card_number = PaymentCardNumber(digits)
+                except PydanticCustomError:
+                    continue
+                if card_number.brand in brands:
+                    found.append(PanMatch(start, end, card_number.brand))
+                    i = j
+                    break
+            i += 1
+    return found
+
+
+def check_digit(prefix):
+    digits = [int(d) for d in reversed(prefix)]
+    return str(-sum(sum(divmod(d * 2, 10)) if i % 2 == 0 else d for i, d in enumerate(digits)) % 10)
+
+
+def random_text(r, parts=1000):
+    def card_number():
+        prefix = r.choice(['4', '51', '2221', '37', '6011', '3528', '62', '5018', '36', '9'])
+        prefix += ''.join(r.choices('0123456789', k=r.choice([12, 13, 15, 16, 19]) - 1 - len(prefix)))
+        card_number = prefix + check_digit(prefix)
+        if r.random() < 0.5:
+            size = r.choice([3, 4, 5])
+            card_number = r.choice(' -').join(card_number[i : i + size] for i in range(0, len(card_number), size))
+        return card_number
+
+    def number():
+        return str(r.randrange(10 ** r.randrange(1, 25)))
+
+    # mostly separated by bytes which end a run, sometimes by a space or dash which join runs
+    separators = ['x', '\n', ', ', '  ', ' -', '=', ' ', '-', '']
+    return ''.join(r.choice([card_number, number])() + r.choice(separators) for _ in range(parts)).encode()
+
+
+def test_scan():
+    assert scan(TEXT) == [
+        PanMatch(5, 21, PaymentCardBrand.visa),
+        PanMatch(28, 45, PaymentCardBrand.amex),
+        PanMatch(57, 76, PaymentCardBrand.mastercard),
+        PanMatch(85, 101, PaymentCardBrand.visa),
+    ]
+    assert [TEXT[m.start : m.end] for m in scan(TEXT)] == [
+        b'4242424242424242',
+        b'3782-822463-10005',
+        b'5555 5555 5555 4444',
+        b'4000056655665556',
+    ]
+
+
+def test_scan_brands():
+    assert [m.brand for m in scan(TEXT, brands=PaymentCardBrand)][-1] == PaymentCardBrand.other
+    assert [m.brand for m in scan(TEXT, brands=[PaymentCardBrand.amex])] == [PaymentCardBrand.amex]
+
+
+@pytest.mark.parametrize(
+    'data, found',
+    [
+        (b'4242424242424242', [b'4242424242424242']),
+        (b'4242-4242-4242-4242', [b'4242-4242-4242-4242']),
+        # runs are split between groups of digits
+        (b'1 4242 4242 4242 4242 1', [b'4242 4242 4242 4242']),
+        (b'4242 4242 4242 4242 5555 5555 5555 4444', [b'4242 4242 4242 4242', b'5555 5555 5555 4444']),
+        (b'4242424242424242 3782 822463 10005', [b'4242424242424242', b'3782 822463 10005']),
+        # but not within them
+        (b'14242424242424242', []),
+        (b'4242424242424242' * 2, []),
+        (b'4242  4242 4242 4242', []),
+        (b'4242 4242_4242 4242', []),
+        (b'4242 4242 4242 4242x', [b'4242 4242 4242 4242']),
+    ],
+)
+def test_scan_runs(data, found):
+    assert [data[m.start : m.end] for m in scan(data)] == found
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_scan_random(seed):
+    data = random_text(random.Random(seed))
+    for brands in [pan_scanner._known_brands, frozenset(PaymentCardBrand)]:
+        expected = reference(data, brands)
+        assert len(expected) > 100
+        for chunk_size in [1, 2, 3, 7, 64, 1 << 20]:
+            assert scan(data, brands=brands, chunk_size=chunk_size) == expected
+
+
+@pytest.mark.parametrize(
+    'data',
+    [
+        b'4242 ' * 1000 + b'4242',
+        b'1 ' * 1000 + b'4242 4242 4242 4242',
+        b'1-2 ' * 1000 + b'4242 4242 4242 4242',
+        b'9' * 1000 + b' 4242 4242 4242 4242',
+        b'4242424242424242 ' * 100,
+    ],
+    ids=['groups', 'short-groups', 'dashes', 'long-group', 'cards'],
+)
+def test_scan_long_runs(data):
+    """
+    Runs much longer than a chunk, which are scanned as they're read rather than carried over in full.
+    """
+    expected = reference(data, pan_scanner._known_brands)
+    assert expected
+    for chunk_size in [1, 5, 16, 17, 100]:
+        assert scan(data, chunk_size=chunk_size) == expected
+
+
+def test_redact(tmp_path):
+    redacted = io.BytesIO()
+    assert scan(TEXT, redact_to=redacted, chunk_size=10) == scan(TEXT)
+    assert redacted.getvalue() == (
+        b'visa=424242******4242, amex 3782-82****-*0005\n'
+        b'mastercard 5555 55** **** 4444 100 and 400005******5556!\n'
+        b'id 42424242424242424242 not a card, nor 4242424242424241 or 9999999999999995\n'
+    )
+    source = tmp_path / 'app.log'
+    source.write_bytes(TEXT)
+    assert list(scan_pans(source, redact_to=tmp_path / 'app.redacted.log')) == scan(TEXT)
+    assert (tmp_path / 'app.redacted.log').read_bytes() == redacted.getvalue()
+
+
+@pytest.mark.parametrize('split_size', [1, 100, 1000, 1 << 20])
+def test_scan_processes(tmp_path, monkeypatch, split_size):
+    monkeypatch.setattr(pan_scanner, '_SPLIT_SIZE', split_size)
+    data = random_text(random.Random(1)) + b'4242 ' * 100 + b'4242'
+    source = tmp_path / 'app.log'
+    source.write_bytes(data)
+    redacted = io.BytesIO()
+    expected = scan(data, redact_to=redacted)
+    assert list(scan_pans(source, redact_to=tmp_path / 'redacted.log', processes=2, chunk_size=50)) == expected
+    assert (tmp_path / 'redacted.log').read_bytes() == redacted.getvalue()
+
+
+def test_split_ranges(tmp_path, monkeypatch):
+    monkeypatch.setattr(pan_scanner, '_SPLIT_SIZE', 4)
+    source = tmp_path / 'app.log'
+    source.write_bytes(b'ab 4242 4242x12-3yz')
+    assert list(pan_scanner._split_ranges(source, 19)) == [(0, 12), (12, 17), (17, 19)]
+
+
+@pytest.mark.parametrize(
+    'kwargs, message',
+    [
+        ({'processes': 0}, 'processes must be at least 1, not 0'),
+        ({'chunk_size': 0}, 'chunk_size must be at least 1, not 0'),
+        ({'processes': 2}, 'source and redact_to must be file paths to scan with more than one process'),
+    ],
+)
+def test_scan_errors(kwargs, message):
+    with pytest.raises(ValueError, match=message):
+        scan_pans(io.BytesIO(TEXT), **kwargs)
+
+
+def test_scan_processes_redact_to_stream(tmp_path):
+    source = tmp_path / 'app.log'
+    source.write_bytes(TEXT)
+    with pytest.raises(ValueError, match='source and redact_to must be file paths'):
+        scan_pans(source, redact_to=io.BytesIO(), processes=2)
+
+
+def test_main(tmp_path, capsys):
+    source = tmp_path / 'app.log'
+    source.write_bytes(TEXT)
+    output = tmp_path / 'app.redacted.log'
+    assert main([str(source), '--redact', str(output)]) == 0
+    out, err = capsys.readouterr()
+    assert out == '5\t21\tVisa\n28\t45\tAmerican Express\n57\t76\tMastercard\n85\t101\tVisa\n'
+    assert err.startswith(f'4 card numbers found in {source} in ')
+    assert b'424242******4242' in output.read_bytes()
+
+    assert main([str(source), '--all-brands', '--processes', '2']) == 0
+    assert capsys.readouterr().out.endswith('\tother\n')
+
+
+def test_main_error(tmp_path, capsys):
+    with pytest.raises(SystemExit) as exc_info:
+        main([str(tmp_path / 'missing.log')])
+    assert exc_info.value.code == 2
+    assert 'missing.log' in capsys.readouterr().err
@@ -1,3 +1,5 @@
+import pickle
+import random
 from collections import namedtuple
 from typing import Any
 
@@ -6,6 +8,13 @@ from pydantic_core._pydantic_core import PydanticCustomError
 
 from pydantic import BaseModel, ValidationError
 from pydantic_extra_types import PaymentCardBrand, PaymentCardNumber
+from pydantic_extra_types.types import payment
+from pydantic_extra_types.types.payment import luhn_valid_many
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 VALID_AMEX = '370000000000002'
 VALID_MC = '5100000000000003'
@@ -76,6 +85,88 @@ def test_validate_luhn_check_digit(card_number: str, valid: bool):
             PaymentCardNumber.validate_luhn_check_digit(card_number)
 
 
+def luhn_valid_loop(card_number: str) -> bool:
+    """
+    Reference implementation, looping over the digits.
+    """
+    sum_ = int(card_number[-1])
+    parity = len(card_number) % 2
+    for i in range(len(card_number) - 1):
+        digit = int(card_number[i])
+        if i % 2 == parity:
+            digit *= 2
+        if digit > 9:
+            digit -= 9
+        sum_ += digit
+    return sum_ % 10 == 0
+
+
+def test_validate_luhn_check_digit_random():
+    r = random.Random(42)
+    card_numbers = [''.join(r.choice('0123456789') for _ in range(r.randint(1, 25))) for _ in range(5000)]
+    for card_number in card_numbers:
+        try:
+            PaymentCardNumber.validate_luhn_check_digit(card_number)
+        except PydanticCustomError:
+            valid = False
+        else:
+            valid = True
+        assert valid == luhn_valid_loop(card_number), card_number
+
+
+def test_validate_luhn_check_digit_unicode():
+    # arabic-indic digits for 4242424242424242
+    assert PaymentCardNumber.validate_luhn_check_digit('٤٢' * 8) == '٤٢' * 8
+    with pytest.raises(PydanticCustomError, match='Card number is not luhn valid'):
+        PaymentCardNumber.validate_luhn_check_digit('٤٢' * 7 + '٤٣')
+    with pytest.raises(PydanticCustomError, match='Card number is not all digits'):
+        PaymentCardNumber.validate_luhn_check_digit('4242 4242 4242 4242')
+
+
+@pytest.mark.skipif(numpy is None, reason='numpy not installed')
+def test_luhn_valid_many(monkeypatch):
+    monkeypatch.setattr(payment, '_luhn_chunk_rows', 7)
+    r = random.Random(42)
+    for width in (1, 2, 15, 16, 19):
+        card_numbers = [''.join(r.choice('0123456789') for _ in range(width)) for _ in range(100)]
+        expected = [luhn_valid_loop(c) for c in card_numbers]
+        assert sum(expected) > 0
+        assert luhn_valid_many(numpy.array(card_numbers)).tolist() == expected
+        assert luhn_valid_many(numpy.array(card_numbers, dtype='S')).tolist() == expected
+        buffer = ''.join(card_numbers).encode()
+        assert luhn_valid_many(buffer, width).tolist() == expected
+        assert luhn_valid_many(memoryview(bytearray(buffer)), width=width).tolist() == expected
+        assert luhn_valid_many(numpy.frombuffer(buffer, dtype=numpy.uint8).reshape(-1, width)).tolist() == expected
+
+
+@pytest.mark.skipif(numpy is None, reason='numpy not installed')
+def test_luhn_valid_many_padding():
+    # left padding with zeros keeps the check digit, anything else is invalid
+    card_numbers = [VALID_AMEX, '0' + VALID_AMEX, ' ' + VALID_AMEX, VALID_AMEX + '0', 'x' * 16, '4242-42424242424']
+    assert luhn_valid_many(numpy.array(card_numbers, dtype='S16')).tolist() == [False, True, False, False, False, False]
+    # numpy pads shorter strings with nulls on the right
+    assert luhn_valid_many(numpy.array([VALID_AMEX, '5555555555554444'])).tolist() == [False, True]
+    assert luhn_valid_many(b'', 16).tolist() == []
+
+
+@pytest.mark.skipif(numpy is None, reason='numpy not installed')
+def test_luhn_valid_many_non_ascii():
+    # '\u0130' is 0x130, its low byte is the ASCII digit 0 which would make the padded number valid
+    card_numbers = ['0' + VALID_AMEX, '\u00e9' + VALID_AMEX, '\u0130' + VALID_AMEX, '\u0660' + VALID_AMEX]
+    assert luhn_valid_many(numpy.array(card_numbers)).tolist() == [True, False, False, False]
+    assert luhn_valid_many(numpy.array(card_numbers, dtype='>U16')).tolist() == [True, False, False, False]
+
+
+@pytest.mark.skipif(numpy is None, reason='numpy not installed')
+def test_luhn_valid_many_errors():
+    with pytest.raises(ValueError, match='width is required to split a buffer into card numbers'):
+        luhn_valid_many(VALID_MC.encode())
+    with pytest.raises(ValueError, match='buffer length must be a multiple of width 15, not 16'):
+        luhn_valid_many(VALID_MC.encode(), 15)
+    with pytest.raises(ValueError, match='a 2 dimensional array of card numbers must have dtype uint8, not int64'):
+        luhn_valid_many(numpy.zeros((2, 16), dtype=numpy.int64))
+
+
 @pytest.mark.parametrize(
     'card_number, brand, valid',
     [
@@ -111,12 +202,125 @@ def test_get_brand(card_number: str, brand: PaymentCardBrand):
     assert PaymentCardNumber.validate_brand(card_number) == brand
 
 
+@pytest.mark.parametrize(
+    'prefix, brand',
+    [
+        ('2220', PaymentCardBrand.other),
+        ('2221', PaymentCardBrand.mastercard),
+        ('2720', PaymentCardBrand.mastercard),
+        ('2721', PaymentCardBrand.other),
+        ('2999', PaymentCardBrand.other),
+        ('300', PaymentCardBrand.diners_club),
+        ('305', PaymentCardBrand.diners_club),
+        ('306', PaymentCardBrand.other),
+        ('3095', PaymentCardBrand.diners_club),
+        ('34', PaymentCardBrand.amex),
+        ('3527', PaymentCardBrand.other),
+        ('3528', PaymentCardBrand.jcb),
+        ('3589', PaymentCardBrand.jcb),
+        ('3590', PaymentCardBrand.other),
+        ('36', PaymentCardBrand.diners_club),
+        ('37', PaymentCardBrand.amex),
+        ('38', PaymentCardBrand.diners_club),
+        ('39', PaymentCardBrand.diners_club),
+        ('4', PaymentCardBrand.visa),
+        ('5017', PaymentCardBrand.other),
+        ('5018', PaymentCardBrand.maestro),
+        ('5020', PaymentCardBrand.maestro),
+        ('5038', PaymentCardBrand.maestro),
+        ('51', PaymentCardBrand.mastercard),
+        ('55', PaymentCardBrand.mastercard),
+        ('56', PaymentCardBrand.other),
+        ('5893', PaymentCardBrand.maestro),
+        ('6011', PaymentCardBrand.discover),
+        ('6012', PaymentCardBrand.other),
+        ('62', PaymentCardBrand.unionpay),
+        ('622125', PaymentCardBrand.unionpay),
+        ('622126', PaymentCardBrand.discover),
+        ('622925', PaymentCardBrand.discover),
+        ('622926', PaymentCardBrand.unionpay),
+        ('6304', PaymentCardBrand.maestro),
+        ('643', PaymentCardBrand.other),
+        ('644', PaymentCardBrand.discover),
+        ('649', PaymentCardBrand.discover),
+        ('65', PaymentCardBrand.discover),
+        ('6759', PaymentCardBrand.maestro),
+        ('6760', PaymentCardBrand.other),
+        ('6761', PaymentCardBrand.maestro),
+        ('6763', PaymentCardBrand.maestro),
+        ('9', PaymentCardBrand.other),
+    ],
+)
+def test_brand_ranges(prefix: str, brand: PaymentCardBrand):
+    for fill in '09':
+        card_number = prefix.ljust(15 if brand == PaymentCardBrand.amex else 16, fill)
+        assert PaymentCardNumber.validate_brand(card_number) == brand
+
+
+@pytest.mark.parametrize(
+    'card_number, required_length',
+    [
+        ('5' * 15, '16'),
+        ('4' * 14, '13, 16 or 19'),
+        ('37' * 8, '15'),
+        ('6011' * 3 + '000', '16 to 19'),
+        ('3528' * 5, '16 to 19'),
+        ('5018' + '0' * 7, '12 to 19'),
+        ('36' + '0' * 11, '14 to 19'),
+    ],
+)
+def test_brand_length(card_number: str, required_length: str):
+    with pytest.raises(PydanticCustomError, match=f'card must be {required_length}$'):
+        PaymentCardNumber.validate_brand(card_number)
+
+
+def test_brand_length_context():
+    with pytest.raises(PydanticCustomError) as exc_info:
+        PaymentCardNumber.validate_brand('5' * 15)
+    assert exc_info.value.context == {'brand': PaymentCardBrand.mastercard, 'required_length': 16}
+
+
+def test_brand_short_card_numbers():
+    assert PaymentCardNumber.validate_brand('9' * 12) == PaymentCardBrand.other
+    assert PaymentCardNumber.validate_brand('5018' * 3) == PaymentCardBrand.maestro
+    with pytest.raises(PydanticCustomError, match='Length for a Visa card must be 13, 16 or 19'):
+        PaymentCardNumber.validate_brand('4')
+
+
 def test_valid(PaymentCard):
     card = PaymentCard(card_number=VALID_VISA_16)
     assert str(card.card_number) == VALID_VISA_16
     assert card.card_number.masked == '405000******0001'
 
 
+def test_derived_attributes(PaymentCard):
+    card_number = PaymentCard(card_number=VALID_VISA_16).card_number
+    assert card_number.bin == '405000'
+    assert card_number.last4 == '0001'
+    assert card_number.brand == PaymentCardBrand.visa
+    assert not hasattr(card_number, '__dict__')
+    with pytest.raises(AttributeError):
+        card_number.brand = PaymentCardBrand.amex
+
+
+def test_validated_once(PaymentCard, monkeypatch):
+    calls = []
+    validate_digits = PaymentCardNumber.validate_digits
+    monkeypatch.setattr(PaymentCardNumber, 'validate_digits', lambda c: calls.append(c) or validate_digits(c))
+    card_number = PaymentCard(card_number=VALID_VISA_16).card_number
+    assert type(card_number) is PaymentCardNumber
+    assert calls == [VALID_VISA_16]
+
+
+def test_pickle():
+    card_number = PaymentCardNumber(VALID_VISA_16)
+    for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+        loaded = pickle.loads(pickle.dumps(card_number, protocol=protocol))
+        assert type(loaded) is PaymentCardNumber
+        assert loaded == card_number
+        assert loaded.brand == PaymentCardBrand.visa
+
+
 @pytest.mark.parametrize(
     'card_number, error_message',
     [